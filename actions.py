@@ -7,6 +7,8 @@ aux commandes du joueur. Chaque fonction action :
 - Affiche un message d'erreur si le nombre de paramètres est incorrect
 """
 
+from player import TAKE_COUNTER, TALK_COUNTER
+
 MSG0 = "\nLa commande '{command_word}' ne prend pas de paramètre.\n"
 MSG1 = "\nLa commande '{command_word}' prend 1 seul paramètre.\n"
 
@@ -20,6 +22,7 @@ class Actions:
     
     Methods:
         go(game, list_of_words, number_of_parameters): Déplace le joueur dans une direction.
+        travel(game, list_of_words, number_of_parameters): Voyage jusqu'à une salle nommée.
         quit(game, list_of_words, number_of_parameters): Quitte le jeu.
         help(game, list_of_words, number_of_parameters): Affiche l'aide.
         back(game, list_of_words, number_of_parameters): Retourne à la salle précédente.
@@ -70,25 +73,88 @@ class Actions:
         # If the number of parameters is incorrect, print an error message and return False.
         if l != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
+            game.output.print(MSG1.format(command_word=command_word))
             return False
 
         # Get the direction from the list of words.
         direction = list_of_words[1].upper()
         # Validate the direction entered by the player.
         if direction not in ("N", "E", "S", "O"):
-            print(f"\nDirection '{direction}' invalide. Utilisez N, E, S ou O.\n")
+            game.output.print(f"\nDirection '{direction}' invalide. Utilisez N, E, S ou O.\n")
             return False
 
         # Move the player in the direction specified by the parameter.
         moved = player.move(direction)
         if moved:
-            print(player.current_room.get_long_description())
+            game.output.print(player.current_room.get_long_description())
             history = player.get_history()
             if history:
-                print(history)
+                game.output.print(history)
         return moved
 
+    @staticmethod
+    def travel(game, list_of_words, number_of_parameters):
+        """
+        Voyager jusqu'à une salle nommée par le plus court chemin.
+
+        L'itinéraire vient des tables de prochain saut du monde. Chaque étape
+        est un vrai déplacement (objectifs de visite et compteur de
+        déplacements compris), mais seule la salle d'arrivée est décrite.
+
+        Args:
+            game (Game): L'objet de jeu.
+            list_of_words (list): Les mots de la commande (le nom de la salle
+                peut contenir des espaces).
+            number_of_parameters (int): le nombre de paramètre attendu.
+
+        Returns:
+            bool: True si le joueur est arrivé à destination, False sinon.
+
+        Examples:
+
+        >>> from game import Game
+        >>> from output import NullSink
+        >>> game = Game(output=NullSink())
+        >>> game.setup("Dora")
+        >>> Actions.travel(game, ["travel", "verdenfall"], 1)
+        True
+        >>> game.player.current_room.name, game.player.counters["Se déplacer"]
+        ('Verdenfall', 6)
+        >>> Actions.travel(game, ["travel", "Atlantis"], 1)
+        False
+        """
+        n = len(list_of_words)
+        if n < number_of_parameters + 1:
+            command_word = list_of_words[0]
+            game.output.print(MSG1.format(command_word=command_word))
+            return False
+
+        player = game.player
+        router = game.world.router(player.inventory)
+        name = " ".join(list_of_words[1:])
+        destination = router.room_named(name)
+        if destination is None:
+            game.output.print(f"\nLieu '{name}' inconnu.\n")
+            return False
+        if destination is player.current_room:
+            game.output.print(f"\nVous êtes déjà à {destination.name}.\n")
+            return False
+
+        directions = router.route(player.current_room, destination)
+        if directions is None:
+            game.output.print(f"\nAucun chemin ne mène à {destination.name}.\n")
+            return False
+
+        steps = [player.current_room.name]
+        for direction in directions:
+            if not player.move(direction, describe=False):
+                break
+            steps.append(player.current_room.name)
+
+        game.output.print(f"\nVous voyagez : {' → '.join(steps)}\n")
+        game.output.print(player.current_room.get_long_description())
+        return player.current_room is destination
+
     @staticmethod
     def quit(game, list_of_words, number_of_parameters):
         """
@@ -119,13 +185,13 @@ class Actions:
         # If the number of parameters is incorrect, print an error message and return False.
         if l != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
+            game.output.print(MSG0.format(command_word=command_word))
             return False
 
         # Set the finished attribute of the game object to True.
         player = game.player
         msg = f"\nMerci {player.name} d'avoir joué. Au revoir.\n"
-        print(msg)
+        game.output.print(msg)
         game.finished = True
         return True
 
@@ -160,14 +226,14 @@ class Actions:
         l = len(list_of_words)
         if l != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
+            game.output.print(MSG0.format(command_word=command_word))
             return False
 
         # Print the list of available commands.
-        print("\nVoici les commandes disponibles:")
+        game.output.print("\nVoici les commandes disponibles:")
         for command in game.commands.values():
-            print("\t- " + str(command))
-        print()
+            game.output.print("\t- " + str(command))
+        game.output.print()
         return True
 
     @staticmethod
@@ -201,21 +267,21 @@ class Actions:
         l = len(list_of_words)
         if l != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
+            game.output.print(MSG0.format(command_word=command_word))
             return False
 
         player = game.player
         if len(player.visited_rooms)  == 0:
-            print("\nAucune pièce précédente à laquelle revenir.\n")
+            game.output.print("\nAucune pièce précédente à laquelle revenir.\n")
             return False
 
         # Revenir à la dernière pièce visitée
         player.current_room = player.visited_rooms.pop()
-        print(player.current_room.get_long_description())
+        game.output.print(player.current_room.get_long_description())
         # Afficher l'historique des pièces visitées
         history = player.get_history()
         if history:
-            print(history)
+            game.output.print(history)
         return True
 
     @staticmethod
@@ -246,14 +312,14 @@ class Actions:
         l = len(list_of_words)
         if l != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
+            game.output.print(MSG0.format(command_word=command_word))
             return False
 
         room = player.current_room
         output = room.get_long_description()
         output += room.get_inventory()
         output += room.get_characters()
-        print(output)
+        game.output.print(output)
         return True
 
 
@@ -277,7 +343,7 @@ class Actions:
         l = len(list_of_words)
         if l != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
+            game.output.print(MSG1.format(command_word=command_word))
             return False
 
         item_name = list_of_words[1]
@@ -285,7 +351,7 @@ class Actions:
         # Vérifier si l'item existe dans la room
         item = room.inventory.get(item_name)
         if item is None:
-            print(f"\nL'objet '{item_name}' n'existe pas dans cette salle.\n")
+            game.output.print(f"\nL'objet '{item_name}' n'existe pas dans cette salle.\n")
             return False
 
         # Ajouter l'item à l'inventaire du joueur
@@ -296,10 +362,11 @@ class Actions:
         del room.inventory[item_name]
         room.current_weight -= item.weight
 
-        print(f"\nVous avez pris l'objet '{item_name}'.\n")
+        game.output.print(f"\nVous avez pris l'objet '{item_name}'.\n")
 
         # Vérifier les objectifs de quête liés à la prise d'items
         player.quest_manager.check_action_objectives("prendre", item_name)
+        player.increment(TAKE_COUNTER)
 
         return True
 
@@ -322,18 +389,18 @@ class Actions:
         l = len(list_of_words)
         if l != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
+            game.output.print(MSG0.format(command_word=command_word))
             return False
 
         # Afficher l'inventaire du joueur
         if len(player.inventory) == 0:
-            print("\nVotre inventaire est vide.\n")
+            game.output.print("\nVotre inventaire est vide.\n")
             return True
 
-        print("\nVotre inventaire contient les objets suivants:")
+        game.output.print("\nVotre inventaire contient les objets suivants:")
         for item in player.inventory.values():
-            print(f" - {item.name}: {item.description} (poids: {item.weight})")
-        print(f"\nPoids total de l'inventaire: {player.current_weight}\n")
+            game.output.print(f" - {item.name}: {item.description} (poids: {item.weight})")
+        game.output.print(f"\nPoids total de l'inventaire: {player.current_weight}\n")
         return True
 
     @staticmethod
@@ -356,7 +423,7 @@ class Actions:
         l = len(list_of_words)
         if l != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
+            game.output.print(MSG1.format(command_word=command_word))
             return False
 
         item_name = list_of_words[1]
@@ -364,7 +431,7 @@ class Actions:
         # Vérifier si l'item existe dans l'inventaire du joueur
         item = player.inventory.get(item_name)
         if item is None:
-            print(f"\nL'objet '{item_name}' n'existe pas dans votre inventaire.\n")
+            game.output.print(f"\nL'objet '{item_name}' n'existe pas dans votre inventaire.\n")
             return False
 
         # Ajouter l'item à l'inventaire de la room
@@ -375,7 +442,7 @@ class Actions:
         del player.inventory[item_name]
         player.current_weight -= item.weight
 
-        print(f"\nVous avez lâché l'objet '{item_name}'.\n")
+        game.output.print(f"\nVous avez lâché l'objet '{item_name}'.\n")
         return True
 
     @staticmethod
@@ -398,7 +465,7 @@ class Actions:
         l = len(list_of_words)
         if l != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
+            game.output.print(MSG1.format(command_word=command_word))
             return False
 
         character_name = list_of_words[1]
@@ -411,15 +478,16 @@ class Actions:
                 break
 
         if character is None:
-            print(f"\n'{character_name}' ne se trouve pas ici.\n")
+            game.output.print(f"\n'{character_name}' ne se trouve pas ici.\n")
             return False
 
         # Afficher le message du personnage
         msg = character.get_msg()
-        print(f"\n{character.name} : {msg}\n")
+        game.output.print(f"\n{character.name} : {msg}\n")
 
         # Vérifier les objectifs de quête liés à parler à un personnage
         player.quest_manager.check_action_objectives("parler", character_name)
+        player.increment(TALK_COUNTER)
 
         return True
 
@@ -460,7 +528,7 @@ class Actions:
         n = len(list_of_words)
         if n != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
+            game.output.print(MSG0.format(command_word=command_word))
             return False
 
         # Show all quests
@@ -508,19 +576,14 @@ class Actions:
         n = len(list_of_words)
         if n < number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
+            game.output.print(MSG1.format(command_word=command_word))
             return False
 
         # Get the quest title from the list of words (join all words after command)
         quest_title = " ".join(list_of_words[1:])
 
-        # Prepare current counter values to show progress
-        current_counts = {
-            "Se déplacer": game.player.move_count
-        }
-
-        # Show quest details
-        game.player.quest_manager.show_quest_details(quest_title, current_counts)
+        # Show quest details with the current counter values as progress
+        game.player.quest_manager.show_quest_details(quest_title, game.player.counters)
         return True
 
 
@@ -559,7 +622,7 @@ class Actions:
         n = len(list_of_words)
         if n < number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
+            game.output.print(MSG1.format(command_word=command_word))
             return False
 
         # Get the quest title from the list of words (join all words after command)
@@ -571,7 +634,7 @@ class Actions:
 
         msg1 = f"\nImpossible d'activer la quête '{quest_title}'. "
         msg2 = "Vérifiez le nom ou si elle n'est pas déjà active.\n"
-        print(msg1 + msg2)
+        game.output.print(msg1 + msg2)
         # print(f"\nImpossible d'activer la quête '{quest_title}'. \
         #             Vérifiez le nom ou si elle n'est pas déjà active.\n")
         return False
@@ -610,7 +673,7 @@ class Actions:
         n = len(list_of_words)
         if n != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG0.format(command_word=command_word))
+            game.output.print(MSG0.format(command_word=command_word))
             return False
 
         # Show all rewards
@@ -637,7 +700,7 @@ class Actions:
         l = len(list_of_words)
         if l != number_of_parameters + 1:
             command_word = list_of_words[0]
-            print(MSG1.format(command_word=command_word))
+            game.output.print(MSG1.format(command_word=command_word))
             return False
 
         item_name = list_of_words[1]
@@ -645,30 +708,18 @@ class Actions:
         # Vérifier si l'item existe dans l'inventaire du joueur
         item = player.inventory.get(item_name)
         if item is None:
-            print(f"\nL'objet '{item_name}' n'est pas dans votre inventaire.\n")
+            game.output.print(f"\nL'objet '{item_name}' n'est pas dans votre inventaire.\n")
             return False
 
-        # Vérifier si c'est le poison
-        if item_name == "poison":
-            # Marquer le poison comme utilisé (termine la partie)
-            player.used_poison = True
-
-            # Vérifier si toutes les quêtes sont complétées
-            all_quests_completed = all(quest.is_completed for quest in player.quest_manager.quests)
-
-            # Vérifier si le joueur est à Verdenfall
-            if not all_quests_completed or room.name != "Château de Verdenfall":
-                print(f"\nVous avez utilisé le '{item.description}'.\n")
-                print("Vous avez révélé les secrets de la malédiction sans sauver le royaume !\n")
-                return True
-
-            # Conditions de victoire respectées
-            print(f"\nVous avez utilisé le '{item.description}'.\n")
-            print("Vous donnez votre vie ainsi que les âmes pour sauver le royaume.\n")
-            print("Les ténèbres se dissipent enfin du royaume...\n")
+        # Seuls les objets cités par une règle de fin de partie ont un effet :
+        # leur utilisation est transmise au moteur de règles, qui décide
+        # (en temps constant) de la victoire ou de la défaite.
+        if item_name in game.rules.items:
+            game.output.print(f"\nVous avez utilisé le '{item.description}'.\n")
+            game.rules.item_used(item_name, room.name)
             return True
 
         # Pour les autres objets
-        print("\nVous ne pouvez pas utiliser cet objet maintenant.\n")
+        game.output.print("\nVous ne pouvez pas utiliser cet objet maintenant.\n")
         return False
         
\ No newline at end of file
@@ -0,0 +1,616 @@
+"""Mesures de performance du moteur de jeu.
+
+Usage :
+    python bench.py session [--sessions N] [--world FICHIER]
+    python bench.py npcs [--rooms R] [--npcs N] [--ticks T]
+    python bench.py rooms [--rooms R]
+    python bench.py importtime [--runs N]
+    python bench.py assets
+    python bench.py suite [--quick] [--output resultats.json]
+    python bench.py compare ancien.json nouveau.json [--threshold 1.3]
+
+- `session` : compare le coût de création d'une partie par `Game.setup()`
+  et par clonage d'un modèle déjà configuré (`Game.clone()`).
+- `npcs` : compare le coût d'un tour de PNJ avec le `CharacterRegistry` et
+  avec le moteur vectorisé (si NumPy est installé).
+- `rooms` : compare la mémoire occupée par salle avec des objets `Room` et
+  avec le graphe compact `RoomGraph`.
+- `importtime` : coût à froid de l'import du moteur (`game`) et de
+  l'interface graphique (`gui`), mesuré avec `python -X importtime` dans un
+  interpréteur neuf.
+- `assets` : compare la lecture des images de l'interface depuis les
+  fichiers de `assets/` et depuis le paquet de `build_assets.py`.
+- `suite` : suite reproductible couvrant les chemins critiques du moteur
+  (latence de `Game.setup`, débit de `process_command` par type de
+  commande, coût de `move_characters` selon le nombre de PNJ et de salles,
+  coût des vérifications de quêtes selon le nombre de quêtes actives,
+  rendu de `Room.get_inventory` avec de grands inventaires), sur des mondes
+  synthétiques de taille croissante générés à la volée. Les résultats sont
+  écrits en JSON.
+- `compare` : compare deux fichiers de résultats de `suite` et signale les
+  régressions (code de sortie 1).
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+
+from character import CharacterRegistry
+from game import Game
+from item import Item
+from output import NullSink
+from player import Player
+from room import Room
+from room_graph import RoomGraph
+from world import DEFAULT_WORLD, OPPOSITE, build_world, compile_world, load_world, synthetic_world
+
+# Tailles des mondes synthétiques de la suite (complète, puis rapide).
+SUITE_SIZES = {
+    "setup_rooms": ((100, 1000, 10_000), (100, 1000)),
+    "npc_rooms": ((100, 1000, 10_000), (100, 1000)),
+    "npc_counts": ((10, 100, 1000, 10_000), (10, 100, 1000)),
+    "quests": ((10, 100, 1000, 10_000), (10, 100, 1000)),
+    "inventory": ((10, 100, 1000, 10_000), (10, 100, 1000)),
+}
+
+
+def bench_session(sessions, world_path=DEFAULT_WORLD):
+    """
+    Mesure le temps moyen de création d'une session, avec et sans modèle.
+
+    Args:
+        sessions (int): Nombre de sessions créées pour chaque méthode.
+        world_path (str | Path): Fichier de données décrivant le monde.
+
+    Returns:
+        dict: Temps moyens en microsecondes et rapport d'accélération.
+    """
+    def with_setup():
+        Game(world_path).setup(player_name="Bench")
+
+    template = Game(world_path)
+    template.setup(player_name="Modele")
+
+    def with_clone():
+        template.clone("Bench")
+
+    with_setup()  # compile le cache du monde avant de mesurer
+    setup_us = min(timeit.repeat(with_setup, number=sessions, repeat=5)) / sessions * 1e6
+    clone_us = min(timeit.repeat(with_clone, number=sessions, repeat=5)) / sessions * 1e6
+    return {
+        "setup_us": setup_us,
+        "clone_us": clone_us,
+        "speedup": setup_us / clone_us,
+    }
+
+
+def bench_npcs(rooms, npcs, ticks):
+    """
+    Mesure le temps moyen d'un tour de déplacement des PNJ.
+
+    Args:
+        rooms (int): Nombre de salles du monde synthétique.
+        npcs (int): Nombre de PNJ.
+        ticks (int): Nombre de tours mesurés pour chaque moteur.
+
+    Returns:
+        dict: Temps moyens en millisecondes par tour, par moteur.
+    """
+    data = compile_world(synthetic_world(rooms, characters=npcs))
+    sink = NullSink()
+    result = {}
+
+    world = build_world(data)
+    registry = CharacterRegistry(world.characters)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        registry.tick(world.start, sink)
+    result["registry_ms"] = (time.perf_counter() - start) / ticks * 1e3
+
+    try:
+        from npc_engine import VectorizedCharacterEngine
+        world = build_world(data)
+        engine = VectorizedCharacterEngine(world.rooms, world.characters, seed=0)
+    except ImportError:
+        return result
+    start = time.perf_counter()
+    for _ in range(ticks):
+        engine.tick(world.start, sink)
+    result["vectorized_ms"] = (time.perf_counter() - start) / ticks * 1e3
+    return result
+
+
+def _allocated_bytes(build):
+    """Retourne le résultat de `build()` et la mémoire qu'il occupe encore."""
+    tracemalloc.start()
+    try:
+        result = build()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, size
+
+
+def bench_rooms(rooms):
+    """
+    Mesure la mémoire occupée par salle, avec `Room` et avec `RoomGraph`.
+
+    Les deux représentations sont construites à partir du même monde
+    compilé (descriptions toutes différentes) ; `RoomGraph.grid` montre en
+    plus le cas d'un monde généré dont les salles partagent leur description.
+
+    Args:
+        rooms (int): Nombre de salles du monde synthétique.
+
+    Returns:
+        dict: Octets par salle pour chaque représentation et rapport.
+    """
+    data = compile_world(synthetic_world(rooms))
+    _, room_bytes = _allocated_bytes(lambda: build_world(data).rooms)
+    _, graph_bytes = _allocated_bytes(lambda: RoomGraph.from_compiled(data))
+    _, grid_bytes = _allocated_bytes(lambda: RoomGraph.grid(rooms))
+    return {
+        "room_bytes": room_bytes / rooms,
+        "graph_bytes": graph_bytes / rooms,
+        "grid_bytes": grid_bytes / rooms,
+        "ratio": room_bytes / graph_bytes,
+    }
+
+
+def bench_importtime(module, runs=5):
+    """
+    Mesure le coût à froid de `import module` dans un interpréteur neuf.
+
+    Chaque essai lance `python -X importtime -c "import module"` ; on garde
+    le meilleur des essais.
+
+    Args:
+        module (str): Le module à importer.
+        runs (int): Nombre d'essais.
+
+    Returns:
+        dict: Temps cumulé de l'import (µs, d'après `-X importtime`), durée
+            totale du processus (ms), nombre de modules chargés par l'import
+            et présence de `tkinter` parmi eux.
+    """
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stderr
+        process_ms = (time.perf_counter() - start) * 1e3
+
+        # Lignes « import time: propre | cumulé | nom » ; l'import demandé
+        # est la dernière ligne sans indentation, ses dépendances la précèdent.
+        names = []
+        cumulative_us = 0
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                names.append(name)
+                if name.strip() == module and not name[1:].startswith(" "):
+                    cumulative_us = int(cumulative)
+                    break
+        # Modules chargés par l'import : ceux listés après le démarrage de l'interpréteur.
+        top_level = [i for i, name in enumerate(names) if not name[1:].startswith(" ")]
+        first = top_level[-2] + 1 if len(top_level) > 1 else 0
+        loaded = [name.strip() for name in names[first:]]
+        result = {
+            "us": cumulative_us,
+            "process_ms": process_ms,
+            "modules": len(loaded),
+            "tkinter": "tkinter" in loaded,
+        }
+        if best is None or result["us"] < best["us"]:
+            best = result
+    return best
+
+
+def bench_assets():
+    """
+    Compare la lecture des images de l'interface : fichiers séparés contre paquet.
+
+    Deux cas : le démarrage de l'interface (six icônes et image de la salle
+    de départ) et la lecture de toutes les images. Le paquet est construit
+    dans un dossier temporaire ; chaque lecture vérifie, comme dans
+    l'interface, que la source n'a pas changé. Seules les lectures sont
+    mesurées : le décodage par Tk (`PhotoImage`) demande un écran, et il est
+    le même dans les deux cas pour des images déjà à la bonne taille.
+
+    Returns:
+        dict: Temps (µs) des quatre cas, nombre d'images et tailles (octets)
+            des sources et du paquet.
+    """
+    from build_assets import ASSETS_DIR, BUTTON_ICONS, AssetBundle, build_bundle, gui_images
+
+    areas = gui_images()
+    images = list(areas)
+    startup = list(BUTTON_ICONS) + [load_world().start.image]
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "assets.pack"
+        build_bundle(areas, path)
+
+        def from_files(names):
+            for name in names:
+                (ASSETS_DIR / name).read_bytes()
+
+        def from_bundle(names):
+            with AssetBundle(path) as bundle:
+                bundle.source_dir = ASSETS_DIR
+                for name in names:
+                    bundle.read(name)
+
+        return {
+            "startup_files_us": _time_us(lambda: from_files(startup)),
+            "startup_bundle_us": _time_us(lambda: from_bundle(startup)),
+            "all_files_us": _time_us(lambda: from_files(images)),
+            "all_bundle_us": _time_us(lambda: from_bundle(images)),
+            "images": len(images),
+            "source_bytes": sum((ASSETS_DIR / name).stat().st_size for name in images),
+            "bundle_bytes": path.stat().st_size,
+        }
+
+
+def _time_us(func, repeat=3, min_time=0.05):
+    """
+    Temps d'un appel de `func` en microsecondes.
+
+    Le nombre d'appels par série est doublé jusqu'à durer `min_time`
+    secondes ; on garde la meilleure de `repeat` séries.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def suite_setup(sizes, directory):
+    """
+    Latence de `Game.setup()` sur le monde par défaut et des mondes synthétiques.
+
+    Le cache compilé de chaque monde est créé avant la mesure : on mesure un
+    lancement habituel, pas le premier.
+
+    Args:
+        sizes (tuple): Nombres de salles des mondes synthétiques.
+        directory (Path): Dossier où écrire les mondes synthétiques.
+
+    Returns:
+        dict: Identifiant de mesure -> métriques.
+    """
+    paths = {"setup/default": DEFAULT_WORLD}
+    for rooms in sizes:
+        path = Path(directory) / f"synthetic_{rooms}.json"
+        data = synthetic_world(rooms, characters=rooms // 10, items=rooms // 10, quests=10)
+        path.write_text(json.dumps(data), encoding="utf-8")
+        paths[f"setup/rooms={rooms}"] = path
+
+    results = {}
+    for name, path in paths.items():
+        def setup():
+            Game(path, NullSink(), seed=0).setup(player_name="Bench")
+        setup()
+        results[name] = {"us": _time_us(setup)}
+    return results
+
+
+def suite_commands():
+    """
+    Débit de `process_command` par type de commande, sur le monde par défaut.
+
+    Les PNJ sont retirés de la partie pour isoler le coût de la commande
+    (leur tour est mesuré par `suite_npcs`). Les commandes qui changent
+    l'état sont jouées par paires qui se compensent (aller-retour,
+    prendre-déposer).
+
+    Returns:
+        dict: Identifiant de mesure -> métriques.
+    """
+    template = Game(DEFAULT_WORLD, NullSink(), seed=0)
+    template.setup(player_name="Modele")
+    game = template.clone("Bench", NullSink(), seed=0)
+    game.characters = CharacterRegistry()
+    world = game.world
+    player = game.player
+
+    start = world.start
+    direction, edge = next(
+        (d, e) for d, e in start.exit_tuples()
+        if e.target.edges.get(OPPOSITE[d]) is not None and e.target.edges[OPPOSITE[d]].target is start
+    )
+    item_room = next(room for room in world.rooms if room.inventory)
+    item = next(iter(item_room.inventory))
+    character = world.characters[0]
+    character.current_room.characters.remove(character)
+    start.characters.append(character)
+    character.current_room = start
+    far = max(world.rooms, key=lambda room: len(world.router().path(start, room) or ()))
+
+    sequences = {
+        "look": (start, ["look"]),
+        "check": (start, ["check"]),
+        "help": (start, ["help"]),
+        "quests": (start, ["quests"]),
+        "unknown": (start, ["xyz"]),
+        "go": (start, [f"go {direction}", f"go {OPPOSITE[direction]}"]),
+        "travel": (start, [f"travel {far.name}", f"travel {start.name}"]),
+        "take_drop": (item_room, [f"take {item}", f"drop {item}"]),
+        "talk": (start, [f"talk {character.name}"]),
+    }
+    results = {}
+    for name, (room, commands) in sequences.items():
+        player.current_room = room
+
+        def run():
+            # L'historique des salles visitées grandit à chaque déplacement
+            # (et la description l'affiche) : on le vide pour des mesures stables.
+            player.visited_rooms.clear()
+            for command in commands:
+                game.process_command(command)
+        results[f"command/{name}"] = {"us": _time_us(run) / len(commands)}
+        game.command_log.clear()
+    return results
+
+
+def suite_npcs(room_sizes, npc_counts, ticks=5):
+    """
+    Coût d'un tour de `CharacterRegistry` selon le nombre de salles et de PNJ.
+
+    Returns:
+        dict: Identifiant de mesure -> métriques.
+    """
+    results = {}
+    sink = NullSink()
+    for rooms in room_sizes:
+        for npcs in npc_counts:
+            world = build_world(compile_world(synthetic_world(rooms, characters=npcs)))
+            registry = CharacterRegistry(world.characters, random.Random(0))
+            start = time.perf_counter()
+            for _ in range(ticks):
+                registry.tick(world.start, sink)
+            tick_us = (time.perf_counter() - start) / ticks * 1e6
+            results[f"move_characters/rooms={rooms},npcs={npcs}"] = {
+                "us": tick_us,
+                "us_per_npc": tick_us / npcs,
+            }
+    return results
+
+
+def suite_quests(counts):
+    """
+    Coût des vérifications de quêtes selon le nombre de quêtes actives.
+
+    Mesure l'activation de toutes les quêtes, un déplacement du joueur (qui
+    vérifie les objectifs de visite et de compteur) et une vérification de
+    visite qui ne concerne aucune quête.
+
+    Returns:
+        dict: Identifiant de mesure -> métriques.
+
+    Raises:
+        RuntimeError: Si le monde synthétique n'a aucun objectif de visite.
+    """
+    results = {}
+    for quests in counts:
+        world = build_world(compile_world(synthetic_world(100, items=100, quests=quests)))
+        player = Player("Bench", NullSink())
+        player.current_room = world.rooms[0]
+        manager = player.quest_manager
+        if not any(o.kind == "room" for quest in world.quests for o in quest.objectives):
+            raise RuntimeError("Aucun objectif de visite : la mesure ignorerait les quêtes de salle")
+        for quest in world.quests:
+            manager.add_quest(quest)
+        start = time.perf_counter()
+        for quest in world.quests:
+            manager.activate_quest(quest.title)
+        activate_ms = (time.perf_counter() - start) * 1e3
+
+        def move():
+            player.move("E")
+            player.move("O")
+        results[f"quests/active={quests}"] = {
+            "activate_all_ms": activate_ms,
+            "move_us": _time_us(move) / 2,
+            "check_miss_us": _time_us(lambda: manager.check_room_objectives("Nulle part")),
+        }
+    return results
+
+
+def suite_inventory(sizes):
+    """
+    Coût du rendu de `Room.get_inventory` selon le nombre d'objets.
+
+    Returns:
+        dict: Identifiant de mesure -> métriques.
+    """
+    results = {}
+    for size in sizes:
+        room = Room("Entrepôt", "un entrepôt")
+        for i in range(size):
+            room.inventory[f"objet_{i}"] = Item(f"objet_{i}", f"Objet numéro {i}", 1)
+            room.current_weight += 1
+        render_us = _time_us(room.get_inventory)
+        results[f"get_inventory/items={size}"] = {"us": render_us, "us_per_item": render_us / size}
+    return results
+
+
+def suite_imports():
+    """
+    Coût à froid de l'import du moteur sans interface, et de l'interface.
+
+    Returns:
+        dict: Identifiant de mesure -> métriques.
+    """
+    results = {}
+    for module in ("game", "gui"):
+        try:
+            result = bench_importtime(module, runs=3)
+        except subprocess.CalledProcessError:  # Tk absent : pas d'interface à mesurer
+            continue
+        results[f"import/{module}"] = {key: result[key] for key in ("us", "modules")}
+    return results
+
+
+def run_suite(quick=False):
+    """
+    Exécute la suite complète et retourne ses résultats.
+
+    Args:
+        quick (bool): Se limiter aux petites tailles (quelques secondes).
+
+    Returns:
+        dict: Métadonnées (`meta`) et mesures (`benchmarks`), chaque mesure
+            étant un dictionnaire de métriques ; les durées sont en
+            microsecondes (`us`) ou millisecondes (`ms`).
+    """
+    pick = 1 if quick else 0
+    sizes = {name: values[pick] for name, values in SUITE_SIZES.items()}
+    benchmarks = {}
+    with tempfile.TemporaryDirectory() as directory:
+        benchmarks.update(suite_setup(sizes["setup_rooms"], directory))
+    benchmarks.update(suite_commands())
+    benchmarks.update(suite_npcs(sizes["npc_rooms"], sizes["npc_counts"]))
+    benchmarks.update(suite_quests(sizes["quests"]))
+    benchmarks.update(suite_inventory(sizes["inventory"]))
+    benchmarks.update(suite_imports())
+    return {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": quick,
+        },
+        "benchmarks": benchmarks,
+    }
+
+
+def compare_results(old, new, threshold=1.3):
+    """
+    Compare deux résultats de `run_suite` mesure par mesure.
+
+    Args:
+        old (dict): Les résultats de référence.
+        new (dict): Les nouveaux résultats.
+        threshold (float): Rapport nouveau / ancien au-delà duquel une durée
+            est une régression.
+
+    Returns:
+        list: Les triplets (mesure/métrique, rapport, régression ?) des
+            durées présentes dans les deux résultats.
+
+    Examples:
+
+    >>> old = {"benchmarks": {"command/look": {"us": 10.0}}}
+    >>> new = {"benchmarks": {"command/look": {"us": 15.0}}}
+    >>> compare_results(old, new)
+    [('command/look/us', 1.5, True)]
+    """
+    rows = []
+    for name, metrics in new["benchmarks"].items():
+        reference = old["benchmarks"].get(name, {})
+        for metric, value in metrics.items():
+            if metric in reference and reference[metric] > 0:
+                ratio = value / reference[metric]
+                rows.append((f"{name}/{metric}", ratio, ratio > threshold))
+    return rows
+
+
+def main(argv=None):
+    """Point d'entrée en ligne de commande."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="bench", required=True)
+
+    session = subparsers.add_parser("session", help="coût de création d'une session")
+    session.add_argument("--sessions", type=int, default=500)
+    session.add_argument("--world", default=DEFAULT_WORLD)
+
+    npcs = subparsers.add_parser("npcs", help="coût d'un tour de PNJ")
+    npcs.add_argument("--rooms", type=int, default=1000)
+    npcs.add_argument("--npcs", type=int, default=100_000)
+    npcs.add_argument("--ticks", type=int, default=10)
+
+    room_parser = subparsers.add_parser("rooms", help="mémoire occupée par salle")
+    room_parser.add_argument("--rooms", type=int, default=100_000)
+
+    importtime = subparsers.add_parser("importtime", help="coût à froid des imports")
+    importtime.add_argument("--runs", type=int, default=5)
+
+    subparsers.add_parser("assets", help="lecture des images : fichiers ou paquet")
+
+    suite = subparsers.add_parser("suite", help="suite complète, résultats en JSON")
+    suite.add_argument("--quick", action="store_true")
+    suite.add_argument("--output", default=None, help="fichier JSON (sortie standard par défaut)")
+
+    compare = subparsers.add_parser("compare", help="compare deux résultats de la suite")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=1.3)
+
+    args = parser.parse_args(argv)
+
+    if args.bench == "session":
+        result = bench_session(args.sessions, args.world)
+        print(f"Game.setup()  : {result['setup_us']:8.1f} µs / session")
+        print(f"Game.clone()  : {result['clone_us']:8.1f} µs / session")
+        print(f"Accélération  : x{result['speedup']:.1f}")
+    elif args.bench == "npcs":
+        result = bench_npcs(args.rooms, args.npcs, args.ticks)
+        print(f"CharacterRegistry         : {result['registry_ms']:8.2f} ms / tour")
+        if "vectorized_ms" in result:
+            print(f"VectorizedCharacterEngine : {result['vectorized_ms']:8.2f} ms / tour")
+        else:
+            print("VectorizedCharacterEngine : NumPy non installé")
+    elif args.bench == "rooms":
+        result = bench_rooms(args.rooms)
+        print(f"Room                           : {result['room_bytes']:7.1f} octets / salle")
+        print(f"RoomGraph                      : {result['graph_bytes']:7.1f} octets / salle")
+        print(f"RoomGraph.grid (desc. commune) : {result['grid_bytes']:7.1f} octets / salle")
+        print(f"Réduction                      : x{result['ratio']:.1f}")
+    elif args.bench == "importtime":
+        for module in ("game", "gui"):
+            try:
+                result = bench_importtime(module, args.runs)
+            except subprocess.CalledProcessError:
+                print(f"import {module:<5}: impossible (Tk absent ?)")
+                continue
+            tk_state = "avec" if result["tkinter"] else "sans"
+            print(f"import {module:<5}: {result['us'] / 1000:7.1f} ms, {result['modules']:4} modules, "
+                  f"{tk_state} tkinter (processus : {result['process_ms']:.0f} ms)")
+    elif args.bench == "assets":
+        result = bench_assets()
+        print(f"démarrage (7 images)  : fichiers {result['startup_files_us']:8.1f} µs, "
+              f"paquet {result['startup_bundle_us']:8.1f} µs")
+        print(f"toutes ({result['images']} images) : fichiers {result['all_files_us']:8.1f} µs, "
+              f"paquet {result['all_bundle_us']:8.1f} µs")
+        print(f"taille : sources {result['source_bytes'] / 1024:.0f} Kio, "
+              f"paquet {result['bundle_bytes'] / 1024:.0f} Kio")
+    elif args.bench == "suite":
+        text = json.dumps(run_suite(args.quick), indent=1, ensure_ascii=False)
+        if args.output is None:
+            print(text)
+        else:
+            Path(args.output).write_text(text + "\n", encoding="utf-8")
+    elif args.bench == "compare":
+        old = json.loads(Path(args.old).read_text(encoding="utf-8"))
+        new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+        rows = compare_results(old, new, args.threshold)
+        for name, ratio, regression in rows:
+            print(f"{'RÉGRESSION' if regression else 'ok':>10}  x{ratio:5.2f}  {name}")
+        return 1 if any(regression for _, _, regression in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""Construction du paquet d'images de l'interface graphique.
+
+L'interface affiche les images des salles sur un canevas de 600×400 et six
+icônes de boutons de 50×50. Plutôt que d'ouvrir un fichier par image, elle
+lit un paquet unique (`assets/assets.pack`) produit par cette étape :
+
+  - chaque image plus grande que sa zone (le canevas pour les salles,
+    50×50 pour les icônes) est réduite une fois pour toutes, en conservant
+    ses proportions ; une image plus petite n'est jamais agrandie :
+    l'interface la centre à sa taille d'origine, comme avant ;
+  - les PNG obtenus sont mis bout à bout dans un seul fichier, précédé d'un
+    index JSON (nom -> position, taille, dimensions). Lire une image coûte
+    donc un `seek` et un `read`, sans décodage des images inutilisées.
+
+`python bench.py assets` compare la lecture depuis les fichiers et depuis
+le paquet. Avec les images actuelles (déjà à la bonne taille) et un cache
+disque chaud, les deux se valent (environ 0,15 ms pour les sept images du
+démarrage) : le gain attendu tient à la réduction des grandes images, faite
+à la construction plutôt qu'à chaque lancement, pas aux lectures.
+
+Format du paquet :
+
+    b"TBAPACK1" | longueur de l'index (u32 gros-boutiste) | index JSON | données
+
+Chaque entrée de l'index garde la taille et la date de modification de son
+fichier source : une image modifiée depuis la construction n'est plus lue
+dans le paquet (l'interface revient alors au fichier d'origine).
+
+La mise à l'échelle n'utilise que la bibliothèque standard (décodage et
+encodage PNG 8 bits non entrelacés, plus proche voisin), ce qui permet de
+construire le paquet sans Pillow et sans écran.
+
+    python build_assets.py [--world world.json] [--output assets/assets.pack]
+"""
+
+import argparse
+import json
+import os
+import struct
+import zlib
+from pathlib import Path
+
+from world import DEFAULT_WORLD, load_world
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+BUNDLE_PATH = ASSETS_DIR / "assets.pack"
+MAGIC = b"TBAPACK1"
+
+CANVAS_SIZE = (600, 400)
+ICON_SIZE = (50, 50)
+BUTTON_ICONS = ("help-50.png", "up-arrow-50.png", "down-arrow-50.png",
+                "left-arrow-50.png", "right-arrow-50.png", "quit-50.png")
+DEFAULT_SCENE = "scene.png"
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Type de couleur PNG -> nombre de canaux (8 bits par canal, sans palette).
+_CHANNELS = {0: 1, 2: 3, 4: 2, 6: 4}
+
+
+# -------- PNG --------
+
+def png_size(data):
+    """
+    Retourne les dimensions d'une image PNG, lues dans son en-tête.
+
+    Examples:
+
+    >>> png_size(encode_png(3, 2, 4, [bytes(12)] * 2))
+    (3, 2)
+    """
+    if data[:8] != PNG_SIGNATURE or data[12:16] != b"IHDR":
+        raise ValueError("pas une image PNG")
+    return struct.unpack(">II", data[16:24])
+
+
+def _chunks(data):
+    """Parcourt les blocs (type, contenu) d'une image PNG."""
+    position = 8
+    while position < len(data):
+        length, kind = struct.unpack(">I4s", data[position:position + 8])
+        yield kind, data[position + 8:position + 8 + length]
+        position += length + 12
+
+
+def _paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def decode_png(data):
+    """
+    Décode une image PNG 8 bits non entrelacée (niveaux de gris ou couleurs,
+    avec ou sans transparence).
+
+    Returns:
+        tuple: (largeur, hauteur, canaux, lignes de pixels en `bytearray`).
+
+    Raises:
+        ValueError: Si le format n'est pas pris en charge (16 bits, palette,
+            entrelacement).
+    """
+    width, height = png_size(data)
+    header = data[16:29]
+    depth, color_type, _, _, interlace = header[8:]
+    if depth != 8 or color_type not in _CHANNELS or interlace:
+        raise ValueError(f"PNG non pris en charge (profondeur {depth}, type {color_type}, "
+                         f"entrelacement {interlace})")
+    channels = _CHANNELS[color_type]
+    raw = zlib.decompress(b"".join(body for kind, body in _chunks(data) if kind == b"IDAT"))
+    stride = width * channels
+    rows = []
+    previous = bytearray(stride)
+    position = 0
+    for _ in range(height):
+        kind = raw[position]
+        row = bytearray(raw[position + 1:position + 1 + stride])
+        position += stride + 1
+        if kind == 1:
+            for i in range(channels, stride):
+                row[i] = (row[i] + row[i - channels]) & 0xFF
+        elif kind == 2:
+            for i in range(stride):
+                row[i] = (row[i] + previous[i]) & 0xFF
+        elif kind == 3:
+            for i in range(stride):
+                left = row[i - channels] if i >= channels else 0
+                row[i] = (row[i] + ((left + previous[i]) >> 1)) & 0xFF
+        elif kind == 4:
+            for i in range(stride):
+                if i >= channels:
+                    predictor = _paeth(row[i - channels], previous[i], previous[i - channels])
+                else:
+                    predictor = previous[i]
+                row[i] = (row[i] + predictor) & 0xFF
+        rows.append(row)
+        previous = row
+    return width, height, channels, rows
+
+
+def encode_png(width, height, channels, rows):
+    """Encode des lignes de pixels 8 bits en PNG (sans filtre, compression maximale)."""
+    color_type = next(kind for kind, n in _CHANNELS.items() if n == channels)
+
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    raw = b"".join(b"\x00" + bytes(row) for row in rows)
+    return (PNG_SIGNATURE
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 9))
+            + chunk(b"IEND", b""))
+
+
+def fit(size, box):
+    """
+    Dimensions d'une image réduite pour tenir dans `box`, proportions conservées.
+
+    Une image qui tient déjà dans `box` garde sa taille (jamais agrandie).
+
+    Examples:
+
+    >>> fit((400, 400), (600, 400)), fit((1200, 400), (600, 400)), fit((100, 50), (600, 400))
+    ((400, 400), (600, 200), (100, 50))
+    """
+    width, height = size
+    scale = min(1, box[0] / width, box[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def resize(data, size):
+    """
+    Met une image PNG à l'échelle (plus proche voisin).
+
+    Args:
+        data (bytes): L'image PNG.
+        size (tuple): Les dimensions voulues (largeur, hauteur).
+
+    Returns:
+        bytes: L'image PNG mise à l'échelle (l'image d'origine si elle a
+            déjà ces dimensions).
+
+    Examples:
+
+    >>> image = encode_png(4, 2, 1, [bytearray([10, 10, 200, 200])] * 2)
+    >>> decode_png(resize(image, (2, 1)))[3]
+    [bytearray(b'\\n\\xc8')]
+    """
+    if png_size(data) == tuple(size):
+        return data
+    width, height, channels, rows = decode_png(data)
+    new_width, new_height = size
+    columns = [x * width // new_width * channels for x in range(new_width)]
+    resized = []
+    for y in range(new_height):
+        source = rows[y * height // new_height]
+        row = bytearray(new_width * channels)
+        for x, start in enumerate(columns):
+            row[x * channels:(x + 1) * channels] = source[start:start + channels]
+        resized.append(row)
+    return encode_png(new_width, new_height, channels, resized)
+
+
+# -------- Paquet --------
+
+def build_bundle(images, output=BUNDLE_PATH, source_dir=ASSETS_DIR):
+    """
+    Réduit les images trop grandes pour leur zone et les écrit dans un paquet indexé.
+
+    Args:
+        images (dict): Nom du fichier (dans `source_dir`) -> taille de sa
+            zone d'affichage (largeur, hauteur).
+        output (str | Path): Le fichier du paquet.
+        source_dir (str | Path): Le dossier des images sources.
+
+    Returns:
+        dict: L'index écrit (nom -> entrée).
+
+    Examples:
+
+    >>> import tempfile
+    >>> folder = Path(tempfile.mkdtemp())
+    >>> _ = (folder / "salle.png").write_bytes(encode_png(8, 8, 3, [bytes(24)] * 8))
+    >>> index = build_bundle({"salle.png": (6, 4)}, folder / "test.pack", folder)
+    >>> index["salle.png"]["width"], index["salle.png"]["height"]
+    (4, 4)
+    >>> with AssetBundle(folder / "test.pack") as bundle:
+    ...     png_size(bundle.read("salle.png")), bundle.read("absente.png")
+    ((4, 4), None)
+    """
+    source_dir = Path(source_dir)
+    index = {}
+    blobs = []
+    offset = 0
+    for name, box in images.items():
+        path = source_dir / name
+        stat = path.stat()
+        data = path.read_bytes()
+        size = png_size(data)
+        data = resize(data, fit(size, box))
+        width, height = png_size(data)
+        index[name] = {
+            "offset": offset, "size": len(data), "width": width, "height": height,
+            "source": [stat.st_size, stat.st_mtime_ns],
+        }
+        blobs.append(data)
+        offset += len(data)
+    header = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    temporary = Path(f"{output}.tmp")
+    with open(temporary, "wb") as file:
+        file.write(MAGIC + struct.pack(">I", len(header)) + header)
+        file.writelines(blobs)
+    os.replace(temporary, output)
+    return index
+
+
+class AssetBundle:
+    """
+    Lecture d'un paquet produit par `build_bundle`.
+
+    L'index est lu à l'ouverture ; chaque image est ensuite lue à la
+    demande (un `seek` et un `read`).
+
+    Attributes:
+        path (Path): Le fichier du paquet.
+        index (dict): Nom -> position, taille, dimensions et source.
+        source_dir (Path): Le dossier des images sources (celui du paquet).
+    """
+
+    def __init__(self, path=BUNDLE_PATH):
+        """
+        Ouvre un paquet.
+
+        Raises:
+            OSError: Si le fichier ne peut pas être ouvert.
+            ValueError: Si le fichier n'est pas un paquet d'images.
+        """
+        self.path = Path(path)
+        self.source_dir = self.path.parent
+        self._file = open(self.path, "rb")
+        try:
+            head = self._file.read(len(MAGIC) + 4)
+            if head[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{self.path} n'est pas un paquet d'images")
+            (length,) = struct.unpack(">I", head[len(MAGIC):])
+            self.index = json.loads(self._file.read(length))
+        except Exception:
+            self._file.close()
+            raise
+        self._base = len(head) + length
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read(self, name):
+        """
+        Retourne les octets PNG d'une image du paquet.
+
+        Returns:
+            bytes | None: L'image, ou None si elle est absente du paquet ou
+                si son fichier source a changé depuis la construction.
+        """
+        entry = self.index.get(name)
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(self.source_dir / name)
+        except OSError:
+            pass  # source absente : le paquet fait foi
+        else:
+            if [stat.st_size, stat.st_mtime_ns] != entry["source"]:
+                return None
+        self._file.seek(self._base + entry["offset"])
+        return self._file.read(entry["size"])
+
+    def close(self):
+        """Ferme le fichier du paquet."""
+        self._file.close()
+
+
+def gui_images(world_path=DEFAULT_WORLD, source_dir=ASSETS_DIR):
+    """
+    Liste les images affichées par l'interface et la taille de leur zone.
+
+    Returns:
+        dict: Nom -> (largeur, hauteur) : les images des salles du monde (et
+            l'image par défaut si elle existe) pour le canevas, puis les
+            icônes des boutons.
+    """
+    rooms = sorted({room.image for room in load_world(world_path).rooms if room.image})
+    if (Path(source_dir) / DEFAULT_SCENE).exists():
+        rooms.append(DEFAULT_SCENE)
+    images = {name: CANVAS_SIZE for name in rooms}
+    images.update((name, ICON_SIZE) for name in BUTTON_ICONS)
+    return images
+
+
+def main(argv=None):
+    """Point d'entrée : `python build_assets.py [--world world.json] [--output paquet]`."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--world", default=str(DEFAULT_WORLD))
+    parser.add_argument("--output", default=str(BUNDLE_PATH))
+    args = parser.parse_args(argv)
+
+    images = gui_images(args.world)
+    sources = {name: png_size((ASSETS_DIR / name).read_bytes()) for name in images}
+    index = build_bundle(images, args.output)
+    resized = [name for name, entry in index.items()
+               if sources[name] != (entry["width"], entry["height"])]
+    total = sum(entry["size"] for entry in index.values())
+    print(f"{args.output} : {len(index)} images, {total / 1024:.0f} Kio "
+          f"({len(resized)} réduites{' : ' + ', '.join(resized) if resized else ''})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
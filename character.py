@@ -2,7 +2,9 @@
 
 Ce module gère les personnages non-joueurs (PNJ) du jeu d'aventure.
 Les personnages peuvent être interrogés, affichent des messages, et se
-déplacent aléatoirement dans le monde du jeu.
+déplacent aléatoirement dans le monde du jeu. Les tirages utilisent le
+générateur passé en paramètre (celui de la partie, voir `Game.rng`) : deux
+parties de même graine sont identiques, même jouées côte à côte.
 """
 import random as rd
 
@@ -52,15 +54,18 @@ class Character:
         """
         return f"{self.name} : {self.description}"
 
-    def talk(self):
+    def talk(self, rng=rd):
         """
         Retourne un message aléatoire de la liste des messages du personnage.
         
+        Args:
+            rng: Générateur aléatoire (module `random` par défaut).
+
         Returns:
             str: Un message sélectionné aléatoirement dans la liste des messages.
         """
         if self.msgs:
-            return rd.choice(self.msgs)
+            return rng.choice(self.msgs)
         return ""
 
     def get_msg(self):
@@ -96,7 +101,7 @@ class Character:
         msg = self.msgs_cycle.pop(0)
         return msg
 
-    def move(self):
+    def move(self, rng=rd):
         """
         Déplace le personnage dans une pièce adjacente au hasard avec une probabilité de 50%.
         
@@ -104,6 +109,9 @@ class Character:
         - Le personnage a une chance sur deux de se déplacer ou de rester sur place
         - S'il se déplace, il va dans une pièce adjacente au hasard
         
+        Args:
+            rng: Générateur aléatoire (module `random` par défaut).
+
         Returns:
             bool: True si le personnage s'est déplacé, False sinon.
         
@@ -118,15 +126,96 @@ class Character:
         """
 
         # Le personnage a une chance sur deux de se déplacer
-        if rd.choice([True, False]):
+        if rng.choice([True, False]):
             # Vérifier qu'il y a des sorties disponibles
-            if self.current_room and self.current_room.exits:
-                # Filtrer les sorties pour ne garder que les vraies salles (pas None)
-                exit_rooms = [room for room in self.current_room.exits.values() if room is not None]
+            if self.current_room and self.current_room.edges:
+                # Ne garder que les passages libres (ni interdits, ni verrouillés, ni gardés par un objet)
+                exit_rooms = self.current_room.open_exits()
                 # Vérifier qu'il y a au moins une sortie valide
                 if exit_rooms:
-                    self.current_room = rd.choice(exit_rooms)
+                    self.current_room = rng.choice(exit_rooms)
                     return True
 
         # Le personnage ne se déplace pas
         return False
+
+
+class CharacterRegistry:
+    """
+    Registre central des personnages non-joueurs d'une partie.
+
+    Le registre fait avancer chaque PNJ exactement une fois par tour, en
+    parcourant la liste des PNJ plutôt que toutes les salles : le coût d'un
+    tour dépend du nombre de PNJ, pas de la taille du monde.
+
+    Attributes:
+        characters (list): Les PNJ enregistrés.
+        rng: Générateur aléatoire des déplacements.
+
+    Exemple:
+        >>> from room import Room
+        >>> from output import CONSOLE
+        >>> room = Room("Salle", "une salle")
+        >>> gardien = Character("Gardien", "Un gardien", room, ["Bonjour"])
+        >>> room.characters.append(gardien)
+        >>> registry = CharacterRegistry([gardien])
+        >>> len(registry)
+        1
+        >>> registry.tick(room, CONSOLE)  # Aucune sortie : le gardien reste
+        >>> gardien.current_room is room
+        True
+    """
+
+    def __init__(self, characters=(), rng=rd):
+        """
+        Initialise le registre.
+
+        Args:
+            characters (iterable): Les PNJ à enregistrer.
+            rng: Générateur aléatoire (module `random` par défaut).
+        """
+        self.characters = list(characters)
+        self.rng = rng
+
+    def add(self, character):
+        """Enregistre un PNJ (il doit déjà figurer dans sa salle)."""
+        self.characters.append(character)
+
+    def remove(self, character):
+        """Retire un PNJ du registre et de sa salle."""
+        self.characters.remove(character)
+        if character.current_room is not None:
+            character.current_room.characters.remove(character)
+
+    def __iter__(self):
+        return iter(self.characters)
+
+    def __len__(self):
+        return len(self.characters)
+
+    def tick(self, player_room, output):
+        """
+        Fait avancer tous les PNJ d'un tour.
+
+        Affiche un message si un personnage quitte ou rejoint la salle du
+        joueur.
+
+        Args:
+            player_room (Room): La salle où se trouve le joueur.
+            output: La sortie de la partie.
+        """
+        for character in self.characters:
+            old_room = character.current_room
+            if not character.move(self.rng):
+                continue
+
+            new_room = character.current_room
+            # Mettre à jour la liste des personnages de chaque salle
+            old_room.characters.remove(character)
+            new_room.characters.append(character)
+
+            # Afficher un message si le joueur est concerné
+            if old_room is player_room:
+                output.print(f"\n{character.name} quitte la salle.\n")
+            elif new_room is player_room:
+                output.print(f"\n{character.name} entre dans la salle.\n")
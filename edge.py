@@ -0,0 +1,80 @@
+"""Module contenant la classe `Edge`.
+
+Une `Edge` est une sortie typée d'une salle vers une autre : en plus de la
+salle d'arrivée, elle porte les attributs du passage (sens unique,
+verrouillé, objet requis, coût de traversée). Chaque salle range ses sorties
+dans une table direction -> `Edge` (`Room.edges`), si bien que vérifier un
+déplacement ne demande qu'une recherche dans cette table.
+"""
+
+
+class Edge:
+    """
+    Représente un passage d'une salle vers une autre.
+
+    Attributes:
+        target (Room): La salle d'arrivée.
+        cost (int): Coût de traversée, utilisé par le calcul d'itinéraires.
+        one_way (bool): Passage à sens unique (aucun retour possible).
+        blocked (bool): Côté interdit d'un passage à sens unique : la sortie
+            est visible mais ne peut pas être empruntée.
+        locked (bool): Passage verrouillé.
+        requires (str | None): Nom de l'objet à posséder pour passer.
+
+    Exemple:
+        >>> from room import Room
+        >>> mist = Edge(Room("Mireval", "dans la brume."), requires="masque")
+        >>> mist.free
+        False
+        >>> print(mist.check({}))
+        <BLANKLINE>
+        Il vous faut masque pour passer.
+        <BLANKLINE>
+        >>> mist.check({"masque": None}) is None
+        True
+    """
+
+    __slots__ = ("target", "cost", "one_way", "blocked", "locked", "requires")
+
+    def __init__(self, target, cost=1, one_way=False, blocked=False, locked=False, requires=None):
+        self.target = target
+        self.cost = cost
+        self.one_way = one_way
+        self.blocked = blocked
+        self.locked = locked
+        self.requires = requires
+
+    def __repr__(self):
+        return f"Edge({getattr(self.target, 'name', self.target)!r})"
+
+    @property
+    def free(self):
+        """True si tout le monde (joueur ou PNJ) peut emprunter le passage."""
+        return not (self.blocked or self.locked or self.requires)
+
+    def check(self, inventory=()):
+        """
+        Vérifie si le passage peut être emprunté.
+
+        Args:
+            inventory (dict | set): Les objets possédés (seules les clés comptent).
+
+        Returns:
+            str | None: Le message de refus à afficher, ou None si le passage
+                est libre.
+        """
+        if self.blocked:
+            return "\nPassage interdit !\n"
+        if self.locked:
+            return "\nLe passage est verrouillé.\n"
+        if self.requires is not None and self.requires not in inventory:
+            return f"\nIl vous faut {self.requires} pour passer.\n"
+        return None
+
+    def passable(self, keys=()):
+        """True si le passage peut être emprunté avec les objets `keys`."""
+        return not (self.blocked or self.locked) and (self.requires is None or self.requires in keys)
+
+    def retarget(self, target):
+        """Retourne une copie de ce passage menant à `target` (utilisé pour cloner un monde)."""
+        return Edge(target, self.cost, self.one_way, self.blocked, self.locked, self.requires)
@@ -7,20 +7,19 @@ Il gère également la boucle principale du jeu et l'interaction avec le joueur.
 
 # Import modules
 
-from pathlib import Path
+import random
 import sys
 
-# Tkinter imports for GUI
-import tkinter as tk
-from tkinter import ttk, simpledialog
+# L'interface Tkinter vit dans le module `gui`, importé seulement quand on
+# l'ouvre : la console, les simulations et les tests ne chargent pas Tk.
 
-from room import Room
 from player import Player
 from command import Command
 from actions import Actions
-from item import Item
-from character import Character
-from quest import Quest
+from output import BufferedSink, CONSOLE
+from character import CharacterRegistry
+from rules import LOSE, WIN, RuleEngine
+from world import DEFAULT_WORLD, load_world
 
 class Game:
     """
@@ -32,18 +31,38 @@ class Game:
     Attributes:
         finished (bool): Indique si le jeu est terminé.
         rooms (list): Liste de toutes les salles du jeu.
+        characters (CharacterRegistry): Registre des personnages non-joueurs.
         commands (dict): Dictionnaire des commandes disponibles.
         player (Player): Le joueur actuel du jeu.
+        world (World): Le monde joué (salles, personnages, quêtes).
+        world_path (Path): Fichier de données décrivant le monde.
+        output: Sortie de la partie (voir le module `output`).
+        seed (int | None): Graine du générateur aléatoire de la partie.
+        rng (random.Random): Générateur aléatoire propre à la partie (PNJ).
+        command_log (list): Commandes traitées depuis le début de la partie,
+            rejouables avec le module `replay`.
+        latency (LatencyRecorder | None): Mesures de latence des commandes,
+            si l'instrumentation est activée (module `instrument`).
     
     Methods:
-        __init__(): Initialise le jeu.
+        __init__(world_path, output, seed): Initialise le jeu.
         setup(player_name): Configure le jeu avec toutes les salles et commandes.
+        clone(player_name): Crée une nouvelle partie à partir d'un modèle.
     """
 
-    def __init__(self):
+    def __init__(self, world_path=DEFAULT_WORLD, output=None, seed=None):
         """
         Initialise une nouvelle instance du jeu.
         
+        Args:
+            world_path (str | Path, optional): Fichier de données décrivant le
+                monde (par défaut `world.json`).
+            output (optional): Sortie de la partie. Par défaut, les messages
+                sont écrits directement sur la console.
+            seed (int, optional): Graine du générateur aléatoire de la partie.
+                Si None, une graine est tirée au hasard (et conservée dans
+                `seed` pour pouvoir rejouer la partie).
+
         Crée les structures de base : liste vide de salles, dictionnaire vide
         de commandes et définit le joueur à None jusqu'à son création.
         """
@@ -51,6 +70,15 @@ class Game:
         self.rooms = []
         self.commands = {}
         self.player = None
+        self.world = None
+        self.characters = CharacterRegistry()
+        self.rules = RuleEngine()
+        self.world_path = world_path
+        self.output = output if output is not None else CONSOLE
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        self.command_log = []
+        self.latency = None
 
     def setup(self, player_name=None):
         """
@@ -62,10 +90,9 @@ class Game:
         
         Cette méthode :
         - Configure toutes les commandes disponibles (help, quit, go, look, etc.)
-        - Crée toutes les salles du monde du jeu
-        - Ajoute les connexions entre les salles (exits)
-        - Ajoute les objets et personnages dans les salles
-        - Crée le joueur et l'initialise dans la première salle
+        - Charge le monde (salles, sorties, objets, personnages et quêtes)
+          depuis le fichier de données, via son cache compilé
+        - Crée le joueur et l'initialise dans la salle de départ
         """
 
 
@@ -89,6 +116,12 @@ class Game:
             Actions.go,
             1
         )
+        self.commands["travel"] = Command(
+            "travel",
+            " <lieu> : voyager jusqu'à un lieu par le plus court chemin",
+            Actions.travel,
+            1
+        )
         self.commands["back"] = Command(
             "back",
             " : revenir à la pièce précédente",
@@ -160,226 +193,70 @@ class Game:
         )
 
 
-        # Setup rooms
+        # Setup world (rooms, exits, items, pnjs and quests)
 
-        eldregrove = Room(
-            "Eldregrove",
-            "une forêt ancienne où les arbres semblent observer les voyageurs.",
-            "Eldregrove.png"
-        )
-        self.rooms.append(eldregrove)
-        verdenfall = Room(
-            "Verdenfall",
-            "ancienne couronne du royaume, château en ruines.",
-            "Verdenfall.png"
-        )
-        self.rooms.append(verdenfall)
-        brunnhold = Room(
-            "Brunnhold",
-            "village partiellement ravagé par les combats.",
-            "Brunnhold.png"
-        )
-        self.rooms.append(brunnhold)
-        mireval = Room(
-            "Mireval",
-            "hameau noyé dans une brume perpétuelle.",
-            "Mireval.png"
-        )
-        self.rooms.append(mireval)
-        stonebridge = Room(
-            "Stonebridge",
-            "forteresse-village robuste, dernier rempart.",
-            "Stonebridge.png"
-        )
-        self.rooms.append(stonebridge)
-        dornhollow = Room(
-            "Dornhollow",
-            "village englouti par les marécages.",
-            "Dornhollow.png"
-        )
-        self.rooms.append(dornhollow)
-        blackmere = Room(
-            "Blackmere",
-            "hameau lacustre où les pêcheurs disparaissent.",
-            "Blackmere.png"
-        )
-        self.rooms.append(blackmere)
-        grisepierre = Room(
-            "Grisepierre",
-            "hameau minier hanté par un minerai étrange.",
-            "Grisepierre.png"
-        )
-        self.rooms.append(grisepierre)
-        val_cendre = Room(
-            "Val-Cendré",
-            "village couvert d'une cendre éternelle.",
-            "Val_Cendre.png"
-        )
-        self.rooms.append(val_cendre)
-        ravenglade = Room(
-            "Ravenglade",
-            "hameau forestier envahi de corbeaux.",
-            "Ravenglade.png"
-        )
-        self.rooms.append(ravenglade)
-        sangrun = Room(
-            "Sangrun",
-            "grotte où résident les âmes tourmentées.",
-            "Sangrun.png"
-        )
-        self.rooms.append(sangrun)
+        self._setup_world(load_world(self.world_path), player_name)
 
+    def _setup_world(self, world, player_name=None):
+        """
+        Installe un monde chargé dans la partie et y place un nouveau joueur.
 
+        Args:
+            world (World): Le monde à jouer.
+            player_name (str, optional): Le nom du joueur. Si None, il est
+                demandé au clavier.
+        """
+        self.world = world
+        self.rooms = world.rooms
+        self.characters = CharacterRegistry(world.characters, self.rng)
 
-        # Setup pnjs
-        guardian = Character(
-            "Gardien",
-            "Un vieux gardien mystérieux",
-            brunnhold,
-            [
-                "Bienvenue voyageur, je suis le gardien.",
-                "Attention aux ombres qui rôdent!"
-            ]
-        )
-        brunnhold.characters.append(guardian)
-        messenger = Character(
-            "Messager",
-            "Un messager essoufflé",
-            stonebridge,
-            [
-                "Les ténèbres avancent, soyons vigilants.",
-                "Avez-vous entendu parler de Mireval?",
-                "Seul un vaillant guerrier atteindra Verdenfall."
-            ]
-        )
-        stonebridge.characters.append(messenger)
-
-
-        # Create exits for rooms
-
-        verdenfall.exits = {
-            "N": None,
-            "E": None,
-            "S": sangrun,
-            "O": None
-        }
-        brunnhold.exits = {
-            "N": dornhollow,
-            "E": blackmere,
-            "S": eldregrove,
-            "O": None
-        }
-        mireval.exits = {
-            "N": None,
-            "E": sangrun,
-            "S": stonebridge,
-            "O": None
-        }
-        dornhollow.exits = {
-            "N": stonebridge,
-            "E": val_cendre,
-            "S": brunnhold,
-            "O": None
-        }
-        sangrun.exits = {
-            "N": verdenfall,
-            "E": None,
-            "S": ravenglade,
-            "O": mireval
-        }
-        eldregrove.exits = {
-            "N": brunnhold,
-            "E": None,
-            "S": None,
-            "O": None
-        }
-        stonebridge.exits = {
-            "N": mireval,
-            "E": None,
-            "S": dornhollow,
-            "O": None
-        }
-        # Blackmere : passage à sens unique
-        blackmere.exits = {
-            "N": grisepierre,
-            "E": None,
-            "S": None,
-            "O": None
-        }
-        grisepierre.exits = {
-            "N": None,
-            "E": None,
-            "S": blackmere,
-            "O": ravenglade
-        }
-        val_cendre.exits = {
-            "N": ravenglade,
-            "E": None,
-            "S": None,
-            "O": dornhollow
-        }
-        ravenglade.exits = {
-            "N": sangrun,
-            "E": grisepierre,
-            "S": val_cendre,
-            "O": None
-        }
         # Setup player and starting room
 
         if player_name is None:
             player_name = input("\nEntrez votre nom: ")
-        self.player = Player(player_name)
-        self.player.current_room = eldregrove
-
-        # Setup items
-        sword = Item(
-            "epee",
-            "Epee des Tenebres",
-            2
-        )
-        mask = Item(
-            "masque",
-            "Masque anti-brume",
-            1
-        )
-        shield = Item(
-            "bouclier",
-            "Bouclier de protection",
-            3
-        )
-        soul_miner = Item(
-            "ame_mineur",
-            "Ame du mineur",
-            1
-        )
-        soul_fisher = Item(
-            "ame_pecheur",
-            "Ame du pecheur",
-            1
-        )
-        soul_lord = Item(
-            "ame_seigneur",
-            "Ame du Seigneur",
-            2
-        )
-        poison = Item(
-            "poison",
-            "Poison de verite",
-            1
-        )
-
-        # Setup items location
-        brunnhold.inventory["epee"] = sword
-        mireval.inventory["masque"] = mask
-        blackmere.inventory["bouclier"] = shield
-        grisepierre.inventory["ame_mineur"] = soul_miner
-        blackmere.inventory["ame_pecheur"] = soul_fisher
-        mireval.inventory["ame_seigneur"] = soul_lord
-        verdenfall.inventory["poison"] = poison
+        self.player = Player(player_name, self.output)
+        self.player.current_room = world.start
 
         # Setup quests
-        self._setup_quests()
+        for quest in world.quests:
+            self.player.quest_manager.add_quest(quest)
 
+        # Setup end-of-game rules, fed by quest completions and item uses
+        remaining = sum(not quest.is_completed for quest in world.quests)
+        self.rules = RuleEngine.from_compiled(world.rules, remaining)
+        self.player.quest_manager.on_quest_completed = self.rules.quest_completed
+
+    def clone(self, player_name, output=None, seed=None):
+        """
+        Crée une nouvelle partie à partir de ce jeu utilisé comme modèle.
+
+        Le modèle est configuré une seule fois avec `setup()` ; chaque session
+        est ensuite obtenue par une copie rapide de son monde, sans relire le
+        fichier de données ni reconstruire les commandes. Le modèle ne doit pas
+        être joué lui-même.
+
+        Args:
+            player_name (str): Le nom du joueur de la nouvelle partie.
+            output (optional): Sortie de la nouvelle partie.
+            seed (int, optional): Graine du générateur de la nouvelle partie.
+
+        Returns:
+            Game: La nouvelle partie, prête à être jouée.
+
+        Examples:
+
+        >>> template = Game()
+        >>> template.setup("Modele")
+        >>> session = template.clone("Alice")
+        >>> session.player.name, session.player.current_room.name
+        ('Alice', 'Eldregrove')
+        >>> session.rooms[0] is template.rooms[0]
+        False
+        """
+        game = Game(self.world_path, output, seed)
+        game.commands = dict(self.commands)
+        game._setup_world(self.world.clone(), player_name)
+        return game
 
     def play(self):
         """
@@ -391,19 +268,8 @@ class Game:
 
         self.setup()
         self.print_welcome()
-        # Initialiser la flag used_poison du joueur
-        self.player.used_poison = False
-        # Loop until the game is finished
+        # Loop until the game is finished (quit, victoire ou défaite)
         while not self.finished:
-            # Vérifier les conditions de victoire et défaite
-            if self.win():
-                print("\n🏆 Vous avez sauvé le royaume ! Victoire !\n")
-                self.finished = True
-                break
-            if self.loose():
-                print("\n☠️  Vous avez perdu... Le poison vous a vaincu.\n")
-                self.finished = True
-                break
             # Get the command from the player
             self.process_command(input("> "))
         return None
@@ -414,132 +280,133 @@ class Game:
 
         Analyse la chaîne de commande, vérifie si la commande existe,
         l'exécute si valide, affiche une erreur sinon, puis déplace
-        tous les personnages non-joueurs.
+        tous les personnages non-joueurs. La sortie est vidée une seule
+        fois, à la fin de la commande.
+
+        Chaque étape est une méthode distincte, ce qui permet au module
+        `instrument` de les chronométrer séparément.
 
         Args:
             command_string (str): La chaîne de commande entrée par le joueur.
         """
 
+        self.command_log.append(command_string)
+
+        command, list_of_words = self.parse_command(command_string)
+        self.execute_command(command, list_of_words)
+
+        # Déplacer tous les personnages non-joueurs après chaque commande
+        self.move_characters()
+
+        self.check_end_of_game()
+
+        self.output.flush()
+
+    def parse_command(self, command_string):
+        """
+        Découpe une commande et retrouve la commande du jeu correspondante.
+
+        Args:
+            command_string (str): La chaîne de commande entrée par le joueur.
+
+        Returns:
+            tuple: (Command ou None si le mot est inconnu, liste des mots).
+        """
         # Split the command string into a list of words
         list_of_words = command_string.split(" ")
+        return self.commands.get(list_of_words[0]), list_of_words
 
-        command_word = list_of_words[0]
+    def execute_command(self, command, list_of_words):
+        """
+        Exécute une commande analysée, ou signale une commande inconnue.
 
+        Args:
+            command (Command | None): La commande, None si le mot est inconnu.
+            list_of_words (list): Les mots de la commande.
+        """
         # If the command is not recognized, print an error message
-        if command_word not in self.commands.keys():
-            msg = (f"\nCommande '{command_word}' non reconnue. "
+        if command is None:
+            msg = (f"\nCommande '{list_of_words[0]}' non reconnue. "
                    "Entrez 'help' pour voir les commandes disponibles.\n")
-            print(msg)
+            self.output.print(msg)
         # If the command is recognized, execute it
         else:
-            command = self.commands[command_word]
             command.action(self, list_of_words, command.number_of_parameters)
 
-        # Déplacer tous les personnages non-joueurs après chaque commande
-        self.move_characters()
+    def check_end_of_game(self):
+        """Termine la partie dès que les règles ont décidé de son issue."""
+        # Fin de partie décidée par les règles au fil des événements
+        if self.rules.outcome is not None and not self.finished:
+            self.output.print(self.rules.message)
+            self.finished = True
 
     def win(self):
         """
-        Check if the player has won the game.
-        Win condition: All quests are completed AND the player has used poison at Verdenfall.
-        
-        Returns:
-            bool: True if the player has won, False otherwise.
-        """
-        # Check if all quests are completed
-        all_quests_completed = all(quest.is_completed for quest in self.player.quest_manager.quests)
+        Indique si le joueur a gagné la partie.
 
-        # Check if player has used poison at Verdenfall
-        used_poison_at_verdenfall = self.player.used_poison
+        La condition de victoire est déclarée dans les règles du monde
+        (toutes les quêtes terminées ET poison utilisé à Verdenfall) et
+        tenue à jour par le moteur de règles : aucun parcours des quêtes.
 
-        return all_quests_completed and used_poison_at_verdenfall
+        Returns:
+            bool: True si le joueur a gagné, False sinon.
+        """
+        return self.rules.outcome == WIN
 
     def loose(self):
         """
-        Check if the player has lost the game.
-        Loss condition: The player has used poison.
-        
+        Indique si le joueur a perdu la partie (poison utilisé trop tôt ou ailleurs).
+
         Returns:
-            bool: True if the player has lost, False otherwise.
+            bool: True si le joueur a perdu, False sinon.
         """
-        return self.player.used_poison
-
-    def _setup_quests(self):
-        """Initialize all quests."""
-        travel_quest = Quest(
-            title="Grand Voyageur",
-            description="Déplacez-vous 10 fois entre les lieux.",
-            objectives=["Se déplacer 10 fois"],
-            reward="Bottes de voyageur"
-        )
+        return self.rules.outcome == LOSE
 
-        dark_sword_quest = Quest(
-            title="Récupérer l'Épée des Ténèbres",
-            description="Retrouvez l'Épée des Ténèbres.",
-            objectives=["prendre epee"],
-            reward="Épée des Ténèbres"
-        )
+    def use_vectorized_characters(self, seed=None):
+        """
+        Remplace le registre des PNJ par le moteur vectorisé (NumPy).
 
-        messenger_quest = Quest(
-            title="Parler avec le Messager",
-            description="Allez à Stonebridge et parlez au Messager.",
-            objectives=["parler avec Messager"],
-            reward="Information précieuse"
-        )
+        À réserver aux mondes peuplés de très nombreux PNJ ; voir le module
+        `npc_engine`.
 
-        verdenfall_quest = Quest(
-            title="Atteindre Verdenfall",
-            description="Trouvez votre chemin jusqu'à Verdenfall.",
-            objectives=["Visiter Verdenfall"],
-            reward="Accès à Verdenfall"
-        )
+        Args:
+            seed (int, optional): Graine du générateur aléatoire du moteur.
+                Par défaut, elle est tirée du générateur de la partie.
 
-        souls_quest = Quest(
-            title="Récupérer les âmes",
-            description="Collectez les trois âmes perdues.",
-            objectives=[
-                "prendre ame_mineur",
-                "prendre ame_pecheur",
-                "prendre ame_seigneur"
-            ],
-            reward="Pouvoir des âmes"
-        )
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        from npc_engine import VectorizedCharacterEngine
+
+        if seed is None:
+            seed = self.rng.getrandbits(32)
+        self.characters = VectorizedCharacterEngine(self.rooms, self.characters, seed)
+
+    def use_fast_forward_characters(self, horizon=3):
+        """
+        Remplace le registre des PNJ par un registre à avance rapide.
+
+        Les PNJ éloignés du joueur ne sont plus simulés tour par tour : leur
+        position est tirée selon la chaîne de Markov de leur déplacement
+        lorsqu'ils redeviennent observables (voir le module `markov`).
 
-        # Add quests to player's quest manager
-        self.player.quest_manager.add_quest(travel_quest)
-        self.player.quest_manager.add_quest(dark_sword_quest)
-        self.player.quest_manager.add_quest(messenger_quest)
-        self.player.quest_manager.add_quest(verdenfall_quest)
-        self.player.quest_manager.add_quest(souls_quest)
+        Args:
+            horizon (int): Distance au joueur à partir de laquelle un PNJ est
+                endormi.
+        """
+        from markov import FastForwardRegistry
 
+        self.characters = FastForwardRegistry(self.rooms, self.characters, horizon, self.rng)
 
     def move_characters(self):
         """
         Déplace tous les personnages non-joueurs présents dans le jeu.
-        Affiche un message si un personnage se déplace dans ou hors de la salle du joueur.
+
+        Chaque PNJ du registre avance exactement une fois ; le coût dépend du
+        nombre de PNJ et non du nombre de salles. Affiche un message si un
+        personnage se déplace dans ou hors de la salle du joueur.
         """
-        player_room = self.player.current_room
-
-        # Parcourir toutes les salles pour trouver les personnages
-        for room in self.rooms:
-            characters_in_room = list(room.characters)
-            for character in characters_in_room:
-                old_room = character.current_room
-                # Déplacer le personnage
-                moved = character.move()
-
-                if moved:
-                    new_room = character.current_room
-                    # Retirer le personnage de l'ancienne salle
-                    old_room.characters.remove(character)
-                    # Ajouter le personnage à la nouvelle salle
-                    new_room.characters.append(character)
-
-                    # Afficher un message si le joueur est concerné
-                    if old_room == player_room:
-                        print(f"\n{character.name} quitte la salle.\n")
-                    elif new_room == player_room:
-                        print(f"\n{character.name} entre dans la salle.\n")
+        self.characters.tick(self.player.current_room, self.output)
 
     def print_welcome(self):
         """
@@ -548,279 +415,78 @@ class Game:
         Affiche le nom du joueur, les instructions d'aide et la description
         détaillée de la salle de départ.
         """
-        print(f"\nBienvenue {self.player.name} dans ce jeu d'aventure !")
-        print("Entrez 'help' si vous avez besoin d'aide.")
-
-        print(self.player.current_room.get_long_description())
-
-
+        self.output.print(f"\nBienvenue {self.player.name} dans ce jeu d'aventure !")
+        self.output.print("Entrez 'help' si vous avez besoin d'aide.")
 
+        self.output.print(self.player.current_room.get_long_description())
+        self.output.flush()
 
-##############################
-# Tkinter GUI Implementation #
-##############################
 
-class _StdoutRedirector:
-    """Redirect sys.stdout writes into a Tkinter Text widget."""
-    def __init__(self, text_widget):
-        self.text_widget = text_widget
 
-    def write(self, msg):
-        """Write message to the Text widget."""
-        if msg:
-            self.text_widget.configure(state="normal")
-            self.text_widget.insert("end", msg)
-            self.text_widget.see("end")
-            self.text_widget.configure(state="disabled")
 
-    def flush(self):
-        """Flush method required by sys.stdout interface (no-op for Text widget)."""
-
-
-class GameGUI(tk.Tk):
-    """Tkinter GUI for the text-based adventure game.
-
-    Layout layers:
-    L3 (top): Split into left image area (600x400) and right buttons.
-    L2 (middle): Scrolling terminal output.
-    L1 (bottom): Command entry field.
-    """
-
-    IMAGE_WIDTH = 600
-    IMAGE_HEIGHT = 400
-
-    def __init__(self):
-        super().__init__()
-        self.title("TBA")
-        self.geometry("900x700")  # Provide enough space
-        self.minsize(900, 650)
-
-        # Underlying game logic instance
-        self.game = Game()
-
-        # Ask player name via dialog (fallback to 'Joueur')
-        name = simpledialog.askstring("Nom", "Entrez votre nom:", parent=self)
-        if not name:
-            name = "Joueur"
-        self.game.setup(player_name=name)  # Pass name to avoid double prompt
-
-        # Build UI layers
-        self._build_layout()
-
-        # Initialiser la flag used_poison du joueur
-        self.game.player.used_poison = False
-
-        # Redirect stdout so game prints appear in terminal output area
-        self.original_stdout = sys.stdout
-        sys.stdout = _StdoutRedirector(self.text_output)
-
-        # Print welcome text in GUI
-        self.game.print_welcome()
-
-        # Load initial room image
-        self._update_room_image()
-
-        # Handle window close
-        self.protocol("WM_DELETE_WINDOW", self._on_close)
-
-
-    # -------- Layout construction --------
-    def _build_layout(self):
-        # Configure root grid: 3 rows (L3, L2, L1)
-        self.grid_rowconfigure(0, weight=0)  # Image/buttons fixed height
-        self.grid_rowconfigure(1, weight=1)  # Terminal output expands
-        self.grid_rowconfigure(2, weight=0)  # Entry fixed
-        self.grid_columnconfigure(0, weight=1)
-
-        # L3 Top frame
-        top_frame = ttk.Frame(self)
-        top_frame.grid(row=0, column=0, sticky="nsew", padx=6, pady=(6,3))
-        top_frame.grid_columnconfigure(0, weight=0)
-        top_frame.grid_columnconfigure(1, weight=1)
-
-        # L3L Image area (left)
-        image_frame = ttk.Frame(top_frame, width=self.IMAGE_WIDTH, height=self.IMAGE_HEIGHT)
-        image_frame.grid(row=0, column=0, sticky="nw", padx=(0,6))
-        image_frame.grid_propagate(False)  # Keep requested size
-        self.canvas = tk.Canvas(image_frame,
-                                width=self.IMAGE_WIDTH,
-                                height=self.IMAGE_HEIGHT,
-                                bg="#222")
-        self.canvas.pack(fill="both", expand=True)
-
-        # Initialize image reference (will be loaded by _update_room_image)
-        self._image_ref = None  # Keep reference to prevent garbage collection
-        # Initial image will be loaded after welcome message
-
-        # L3R Buttons area (right)
-        buttons_frame = ttk.Frame(top_frame)
-        buttons_frame.grid(row=0, column=1, sticky="ne")
-        for i in range(10):
-            buttons_frame.grid_rowconfigure(i, weight=0)
-        buttons_frame.grid_columnconfigure(0, weight=1)
-
-        # Load button images (keep references to prevent garbage collection)
-        assets_dir = Path(__file__).parent / 'assets'
-        # Load pre-resized 50x50 PNG images for better quality
-        self._btn_help = tk.PhotoImage(file=str(assets_dir / 'help-50.png'))
-        self._btn_up = tk.PhotoImage(file=str(assets_dir / 'up-arrow-50.png'))
-        self._btn_down = tk.PhotoImage(file=str(assets_dir / 'down-arrow-50.png'))
-        self._btn_left = tk.PhotoImage(file=str(assets_dir / 'left-arrow-50.png'))
-        self._btn_right = tk.PhotoImage(file=str(assets_dir / 'right-arrow-50.png'))
-        self._btn_quit = tk.PhotoImage(file=str(assets_dir / 'quit-50.png'))
-
-        # Command buttons
-        tk.Button(buttons_frame,
-                  image=self._btn_help,
-                  command=lambda: self._send_command("help"),
-                  bd=0).grid(row=0, column=0, sticky="ew", pady=2)
-        # Movement buttons (N,E,S,O)
-        move_frame = ttk.LabelFrame(buttons_frame, text="Déplacements")
-        move_frame.grid(row=1, column=0, sticky="ew", pady=4)
-        tk.Button(move_frame,
-                  image=self._btn_up,
-                  command=lambda: self._send_command("go N"),
-                  bd=0).grid(row=0, column=0, columnspan=2)
-        tk.Button(move_frame,
-                  image=self._btn_left,
-                  command=lambda: self._send_command("go O"),
-                  bd=0).grid(row=1, column=0)
-        tk.Button(move_frame,
-                  image=self._btn_right,
-                  command=lambda: self._send_command("go E"),
-                  bd=0).grid(row=1, column=1)
-        tk.Button(move_frame,
-                  image=self._btn_down,
-                  command=lambda: self._send_command("go S"),
-                  bd=0).grid(row=2, column=0, columnspan=2)
-
-        # Quit button
-        tk.Button(buttons_frame,
-                  image=self._btn_quit,
-                  command=lambda: self._send_command("quit"),
-                  bd=0).grid(row=2, column=0, sticky="ew", pady=(8,2))
-
-        # L2 Terminal output area (Text + Scrollbar)
-        output_frame = ttk.Frame(self)
-        output_frame.grid(row=1, column=0, sticky="nsew", padx=6, pady=3)
-        output_frame.grid_rowconfigure(0, weight=1)
-        output_frame.grid_columnconfigure(0, weight=1)
-
-        scrollbar = ttk.Scrollbar(output_frame, orient="vertical")
-        self.text_output = tk.Text(output_frame,
-                                   wrap="word",
-                                   yscrollcommand=scrollbar.set,
-                                   state="disabled",
-                                   bg="#111", fg="#eee")
-        scrollbar.config(command=self.text_output.yview)
-        self.text_output.grid(row=0, column=0, sticky="nsew")
-        scrollbar.grid(row=0, column=1, sticky="ns")
-
-        # L1 Entry area
-        entry_frame = ttk.Frame(self)
-        entry_frame.grid(row=2, column=0, sticky="ew", padx=6, pady=(3,6))
-        entry_frame.grid_columnconfigure(0, weight=1)
-
-        self.entry_var = tk.StringVar()
-        self.entry = ttk.Entry(entry_frame, textvariable=self.entry_var)
-        self.entry.grid(row=0, column=0, sticky="ew")
-        self.entry.bind("<Return>", self._on_enter)
-        self.entry.focus_set()
-
-
-    # -------- Image update --------
-    def _update_room_image(self):
-        """Update the canvas image based on the current room."""
-        if not self.game.player or not self.game.player.current_room:
-            return
-
-        room = self.game.player.current_room
-        assets_dir = Path(__file__).parent / 'assets'
-
-        # Use room-specific image if available, otherwise fallback
-        if room.image:
-            image_path = assets_dir / room.image
-        else:
-            image_path = assets_dir / 'scene.png'
-
-        try:
-            # Load new image
-            self._image_ref = tk.PhotoImage(file=str(image_path))
-            # Clear canvas and redraw image
-            self.canvas.delete("all")
-            self.canvas.create_image(
-                self.IMAGE_WIDTH/2,
-                self.IMAGE_HEIGHT/2,
-                image=self._image_ref
-            )
-        except (FileNotFoundError, tk.TclError):
-            # Fallback to text if image not found or cannot be loaded
-            self.canvas.delete("all")
-            self.canvas.create_text(
-                self.IMAGE_WIDTH/2,
-                self.IMAGE_HEIGHT/2,
-                text=f"Image: {room.name}",
-                fill="white",
-                font=("Helvetica", 18)
-            )
-
-
-    # -------- Event handlers --------
-    def _on_enter(self, _event=None):
-        """Handle Enter key press in the entry field."""
-        value = self.entry_var.get().strip()
-        if value:
-            self._send_command(value)
-        self.entry_var.set("")
-
-
-    def _send_command(self, command):
-        if self.game.finished:
-            return
-        # Echo the command in output area
-        print(f"> {command}\n")
-        self.game.process_command(command)
-        # Update room image after command (in case player moved)
-        self._update_room_image()
-
-        # Vérifier les conditions de victoire et défaite
-        if self.game.win():
-            print("\n🏆 Vous avez sauvé le royaume ! Victoire !\n")
-            self.game.finished = True
-        elif self.game.loose():
-            print("\n☠️  Vous avez perdu... Le poison vous a vaincu.\n")
-            self.game.finished = True
-
-        if self.game.finished:
-            # Disable further input and schedule close (brief delay to show farewell)
-            self.entry.configure(state="disabled")
-            self.after(600, self._on_close)
-
-
-    def _on_close(self):
-        # Restore stdout and destroy window
-        sys.stdout = self.original_stdout
-        self.destroy()
-
-
-def main():
+def main(argv=None):
     """Entry point.
 
-    If '--cli' is passed as an argument, start the classic console version.
+    If '--cli' is passed as an argument, start the classic console version
+    (options '--seed N' and '--record FILE', see the `replay` module,
+    '--latency', see the `instrument` module, and '--trace FILE', see the
+    `tracing` module).
     Otherwise launch the Tkinter GUI.
     Fallback to CLI if GUI cannot be initialized (e.g., headless environment).
+    A missing or invalid option value prints a usage error (exit status 2).
     """
-    args = sys.argv[1:]
-    if '--cli' in args:
-        Game().play()
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cli", action="store_true", help="jouer dans la console")
+    # --seed N : rejouer le même tirage des PNJ ; --record FICHIER :
+    # enregistrer la partie pour le module `replay`.
+    parser.add_argument("--seed", type=int, help="graine du tirage des PNJ (console)")
+    parser.add_argument("--record", metavar="FICHIER", help="enregistrer la partie (console)")
+    # --latency : mesurer chaque commande ; tableau affiché en fin de
+    # partie, ou à la demande avec le signal SIGUSR1.
+    parser.add_argument("--latency", action="store_true", help="mesurer la latence (console)")
+    # --trace FICHIER : intervalles de chaque commande (module `tracing`).
+    parser.add_argument("--trace", metavar="FICHIER", help="tracer les commandes (console)")
+    args = parser.parse_args(argv)
+    if args.cli:
+        game = Game(output=BufferedSink(), seed=args.seed)
+        if args.latency:
+            import instrument
+            import signal
+            recorder = instrument.enable(game)
+            if hasattr(signal, "SIGUSR1"):
+                signal.signal(signal.SIGUSR1, lambda *_: print(recorder.report(), file=sys.stderr))
+        if args.trace is not None:
+            from tracing import Tracer
+            tracer = Tracer(args.trace)
+            tracer.attach(game)
+        try:
+            game.play()
+        finally:
+            if args.trace is not None:
+                tracer.close()
+            if args.record is not None and game.player is not None:
+                from replay import SessionLog
+                SessionLog.from_game(game).save(args.record)
+            if game.latency is not None:
+                print(game.latency.report())
+        return
+    try:
+        import tkinter as tk
+        from gui import GameGUI
+    except ImportError as e:
+        # Tkinter not installed
+        print(f"GUI indisponible ({e}). Passage en mode console.")
+        Game(output=BufferedSink()).play()
         return
     try:
         app = GameGUI()
         app.mainloop()
     except tk.TclError as e:
-        # Fallback to CLI if GUI fails (e.g., no DISPLAY, Tkinter not available)
+        # Fallback to CLI if GUI fails (e.g., no DISPLAY)
         print(f"GUI indisponible ({e}). Passage en mode console.")
-        Game().play()
+        Game(output=BufferedSink()).play()
 
 
 if __name__ == "__main__":
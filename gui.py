@@ -0,0 +1,468 @@
+"""Module contenant l'interface graphique Tkinter du jeu.
+
+Ce module est le seul à importer `tkinter` ; `game.main` ne l'importe que
+pour ouvrir la fenêtre. Le moteur (`Game` et les modules qu'il utilise), la
+console, les simulations et les tests démarrent donc sans charger Tk et
+fonctionnent sans installation de Tk.
+"""
+
+import base64
+from collections import OrderedDict
+import queue
+import threading
+import tkinter as tk
+import traceback
+from tkinter import ttk, simpledialog
+
+from build_assets import ASSETS_DIR, BUNDLE_PATH, DEFAULT_SCENE, AssetBundle
+from game import Game
+from output import BufferedSink
+
+
+class ImageCache:
+    """Bounded LRU cache of decoded images, keyed by image name.
+
+    Decoding a PNG into a `tk.PhotoImage` is the expensive part of showing a
+    room; the cache keeps the most recently used images so that revisiting a
+    room, or entering a room warmed in advance, costs no decode. A file that
+    cannot be loaded is cached as None, so it is not retried on every visit.
+
+    Example:
+        >>> cache = ImageCache(lambda name: f"<{name}>", capacity=2)
+        >>> cache.get("a.png"), cache.get("b.png"), cache.get("a.png")
+        ('<a.png>', '<b.png>', '<a.png>')
+        >>> cache.get("c.png")  # evicts b.png, the least recently used
+        '<c.png>'
+        >>> list(cache), cache.loads
+        (['a.png', 'c.png'], 3)
+    """
+
+    def __init__(self, loader, capacity=12):
+        """
+        Args:
+            loader (callable): Decodes a named image, or returns None.
+            capacity (int): Maximum number of images kept.
+        """
+        self.loader = loader
+        self.capacity = capacity
+        self.loads = 0
+        self._images = OrderedDict()
+
+    def __contains__(self, name):
+        return name in self._images
+
+    def __iter__(self):
+        return iter(self._images)
+
+    def get(self, name):
+        """Return the image `name`, decoding it only on a cache miss."""
+        if name in self._images:
+            self._images.move_to_end(name)
+            return self._images[name]
+        self.loads += 1
+        image = self._images[name] = self.loader(name)
+        if len(self._images) > self.capacity:
+            self._images.popitem(last=False)
+        return image
+
+
+##############################
+# Tkinter GUI Implementation #
+##############################
+
+class _TextSink(BufferedSink):
+    """Output sink writing into a Tkinter Text widget, once per idle cycle.
+
+    Each written block is only queued; the widget is updated by a single
+    `after_idle` callback, so output from several commands (or from the
+    command echo and its result) costs one insert and one scroll. The widget
+    keeps at most `scrollback` lines: older lines are trimmed, which keeps
+    memory and redraw cost flat over long sessions.
+    """
+    def __init__(self, text_widget, scrollback=5000):
+        super().__init__()
+        self.text_widget = text_widget
+        self.scrollback = scrollback
+        self._pending = []
+
+    def write(self, text):
+        """Queue the buffered text; the widget is updated when Tk is idle."""
+        if not self._pending:
+            self.text_widget.after_idle(self._drain)
+        self._pending.append(text)
+
+    def _drain(self):
+        """Insert all queued text, trim the scrollback and scroll to the end."""
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending.clear()
+        widget = self.text_widget
+        widget.configure(state="normal")
+        widget.insert("end", text)
+        if self.scrollback:
+            # The Text widget always ends with a newline: "end" is one line past the last.
+            excess = int(widget.index("end").split(".")[0]) - 1 - self.scrollback
+            if excess > 0:
+                widget.delete("1.0", f"{excess + 1}.0")
+        widget.see("end")
+        widget.configure(state="disabled")
+
+
+class _QueueSink(BufferedSink):
+    """Game output sink posting each command's messages to the UI event queue."""
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+
+    def write(self, text):
+        """Hand the buffered text over to the Tk thread."""
+        self.events.put(("output", text))
+
+
+def _image_name(room):
+    """Return the image of a room (room-specific, or the default scene)."""
+    return room.image or DEFAULT_SCENE
+
+
+class _GameWorker(threading.Thread):
+    """Thread owning the `Game`: runs commands in order, off the Tk thread.
+
+    The Tk thread only puts command strings on `commands` and polls
+    `events`; it never touches the game itself. The game output is
+    replaced by a `_QueueSink` feeding `events`. Events are tuples of plain
+    data: ("output", text) for game messages, and ("state", view, finished)
+    after the setup and after each command, where `view` is None or
+    (room name, image name, image names of the visible neighbours). No
+    `Room` object crosses to the Tk thread.
+
+    Example:
+        >>> worker = _GameWorker(Game(seed=1), "Fil")
+        >>> worker.start()
+        >>> for command in ("go N", "look", "quit"):
+        ...     worker.commands.put(command)
+        >>> worker.join(timeout=10)
+        >>> events = []
+        >>> while not worker.events.empty():
+        ...     events.append(worker.events.get())
+        >>> [event[0] for event in events].count("state"), events[-1][2]
+        (4, True)
+        >>> events[1]
+        ('state', ('Eldregrove', 'Eldregrove.png', ('Brunnhold.png',)), False)
+        >>> events[-2][1].startswith("> quit")
+        True
+    """
+
+    def __init__(self, game, player_name):
+        super().__init__(name="game", daemon=True)
+        self.game = game
+        self.player_name = player_name
+        self.commands = queue.Queue()
+        self.events = queue.Queue()
+        game.output = _QueueSink(self.events)
+
+    def run(self):
+        game = self.game
+        game.setup(player_name=self.player_name)
+        game.print_welcome()
+        self._post_state()
+        while not game.finished:
+            command = self.commands.get()
+            if command is None:
+                break
+            # The echo goes through the game output, so it stays in order
+            # with the messages of the previous commands.
+            game.output.print(f"> {command}\n")
+            try:
+                game.process_command(command)
+            except Exception:
+                # Like a failing Tk callback: report and keep the game running.
+                traceback.print_exc()
+                game.output.flush()
+            self._post_state()
+
+    def _post_state(self):
+        """Post what the Tk thread needs to draw the current room, as plain data."""
+        player = self.game.player
+        room = player.current_room if player else None
+        view = None
+        if room is not None:
+            neighbours = dict.fromkeys(_image_name(edge.target) for _, edge in room.exit_tuples())
+            view = (room.name, _image_name(room), tuple(neighbours))
+        self.events.put(("state", view, self.game.finished))
+
+    def stop(self):
+        """Ask the thread to stop after the commands already queued."""
+        self.commands.put(None)
+
+
+class GameGUI(tk.Tk):
+    """Tkinter GUI for the text-based adventure game.
+
+    Layout layers:
+    L3 (top): Split into left image area (600x400) and right buttons.
+    L2 (middle): Scrolling terminal output.
+    L1 (bottom): Command entry field.
+    """
+
+    IMAGE_WIDTH = 600
+    IMAGE_HEIGHT = 400
+    IMAGE_CACHE_SIZE = 12  # current room + up to 4 neighbours, with room to spare
+    SCROLLBACK_LINES = 5000  # terminal lines kept (0 keeps everything)
+    POLL_MS = 20  # interval between two reads of the game events
+
+    def __init__(self):
+        super().__init__()
+        self.title("TBA")
+        self.geometry("900x700")  # Provide enough space
+        self.minsize(900, 650)
+
+        # Build UI layers
+        self._build_layout()
+
+        # Terminal output area, updated once per idle cycle
+        self.terminal = _TextSink(self.text_output, self.SCROLLBACK_LINES)
+
+        # Ask player name via dialog (fallback to 'Joueur')
+        name = simpledialog.askstring("Nom", "Entrez votre nom:", parent=self)
+        if not name:
+            name = "Joueur"
+
+        # Underlying game logic instance, owned by a worker thread from now
+        # on: the Tk thread only queues commands and polls the game events.
+        self._finished = False
+        self._worker = _GameWorker(Game(), name)
+        self._worker.start()  # setup, welcome text, initial room image
+        self._poll_events()
+
+        # Handle window close
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+
+    # -------- Layout construction --------
+    def _build_layout(self):
+        # Configure root grid: 3 rows (L3, L2, L1)
+        self.grid_rowconfigure(0, weight=0)  # Image/buttons fixed height
+        self.grid_rowconfigure(1, weight=1)  # Terminal output expands
+        self.grid_rowconfigure(2, weight=0)  # Entry fixed
+        self.grid_columnconfigure(0, weight=1)
+
+        # L3 Top frame
+        top_frame = ttk.Frame(self)
+        top_frame.grid(row=0, column=0, sticky="nsew", padx=6, pady=(6,3))
+        top_frame.grid_columnconfigure(0, weight=0)
+        top_frame.grid_columnconfigure(1, weight=1)
+
+        # L3L Image area (left)
+        image_frame = ttk.Frame(top_frame, width=self.IMAGE_WIDTH, height=self.IMAGE_HEIGHT)
+        image_frame.grid(row=0, column=0, sticky="nw", padx=(0,6))
+        image_frame.grid_propagate(False)  # Keep requested size
+        self.canvas = tk.Canvas(image_frame,
+                                width=self.IMAGE_WIDTH,
+                                height=self.IMAGE_HEIGHT,
+                                bg="#222")
+        self.canvas.pack(fill="both", expand=True)
+
+        # Initialize image reference (will be loaded by _update_room_image)
+        self._image_ref = None  # Keep reference to prevent garbage collection
+        # Pre-scaled images packed by build_assets.py (None: read the files)
+        self._bundle = self._open_bundle()
+        # Decoded room images, and the room currently drawn on the canvas
+        self._images = ImageCache(self._load_image, self.IMAGE_CACHE_SIZE)
+        self._shown_room = self._shown_image = None
+        self._warm_queue = []
+        # Initial image will be loaded after welcome message
+
+        # L3R Buttons area (right)
+        buttons_frame = ttk.Frame(top_frame)
+        buttons_frame.grid(row=0, column=1, sticky="ne")
+        for i in range(10):
+            buttons_frame.grid_rowconfigure(i, weight=0)
+        buttons_frame.grid_columnconfigure(0, weight=1)
+
+        # Load button images (keep references to prevent garbage collection)
+        # Load pre-resized 50x50 PNG images for better quality
+        self._btn_help = self._load_image('help-50.png')
+        self._btn_up = self._load_image('up-arrow-50.png')
+        self._btn_down = self._load_image('down-arrow-50.png')
+        self._btn_left = self._load_image('left-arrow-50.png')
+        self._btn_right = self._load_image('right-arrow-50.png')
+        self._btn_quit = self._load_image('quit-50.png')
+
+        # Command buttons
+        tk.Button(buttons_frame,
+                  image=self._btn_help,
+                  command=lambda: self._send_command("help"),
+                  bd=0).grid(row=0, column=0, sticky="ew", pady=2)
+        # Movement buttons (N,E,S,O)
+        move_frame = ttk.LabelFrame(buttons_frame, text="Déplacements")
+        move_frame.grid(row=1, column=0, sticky="ew", pady=4)
+        tk.Button(move_frame,
+                  image=self._btn_up,
+                  command=lambda: self._send_command("go N"),
+                  bd=0).grid(row=0, column=0, columnspan=2)
+        tk.Button(move_frame,
+                  image=self._btn_left,
+                  command=lambda: self._send_command("go O"),
+                  bd=0).grid(row=1, column=0)
+        tk.Button(move_frame,
+                  image=self._btn_right,
+                  command=lambda: self._send_command("go E"),
+                  bd=0).grid(row=1, column=1)
+        tk.Button(move_frame,
+                  image=self._btn_down,
+                  command=lambda: self._send_command("go S"),
+                  bd=0).grid(row=2, column=0, columnspan=2)
+
+        # Quit button
+        tk.Button(buttons_frame,
+                  image=self._btn_quit,
+                  command=lambda: self._send_command("quit"),
+                  bd=0).grid(row=2, column=0, sticky="ew", pady=(8,2))
+
+        # L2 Terminal output area (Text + Scrollbar)
+        output_frame = ttk.Frame(self)
+        output_frame.grid(row=1, column=0, sticky="nsew", padx=6, pady=3)
+        output_frame.grid_rowconfigure(0, weight=1)
+        output_frame.grid_columnconfigure(0, weight=1)
+
+        scrollbar = ttk.Scrollbar(output_frame, orient="vertical")
+        self.text_output = tk.Text(output_frame,
+                                   wrap="word",
+                                   yscrollcommand=scrollbar.set,
+                                   state="disabled",
+                                   bg="#111", fg="#eee")
+        scrollbar.config(command=self.text_output.yview)
+        self.text_output.grid(row=0, column=0, sticky="nsew")
+        scrollbar.grid(row=0, column=1, sticky="ns")
+
+        # L1 Entry area
+        entry_frame = ttk.Frame(self)
+        entry_frame.grid(row=2, column=0, sticky="ew", padx=6, pady=(3,6))
+        entry_frame.grid_columnconfigure(0, weight=1)
+
+        self.entry_var = tk.StringVar()
+        self.entry = ttk.Entry(entry_frame, textvariable=self.entry_var)
+        self.entry.grid(row=0, column=0, sticky="ew")
+        self.entry.bind("<Return>", self._on_enter)
+        self.entry.focus_set()
+
+
+    # -------- Image update --------
+    @staticmethod
+    def _open_bundle():
+        """Open the asset bundle, or return None if it was not built."""
+        try:
+            return AssetBundle(BUNDLE_PATH)
+        except (OSError, ValueError):
+            return None
+
+    def _load_image(self, name):
+        """Decode an image, from the bundle if possible, else from its file.
+
+        Returns None if the image is missing or invalid.
+        """
+        data = self._bundle.read(name) if self._bundle is not None else None
+        try:
+            if data is not None:
+                return tk.PhotoImage(data=base64.b64encode(data))
+            return tk.PhotoImage(file=str(ASSETS_DIR / name))
+        except (FileNotFoundError, tk.TclError):
+            return None
+
+    def _update_room_image(self, view):
+        """Redraw the canvas if the player entered another room.
+
+        `view` is the (room name, image name, neighbour image names) tuple
+        posted by the game thread.
+
+        Commands that do not move the player (look, quests, help...) leave
+        the canvas untouched. Images come from the LRU cache; once drawn,
+        the images of the neighbouring rooms are decoded during idle time so
+        that the next move finds its image already decoded.
+        """
+        if view is None or view[0] == self._shown_room:
+            return
+        name, image, neighbours = view
+        self._shown_room, self._shown_image = name, image
+
+        self._image_ref = self._images.get(image)
+        self.canvas.delete("all")
+        if self._image_ref is not None:
+            self.canvas.create_image(
+                self.IMAGE_WIDTH/2,
+                self.IMAGE_HEIGHT/2,
+                image=self._image_ref
+            )
+        else:
+            # Fallback to text if image not found or cannot be loaded
+            self.canvas.create_text(
+                self.IMAGE_WIDTH/2,
+                self.IMAGE_HEIGHT/2,
+                text=f"Image: {name}",
+                fill="white",
+                font=("Helvetica", 18)
+            )
+
+        # Warm the neighbours' images, one per idle callback, so that input
+        # is never blocked by more than a single decode.
+        pending = not self._warm_queue
+        self._warm_queue = [image for image in neighbours if image not in self._images]
+        if pending and self._warm_queue:
+            self.after_idle(self._warm_next)
+
+    def _warm_next(self):
+        """Decode the next neighbour image in the warm-up queue."""
+        if not self._warm_queue:
+            return
+        self._images.get(self._warm_queue.pop())
+        # The room on screen stays the most recently used entry.
+        if self._shown_image is not None:
+            self._images.get(self._shown_image)
+        if self._warm_queue:
+            self.after_idle(self._warm_next)
+
+
+    # -------- Event handlers --------
+    def _on_enter(self, _event=None):
+        """Handle Enter key press in the entry field."""
+        value = self.entry_var.get().strip()
+        if value:
+            self._send_command(value)
+        self.entry_var.set("")
+
+
+    def _send_command(self, command):
+        """Queue a command for the game thread; its output arrives through `_poll_events`."""
+        if self._finished:
+            return
+        self._worker.commands.put(command)
+
+
+    def _poll_events(self):
+        """Apply the events posted by the game thread, then poll again."""
+        events = self._worker.events
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "output":
+                self.terminal.write(event[1])
+                continue
+            _, view, finished = event
+            # Update room image after command (in case player moved)
+            self._update_room_image(view)
+            if finished and not self._finished:
+                # Disable further input and schedule close (brief delay to show farewell)
+                self._finished = True
+                self.entry.configure(state="disabled")
+                self.after(600, self._on_close)
+        self.after(self.POLL_MS, self._poll_events)
+
+
+    def _on_close(self):
+        self._worker.stop()
+        if self._bundle is not None:
+            self._bundle.close()
+        self.destroy()
@@ -0,0 +1,293 @@
+"""Module contenant l'instrumentation (optionnelle) de la latence des commandes.
+
+`enable(game)` chronomètre chaque commande traitée par `game.process_command`,
+étape par étape, en temps réel (horloge murale) et en temps CPU du thread :
+
+  - "parse" : analyse de la commande (`Game.parse_command`) ;
+  - "handler" : l'action (`Actions.*`), hors vérifications de quêtes ;
+  - "quests" : vérifications des objectifs (`QuestManager.check_*`) ;
+  - "npcs" : tour des PNJ (`Game.move_characters`) ;
+  - "rules" : évaluation de la victoire et de la défaite (événements du
+    moteur de règles et `Game.check_end_of_game`) ;
+  - "total" : la commande entière.
+
+Les temps sont exclusifs : le temps des vérifications de quêtes faites
+pendant une action est compté dans "quests", pas dans "handler". Ils
+alimentent un histogramme par mot de commande et par étape, consultable à
+tout moment (`LatencyRecorder.report`, `LatencyRecorder.to_dict`).
+
+L'instrumentation pose des enveloppes sur l'instance de la partie (et sur
+son gestionnaire de quêtes et son moteur de règles), jamais sur les
+classes : une partie non instrumentée n'exécute aucune mesure, pas même un
+appel à `time.perf_counter()`. `disable(game)` retire les enveloppes.
+"""
+
+import json
+import time
+
+PHASES = ("parse", "handler", "quests", "npcs", "rules", "total")
+
+# Mot utilisé pour toutes les commandes inconnues (évite une entrée par faute de frappe).
+UNKNOWN_WORD = "<inconnue>"
+
+_QUEST_CHECKS = ("check_room_objectives", "check_action_objectives", "check_counter_objectives")
+
+
+class Histogram:
+    """
+    Histogramme logarithmique de durées.
+
+    Le seau `b` compte les durées de [2**(b-1), 2**b[ microsecondes (le seau
+    0 : moins d'une microseconde).
+
+    Attributes:
+        count (int): Nombre de mesures.
+        total_ns (int): Somme des durées, en nanosecondes.
+        max_ns (int): Plus grande durée, en nanosecondes.
+        buckets (list): Nombre de mesures par seau.
+
+    Exemple:
+        >>> histogram = Histogram()
+        >>> for ns in (500, 3_000, 3_500, 40_000):
+        ...     histogram.add(ns)
+        >>> histogram.count, histogram.percentile(0.5), histogram.max_ns
+        (4, 4, 40000)
+    """
+
+    SIZE = 40
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * self.SIZE
+
+    def add(self, ns):
+        """Ajoute une durée en nanosecondes."""
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.buckets[min(self.SIZE - 1, (max(0, ns) // 1000).bit_length())] += 1
+
+    def mean_us(self):
+        """Durée moyenne en microsecondes."""
+        return self.total_ns / self.count / 1000 if self.count else 0.0
+
+    def percentile(self, q):
+        """
+        Borne supérieure (en microsecondes) du quantile `q` (entre 0 et 1).
+
+        Returns:
+            int: La limite haute du seau qui contient le quantile.
+        """
+        rank = q * self.count
+        seen = 0
+        for bucket, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return 1 << bucket
+        return 0
+
+    def to_dict(self):
+        """Retourne l'histogramme sous forme sérialisable (seaux non vides)."""
+        return {
+            "count": self.count,
+            "mean_us": self.mean_us(),
+            "max_us": self.max_ns / 1000,
+            "buckets_us": {1 << b: n for b, n in enumerate(self.buckets) if n},
+        }
+
+
+class PhaseStats:
+    """Durées d'une étape d'un mot de commande : temps réel et temps CPU."""
+
+    def __init__(self):
+        self.wall = Histogram()
+        self.cpu = Histogram()
+
+
+class LatencyRecorder:
+    """
+    Collecte les durées des commandes d'une partie, par mot de commande et par étape.
+
+    Attributes:
+        stats (dict): (mot de commande, étape) -> `PhaseStats`.
+
+    Exemple:
+        >>> from game import Game
+        >>> from output import NullSink
+        >>> game = Game(output=NullSink(), seed=1)
+        >>> game.setup("Mesure")
+        >>> recorder = enable(game)
+        >>> for command in ("activate Atteindre Verdenfall", "go N", "look", "xyz"):
+        ...     game.process_command(command)
+        >>> sorted({word for word, _ in recorder.stats})
+        ['<inconnue>', 'activate', 'go', 'look']
+        >>> recorder.stats["go", "quests"].wall.count
+        1
+        >>> disable(game)
+        >>> "process_command" in vars(game)
+        False
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self._patched = []
+        self._manager = None
+        self._rules = None
+        self._sample = None
+        self._child = [0, 0]
+
+    # -------- Pose et retrait des enveloppes --------
+
+    def attach(self, game):
+        """Enveloppe les étapes de `game` (voir `enable`)."""
+        process_command = game.process_command
+
+        def timed_process_command(command_string):
+            # Le joueur et le moteur de règles changent à chaque nouveau monde.
+            if game.player is not None and game.player.quest_manager is not self._manager:
+                self._manager = game.player.quest_manager
+                for name in _QUEST_CHECKS:
+                    self._patch(self._manager, name, "quests")
+            if game.rules is not self._rules:
+                self._rules = game.rules
+                self._patch(self._rules, "emit", "rules")
+
+            word = command_string.split(" ", 1)[0]
+            self._sample = {}
+            self._child = [0, 0]
+            wall, cpu = time.perf_counter_ns(), time.thread_time_ns()
+            try:
+                process_command(command_string)
+            finally:
+                sample = self._sample
+                sample["total"] = [time.perf_counter_ns() - wall, time.thread_time_ns() - cpu]
+                self._sample = None
+                self.record(word if word in game.commands else UNKNOWN_WORD, sample)
+
+        self._set(game, "process_command", timed_process_command)
+        self._patch(game, "parse_command", "parse")
+        self._patch(game, "execute_command", "handler")
+        self._patch(game, "move_characters", "npcs")
+        self._patch(game, "check_end_of_game", "rules")
+
+    def detach(self):
+        """Retire toutes les enveloppes posées."""
+        for target, name in reversed(self._patched):
+            vars(target).pop(name, None)
+        self._patched = []
+        self._manager = self._rules = None
+
+    def _set(self, target, name, function):
+        """Pose un attribut d'instance, retiré par `detach`."""
+        setattr(target, name, function)
+        self._patched.append((target, name))
+
+    def _patch(self, target, name, phase):
+        """Chronomètre la méthode `name` de l'instance `target` dans l'étape `phase`."""
+        method = getattr(target, name)
+        perf, cpu = time.perf_counter_ns, time.thread_time_ns
+
+        def timed(*args, **kwargs):
+            if self._sample is None:  # appel hors d'une commande
+                return method(*args, **kwargs)
+            outer, self._child = self._child, [0, 0]
+            wall_start, cpu_start = perf(), cpu()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                wall, cpu_time = perf() - wall_start, cpu() - cpu_start
+                child = self._child
+                spent = self._sample.setdefault(phase, [0, 0])
+                spent[0] += wall - child[0]
+                spent[1] += cpu_time - child[1]
+                outer[0] += wall
+                outer[1] += cpu_time
+                self._child = outer
+
+        self._set(target, name, timed)
+
+    # -------- Agrégation et restitution --------
+
+    def record(self, word, sample):
+        """
+        Ajoute les durées d'une commande aux histogrammes.
+
+        Args:
+            word (str): Le mot de commande.
+            sample (dict): Étape -> [temps réel, temps CPU] en nanosecondes.
+        """
+        for phase, (wall, cpu) in sample.items():
+            stats = self.stats.get((word, phase))
+            if stats is None:
+                stats = self.stats[word, phase] = PhaseStats()
+            stats.wall.add(wall)
+            stats.cpu.add(cpu)
+
+    def to_dict(self):
+        """Retourne les histogrammes sous forme sérialisable : mot -> étape -> mesures."""
+        result = {}
+        for (word, phase), stats in sorted(self.stats.items()):
+            result.setdefault(word, {})[phase] = {
+                "wall": stats.wall.to_dict(),
+                "cpu": stats.cpu.to_dict(),
+            }
+        return result
+
+    def dump(self, path):
+        """Écrit les histogrammes dans un fichier JSON."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=1)
+
+    def report(self):
+        """
+        Retourne un tableau lisible des latences, par mot de commande et par étape.
+
+        Les quantiles sont des bornes supérieures (limites des seaux de
+        l'histogramme).
+        """
+        lines = [f"{'commande':<12} {'étape':<8} {'n':>7} {'moy µs':>9} {'p50':>7} "
+                 f"{'p99':>7} {'max µs':>9} {'CPU µs':>9}"]
+        for word in sorted({word for word, _ in self.stats}):
+            for phase in PHASES:
+                stats = self.stats.get((word, phase))
+                if stats is None:
+                    continue
+                wall = stats.wall
+                lines.append(
+                    f"{word:<12} {phase:<8} {wall.count:>7} {wall.mean_us():>9.1f} "
+                    f"{wall.percentile(0.5):>7} {wall.percentile(0.99):>7} "
+                    f"{wall.max_ns / 1000:>9.1f} {stats.cpu.mean_us():>9.1f}"
+                )
+        return "\n".join(lines)
+
+
+def enable(game):
+    """
+    Active l'instrumentation d'une partie.
+
+    Peut être appelée avant `game.setup()` : le gestionnaire de quêtes et le
+    moteur de règles sont enveloppés à la première commande.
+
+    Args:
+        game (Game): La partie.
+
+    Returns:
+        LatencyRecorder: Les mesures, aussi accessibles par `game.latency`.
+    """
+    if getattr(game, "latency", None) is not None:
+        return game.latency
+    recorder = LatencyRecorder()
+    recorder.attach(game)
+    game.latency = recorder
+    return recorder
+
+
+def disable(game):
+    """Désactive l'instrumentation d'une partie (les mesures sont conservées)."""
+    recorder = getattr(game, "latency", None)
+    if recorder is not None:
+        recorder.detach()
+        game.latency = None
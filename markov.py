@@ -0,0 +1,412 @@
+"""Module contenant l'avance rapide analytique des PNJ hors de vue.
+
+Le déplacement d'un PNJ (`Character.move`) est une chaîne de Markov sur les
+salles : il reste sur place avec une probabilité 1/2, sinon il emprunte une
+sortie (non-None) tirée uniformément. Tant qu'aucun joueur ne peut
+l'observer, il est inutile de le simuler tour par tour : il suffit de
+tirer sa position au moment où il redevient observable, selon la ligne de
+sa salle de départ dans la matrice de transition élevée à la puissance du
+nombre de tours écoulés. Le résultat est statistiquement identique à une
+simulation pas à pas.
+
+Contenu :
+  - `TransitionMatrix` : la matrice de transition et ses puissances (mises
+    en cache), avec tirage d'une position après k tours.
+  - `FastForwardRegistry` : un `CharacterRegistry` qui endort les PNJ
+    éloignés du joueur et ne les réveille qu'au moment où ils pourraient
+    entrer dans sa salle.
+"""
+
+import heapq
+import random
+from collections import OrderedDict, deque
+from itertools import count
+
+from character import CharacterRegistry
+
+try:
+    import numpy as np
+except ImportError:  # dépendance optionnelle
+    np = None
+
+# Au-delà de cette taille, les puissances denses coûtent trop de mémoire :
+# les distributions sont alors calculées par propagation creuse.
+DENSE_LIMIT = 512
+
+
+class TransitionMatrix:
+    """
+    Matrice de transition de la marche aléatoire des PNJ.
+
+    Avec NumPy (et un monde de moins de `DENSE_LIMIT` salles), les
+    puissances P^(2^i) sont calculées une fois par élévations au carré
+    successives et mises en cache : la distribution après k tours coûte
+    O(log k) produits vecteur-matrice. Sans NumPy, les distributions sont
+    propagées de façon creuse, tour par tour ; seule la dernière loi de
+    chaque salle de départ est gardée (pour au plus `max_cached_rows`
+    salles), et la propagation s'arrête dès que la chaîne a convergé vers
+    sa loi stationnaire.
+
+    Attributes:
+        rooms (list): Les salles, indexées de 0 à R-1.
+        rows (list): Pour chaque salle, la liste des couples
+            (salle d'arrivée, probabilité).
+
+    Exemple:
+        >>> from room import Room
+        >>> a, b = Room("A", "a"), Room("B", "b")
+        >>> a.exits = {"N": b, "E": None, "S": None, "O": None}
+        >>> b.exits = {"N": None, "E": None, "S": a, "O": None}
+        >>> matrix = TransitionMatrix([a, b])
+        >>> matrix.rows[0]
+        [(0, 0.5), (1, 0.5)]
+        >>> [round(p, 3) for p in matrix.distribution(0, 3)]
+        [0.5, 0.5]
+    """
+
+    def __init__(self, rooms, max_cached_rows=4096):
+        """
+        Construit la matrice à partir des sorties des salles.
+
+        Args:
+            rooms (list): Les salles du monde.
+            max_cached_rows (int): Nombre maximal de distributions mémorisées.
+        """
+        self.rooms = list(rooms)
+        self.index = {id(room): i for i, room in enumerate(self.rooms)}
+        self.rows = []
+        for room in self.rooms:
+            targets = [self.index[id(t)] for t in room.open_exits()]
+            if not targets:
+                self.rows.append([(self.index[id(room)], 1.0)])
+                continue
+            row = {self.index[id(room)]: 0.5}
+            for target in targets:
+                row[target] = row.get(target, 0.0) + 0.5 / len(targets)
+            self.rows.append(sorted(row.items()))
+
+        self._dense = np is not None and len(self.rooms) <= DENSE_LIMIT
+        self._powers = []
+        self._sparse = OrderedDict()
+        self._cached = OrderedDict()
+        self._max_cached = max_cached_rows
+
+    def power(self, exponent):
+        """
+        Retourne P^(2^exponent) (NumPy uniquement), calculée une seule fois.
+
+        Args:
+            exponent (int): L'exposant de 2.
+
+        Returns:
+            numpy.ndarray: La matrice dense.
+        """
+        if not self._powers:
+            size = len(self.rooms)
+            matrix = np.zeros((size, size))
+            for i, row in enumerate(self.rows):
+                for j, p in row:
+                    matrix[i, j] = p
+            self._powers.append(matrix)
+        while len(self._powers) <= exponent:
+            last = self._powers[-1]
+            self._powers.append(last @ last)
+        return self._powers[exponent]
+
+    def distribution(self, start, ticks):
+        """
+        Retourne la loi de la position d'un PNJ après `ticks` tours.
+
+        Args:
+            start (int): Indice de la salle de départ.
+            ticks (int): Nombre de tours écoulés.
+
+        Returns:
+            list: La probabilité de chaque salle (indexée comme `rooms`).
+        """
+        key = (start, ticks)
+        cached = self._cached.get(key)
+        if cached is not None:
+            self._cached.move_to_end(key)
+            return cached
+
+        if self._dense:
+            vector = np.zeros(len(self.rooms))
+            vector[start] = 1.0
+            bit = 0
+            remaining = ticks
+            while remaining:
+                if remaining & 1:
+                    vector = vector @ self.power(bit)
+                remaining >>= 1
+                bit += 1
+            result = vector.tolist()
+        else:
+            result = [0.0] * len(self.rooms)
+            for room, p in self._sparse_distribution(start, ticks).items():
+                result[room] = p
+
+        self._cached[key] = result
+        if len(self._cached) > self._max_cached:
+            self._cached.popitem(last=False)
+        return result
+
+    def _sparse_distribution(self, start, ticks):
+        """
+        Propage la loi creuse d'une salle de départ jusqu'à `ticks` tours.
+
+        Seule la dernière loi calculée est gardée par salle de départ, avec
+        son nombre de tours, et les salles de départ sont oubliées au-delà
+        de `max_cached_rows` (la moins récemment utilisée d'abord) : la
+        mémoire reste bornée sur une longue partie. Une demande pour moins
+        de tours que la loi gardée repart de la salle de départ.
+
+        Examples:
+
+        >>> from room import Room
+        >>> ring = [Room(f"Salle {i}", "une salle.") for i in range(16)]
+        >>> for i, room in enumerate(ring):
+        ...     room.exits = {"E": ring[(i + 1) % 16], "O": ring[i - 1]}
+        >>> matrix = TransitionMatrix(ring, max_cached_rows=2)
+        >>> for start in (0, 5, 10):
+        ...     for ticks in range(1, 50):
+        ...         _ = matrix._sparse_distribution(start, ticks)
+        >>> list(matrix._sparse)
+        [5, 10]
+        >>> round(sum(matrix._sparse_distribution(10, 3).values()), 9)
+        1.0
+        """
+        state = self._sparse.get(start)
+        if state is None or state[0] > ticks:
+            state = (0, {start: 1.0}, False)
+        done, current, stationary = state
+        while done < ticks and not stationary:
+            following = {}
+            for room, p in current.items():
+                for target, q in self.rows[room]:
+                    following[target] = following.get(target, 0.0) + p * q
+            # Loi stationnaire atteinte : les tours suivants sont identiques
+            stationary = len(following) == len(current) and all(
+                abs(following[room] - p) < 1e-12 for room, p in current.items())
+            current = following
+            done += 1
+        self._sparse[start] = (done, current, stationary)
+        self._sparse.move_to_end(start)
+        if len(self._sparse) > self._max_cached:
+            self._sparse.popitem(last=False)
+        return current
+
+    def sample(self, start, ticks, rng=random):
+        """
+        Tire la position d'un PNJ parti de `start` il y a `ticks` tours.
+
+        Args:
+            start (int): Indice de la salle de départ.
+            ticks (int): Nombre de tours écoulés.
+            rng: Générateur aléatoire (module `random` par défaut).
+
+        Returns:
+            int: Indice de la salle tirée.
+        """
+        if ticks == 0:
+            return start
+        if self._dense:
+            probabilities = enumerate(self.distribution(start, ticks))
+        else:
+            probabilities = self._sparse_distribution(start, ticks).items()
+
+        draw = rng.random()
+        total = 0.0
+        last = start
+        for room, p in probabilities:
+            if p <= 0.0:
+                continue
+            total += p
+            last = room
+            if draw < total:
+                return room
+        return last
+
+
+class FastForwardRegistry(CharacterRegistry):
+    """
+    Registre de PNJ qui ne simule que les personnages proches du joueur.
+
+    Un PNJ dont la distance (en nombre de sorties, dans les deux sens) à la
+    salle du joueur atteint `horizon` est endormi : il est retiré de sa
+    salle et n'est plus déplacé. Sa date de réveil est la première date où,
+    au pire, le joueur et lui auraient pu se rapprocher assez pour qu'il
+    entre dans la salle du joueur au tour suivant. Chaque tour écoulé et
+    chaque salle parcourue par le joueur rapprochent cette échéance d'une
+    unité ; les PNJ endormis sont rangés dans un tas selon cette échéance,
+    donc un tour ne coûte rien pour les régions que personne n'observe.
+
+    Au réveil, la position est tirée dans `TransitionMatrix` selon le
+    nombre de tours écoulés, puis le PNJ est de nouveau simulé normalement.
+
+    Exemple:
+        >>> from world import build_world, compile_world, synthetic_world
+        >>> from output import NullSink
+        >>> world = build_world(compile_world(synthetic_world(100, characters=50)))
+        >>> registry = FastForwardRegistry(world.rooms, world.characters)
+        >>> for _ in range(20):
+        ...     registry.tick(world.start, NullSink())
+        >>> len(registry), registry.dormant_count() > 0
+        (50, True)
+    """
+
+    def __init__(self, rooms, characters=(), horizon=3, rng=random):
+        """
+        Initialise le registre.
+
+        Args:
+            rooms (list): Les salles du monde.
+            characters (iterable): Les PNJ, déjà placés dans leur salle.
+            horizon (int): Distance à partir de laquelle un PNJ est endormi
+                (au moins 3 pour qu'un PNJ endormi saute au moins un tour).
+            rng: Générateur aléatoire utilisé pour les tirages.
+        """
+        super().__init__(characters, rng)
+        self.matrix = TransitionMatrix(rooms)
+        self.horizon = max(3, horizon)
+        self._neighbours = [set() for _ in self.matrix.rooms]
+        for i, row in enumerate(self.matrix.rows):
+            for j, _ in row:
+                if i != j:
+                    self._neighbours[i].add(j)
+                    self._neighbours[j].add(i)
+        self._distances = OrderedDict()
+
+        self.ticks = 0
+        self.player_steps = 0
+        self._player_room = None
+        # PNJ simulés (dictionnaire utilisé comme ensemble ordonné)
+        self._active = dict.fromkeys(self.characters)
+        # Personnage -> (salle d'endormissement, tour d'endormissement)
+        self._dormant = {}
+        self._wake_heap = []
+        self._order = count()
+
+    def distances_from(self, room_index):
+        """
+        Retourne les distances (non orientées) depuis une salle, mises en cache.
+
+        Args:
+            room_index (int): Indice de la salle d'origine.
+
+        Returns:
+            list: La distance de chaque salle, ou None si elle est inaccessible.
+        """
+        cached = self._distances.get(room_index)
+        if cached is not None:
+            self._distances.move_to_end(room_index)
+            return cached
+
+        distances = [None] * len(self.matrix.rooms)
+        distances[room_index] = 0
+        queue = deque([room_index])
+        while queue:
+            room = queue.popleft()
+            for neighbour in self._neighbours[room]:
+                if distances[neighbour] is None:
+                    distances[neighbour] = distances[room] + 1
+                    queue.append(neighbour)
+
+        self._distances[room_index] = distances
+        if len(self._distances) > 64:
+            self._distances.popitem(last=False)
+        return distances
+
+    def dormant_count(self):
+        """Retourne le nombre de PNJ actuellement endormis."""
+        return len(self._dormant)
+
+    def add(self, character):
+        """Enregistre un PNJ (il doit déjà figurer dans sa salle)."""
+        super().add(character)
+        self._active[character] = None
+
+    def remove(self, character):
+        """Retire un PNJ du registre (endormi ou non)."""
+        if character in self._dormant:
+            del self._dormant[character]
+            self.characters.remove(character)
+            return
+        del self._active[character]
+        super().remove(character)
+
+    def wake(self, character):
+        """
+        Réveille un PNJ endormi en tirant sa position actuelle.
+
+        Args:
+            character (Character): Le PNJ à réveiller.
+        """
+        start, since = self._dormant.pop(character)
+        room = self.matrix.rooms[self.matrix.sample(start, self.ticks - since, self.rng)]
+        character.current_room = room
+        room.characters.append(character)
+        self._active[character] = None
+
+    def wake_all(self):
+        """Réveille tous les PNJ endormis (ex: avant une sauvegarde)."""
+        for character in list(self._dormant):
+            self.wake(character)
+        self._wake_heap.clear()
+
+    def tick(self, player_room, output):
+        """
+        Fait avancer d'un tour les PNJ proches du joueur.
+
+        Args:
+            player_room (Room): La salle où se trouve le joueur.
+            output: La sortie de la partie.
+        """
+        player_index = self.matrix.index[id(player_room)]
+        distances = self.distances_from(player_index)
+
+        # Distance parcourue par le joueur depuis le tour précédent
+        if self._player_room is not None and self._player_room != player_index:
+            step = distances[self._player_room]
+            if step is None:
+                self.wake_all()
+            else:
+                self.player_steps += step
+        self._player_room = player_index
+
+        clock = self.ticks + self.player_steps
+        heap = self._wake_heap
+        while heap and heap[0][0] <= clock:
+            _, _, character = heapq.heappop(heap)
+            if character in self._dormant:
+                self.wake(character)
+
+        active = list(self._active)
+        for character in active:
+            old_room = character.current_room
+            if not character.move(self.rng):
+                continue
+            new_room = character.current_room
+            old_room.characters.remove(character)
+            new_room.characters.append(character)
+            if old_room is player_room:
+                output.print(f"\n{character.name} quitte la salle.\n")
+            elif new_room is player_room:
+                output.print(f"\n{character.name} entre dans la salle.\n")
+
+        self.ticks += 1
+        for character in active:
+            room_index = self.matrix.index[id(character.current_room)]
+            distance = distances[room_index]
+            if distance is None or distance >= self.horizon:
+                self._sleep(character, room_index, distance)
+
+    def _sleep(self, character, room_index, distance):
+        """Endort un PNJ et planifie son réveil."""
+        character.current_room.characters.remove(character)
+        del self._active[character]
+        self._dormant[character] = (room_index, self.ticks)
+        if distance is None:
+            return  # Inaccessible : ne se réveille qu'avec wake_all()
+        wake_at = self.ticks + self.player_steps + distance - 1
+        heapq.heappush(self._wake_heap, (wake_at, next(self._order), character))
@@ -0,0 +1,185 @@
+"""Module contenant un moteur vectorisé de déplacement des PNJ.
+
+`VectorizedCharacterEngine` remplace le `CharacterRegistry` quand le monde
+compte de très nombreux personnages non-joueurs. Les positions des PNJ sont
+stockées dans un tableau d'entiers (indices de salles) et les sorties dans
+une table d'adjacence compacte ; un tour fait avancer tous les PNJ en une
+seule opération vectorisée NumPy.
+
+Les listes `Room.characters` (et l'attribut `Character.current_room`) ne
+sont synchronisées que pour les salles observées par le joueur : les autres
+salles peuvent contenir des listes périmées, qui seront remises à jour dès
+que le joueur y entrera. Utiliser `room_of()` pour connaître la position
+exacte d'un PNJ quelconque.
+
+Le déplacement suit exactement la règle de `Character.move` : une chance
+sur deux de rester sur place, sinon une sortie (non-None) tirée
+uniformément.
+
+NumPy est une dépendance optionnelle : sans elle, ce module s'importe mais
+le moteur ne peut pas être créé.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # dépendance optionnelle
+    np = None
+
+
+class VectorizedCharacterEngine:
+    """
+    Moteur vectorisé de déplacement des PNJ.
+
+    Il offre la même interface que `CharacterRegistry` (`tick`, `add`,
+    `remove`, itération), ce qui permet de l'installer à sa place avec
+    `Game.use_vectorized_characters()`.
+
+    Attributes:
+        rooms (list): Les salles du monde, indexées de 0 à R-1.
+        characters (list): Les PNJ gérés, dans l'ordre des positions.
+        positions (numpy.ndarray): Indice de salle de chaque PNJ (int32).
+        exits (numpy.ndarray): Table (R, 4) des salles voisines de chaque
+            salle, les sorties valides en premier puis -1.
+        degree (numpy.ndarray): Nombre de sorties valides de chaque salle.
+
+    Exemple:
+        >>> from world import build_world, compile_world, synthetic_world
+        >>> from output import NullSink
+        >>> world = build_world(compile_world(synthetic_world(16, characters=100)))
+        >>> engine = VectorizedCharacterEngine(world.rooms, world.characters, seed=1)
+        >>> engine.tick(world.start, NullSink())
+        >>> len(engine), int(engine.positions.max()) < 16
+        (100, True)
+    """
+
+    def __init__(self, rooms, characters=(), seed=None):
+        """
+        Initialise le moteur.
+
+        Args:
+            rooms (list): Les salles du monde.
+            characters (iterable): Les PNJ à gérer, déjà placés dans leur salle.
+            seed (int, optional): Graine du générateur aléatoire.
+
+        Raises:
+            ImportError: Si NumPy n'est pas installé.
+        """
+        if np is None:
+            raise ImportError("NumPy est requis pour VectorizedCharacterEngine.")
+
+        self.rooms = list(rooms)
+        self._room_index = {id(room): i for i, room in enumerate(self.rooms)}
+        self.rng = np.random.default_rng(seed)
+        self.build_adjacency()
+
+        self.characters = list(characters)
+        self._character_index = {id(c): i for i, c in enumerate(self.characters)}
+        self.positions = np.fromiter(
+            (self._room_index[id(c.current_room)] for c in self.characters),
+            dtype=np.int32,
+            count=len(self.characters),
+        )
+        self._observed = None
+
+    def build_adjacency(self):
+        """(Re)construit la table d'adjacence à partir des sorties des salles."""
+        exits = np.full((len(self.rooms), 4), -1, dtype=np.int32)
+        degree = np.zeros(len(self.rooms), dtype=np.int32)
+        for i, room in enumerate(self.rooms):
+            targets = [self._room_index[id(t)] for t in room.open_exits()]
+            exits[i, :len(targets)] = targets
+            degree[i] = len(targets)
+        self.exits = exits
+        self.degree = degree
+
+    def __iter__(self):
+        return iter(self.characters)
+
+    def __len__(self):
+        return len(self.characters)
+
+    def add(self, character):
+        """Ajoute un PNJ (il doit déjà figurer dans sa salle)."""
+        self._character_index[id(character)] = len(self.characters)
+        self.characters.append(character)
+        position = self._room_index[id(character.current_room)]
+        self.positions = np.append(self.positions, np.int32(position))
+
+    def remove(self, character):
+        """Retire un PNJ du moteur et de sa salle."""
+        i = self._character_index.pop(id(character))
+        room = self.rooms[self.positions[i]]
+        if character in room.characters:
+            room.characters.remove(character)
+        del self.characters[i]
+        self.positions = np.delete(self.positions, i)
+        self._character_index = {id(c): j for j, c in enumerate(self.characters)}
+
+    def room_of(self, character):
+        """Retourne la salle où se trouve réellement un PNJ."""
+        return self.rooms[self.positions[self._character_index[id(character)]]]
+
+    def step(self):
+        """
+        Fait avancer tous les PNJ d'un tour, sans synchroniser les salles.
+
+        Returns:
+            numpy.ndarray: Les positions avant le déplacement.
+        """
+        old = self.positions
+        count = len(old)
+        degree = self.degree[old]
+        moving = (self.rng.random(count) < 0.5) & (degree > 0)
+        movers = np.flatnonzero(moving)
+        choice = (self.rng.random(len(movers)) * degree[movers]).astype(np.int32)
+
+        new = old.copy()
+        new[movers] = self.exits[old[movers], choice]
+        self.positions = new
+        return old
+
+    def tick(self, player_room, output):
+        """
+        Fait avancer tous les PNJ d'un tour et synchronise la salle du joueur.
+
+        Affiche un message pour chaque personnage qui quitte ou rejoint la
+        salle du joueur, dans l'ordre des personnages.
+
+        Args:
+            player_room (Room): La salle où se trouve le joueur.
+            output: La sortie de la partie.
+        """
+        old = self.step()
+        new = self.positions
+        observed = self._room_index[id(player_room)]
+
+        leaving = (old == observed) & (new != observed)
+        entering = (new == observed) & (old != observed)
+        for i in np.flatnonzero(leaving | entering):
+            character = self.characters[i]
+            if leaving[i]:
+                output.print(f"\n{character.name} quitte la salle.\n")
+            else:
+                output.print(f"\n{character.name} entre dans la salle.\n")
+
+        self.sync(observed)
+
+    def sync(self, observed):
+        """
+        Synchronise `Room.characters` pour la salle observée.
+
+        La liste de la salle observée au tour précédent est vidée si le
+        joueur l'a quittée, pour ne pas laisser de PNJ en double.
+
+        Args:
+            observed (int): Indice de la salle observée par le joueur.
+        """
+        if self._observed is not None and self._observed != observed:
+            self.rooms[self._observed].characters = []
+        self._observed = observed
+
+        room = self.rooms[observed]
+        present = [self.characters[i] for i in np.flatnonzero(self.positions == observed)]
+        for character in present:
+            character.current_room = room
+        room.characters = present
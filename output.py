@@ -0,0 +1,106 @@
+"""Module contenant les sorties du jeu (« sinks »).
+
+Le moteur n'appelle jamais `print()` directement : chaque partie possède sa
+propre sortie, à laquelle le joueur, le gestionnaire de quêtes, les quêtes
+et les actions envoient leurs messages via `output.print(...)`. Plusieurs
+parties peuvent ainsi tourner dans le même processus sans partager
+`sys.stdout`.
+
+Sorties disponibles :
+  - `ConsoleSink` : écrit immédiatement sur `sys.stdout` (défaut).
+  - `BufferedSink` : accumule les messages et les écrit en une seule fois
+    à chaque `flush()`, c'est-à-dire une fois par commande.
+  - `NullSink` : ignore tout, pour les simulations sans lecteur.
+"""
+
+import sys
+
+
+class ConsoleSink:
+    """
+    Sortie écrivant immédiatement chaque message sur `sys.stdout`.
+
+    `sys.stdout` est résolu à chaque écriture, ce qui respecte les
+    redirections faites par l'appelant (doctests, `contextlib`...).
+
+    Examples:
+
+    >>> sink = ConsoleSink()
+    >>> sink.print("Bonjour", "voyageur")
+    Bonjour voyageur
+    """
+
+    enabled = True
+
+    def print(self, *values, sep=" ", end="\n"):
+        """Écrit un message, avec la même signature que `print()`."""
+        sys.stdout.write(sep.join(map(str, values)) + end)
+
+    def flush(self):
+        """Rien à faire : les messages sont déjà écrits."""
+
+
+class BufferedSink(ConsoleSink):
+    """
+    Sortie accumulant les messages jusqu'au prochain `flush()`.
+
+    Attributes:
+        stream: Flux de destination (par défaut `sys.stdout` au moment du
+            `flush()`).
+
+    Examples:
+
+    >>> sink = BufferedSink()
+    >>> sink.print("Première ligne")
+    >>> sink.print("Seconde ligne")
+    >>> sink.flush()
+    Première ligne
+    Seconde ligne
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self._chunks = []
+
+    def print(self, *values, sep=" ", end="\n"):
+        """Ajoute un message au tampon."""
+        self._chunks.append(sep.join(map(str, values)) + end)
+
+    def getvalue(self):
+        """Retourne le contenu du tampon sans le vider."""
+        return "".join(self._chunks)
+
+    def flush(self):
+        """Écrit tout le tampon en une seule fois puis le vide."""
+        if not self._chunks:
+            return
+        text = "".join(self._chunks)
+        self._chunks.clear()
+        self.write(text)
+
+    def write(self, text):
+        """Écrit un bloc de texte déjà assemblé dans le flux de destination."""
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(text)
+        stream.flush()
+
+
+class NullSink:
+    """
+    Sortie qui ignore tous les messages.
+
+    Examples:
+
+    >>> NullSink().print("Personne ne lira ceci")
+    """
+
+    enabled = False
+
+    def print(self, *values, sep=" ", end="\n"):
+        """Ignore le message."""
+
+    def flush(self):
+        """Rien à faire."""
+
+
+CONSOLE = ConsoleSink()
@@ -4,8 +4,14 @@ Ce module gère le joueur du jeu d'aventure, y compris ses déplacements,
 son inventaire, ses récompenses et ses quêtes.
 """
 
+from output import CONSOLE
 from quest import QuestManager
 
+# Compteurs suivis pour les objectifs de quête (ex: "Se déplacer 10 fois")
+MOVE_COUNTER = "Se déplacer"
+TAKE_COUNTER = "Ramasser"
+TALK_COUNTER = "Parler"
+
 class Player():
     """
     Représente le joueur du jeu d'aventure.
@@ -17,42 +23,51 @@ class Player():
         inventory (dict): Dictionnaire des objets possédés par le joueur.
         current_weight (float): Poids total de l'inventaire en kg.
         move_count (int): Nombre de déplacements effectués.
+        counters (dict): Compteurs d'événements (déplacements, objets ramassés,
+            personnages interrogés) utilisés par les objectifs de quête.
         quest_manager (QuestManager): Gestionnaire des quêtes du joueur.
         rewards (list): Liste des récompenses obtenues.
+        output: Sortie de la partie où sont affichés les messages.
     
     Methods:
-        __init__(name): Initialise le joueur avec un nom.
+        __init__(name, output): Initialise le joueur avec un nom.
         move(direction): Déplace le joueur dans une direction cardinale.
+        increment(counter_name): Incrémente un compteur d'objectifs.
         add_reward(reward): Ajoute une récompense à la liste.
         show_rewards(): Affiche toutes les récompenses obtenues.
         get_history(): Retourne l'historique des salles visitées.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, output=None):
         """
         Initialise un joueur avec un nom donné.
         
         Args:
             name (str): Le nom du joueur.
+            output (optional): Sortie de la partie (par défaut la console).
         
         Crée les structures de base : inventaire vide, liste de salles visitées,
         quêtes et récompenses vides.
         """
         self.name = name
+        self.output = output if output is not None else CONSOLE
         self.current_room = None
         self.visited_rooms = []
         self.inventory = {}
         self.current_weight = 0
         self.move_count = 0
+        self.counters = dict.fromkeys((MOVE_COUNTER, TAKE_COUNTER, TALK_COUNTER), 0)
         self.quest_manager = QuestManager(self)
         self.rewards = []
 
-    def move(self, direction):
+    def move(self, direction, describe=True):
         """
         Déplace le joueur dans la direction cardinale spécifiée.
         
         Args:
             direction (str): Direction cardinale (N, E, S, O).
+            describe (bool): Afficher la description de la nouvelle salle
+                (False pour les étapes intermédiaires d'un voyage).
         
         Returns:
             bool: True si le déplacement a été effectué avec succès, False sinon.
@@ -63,19 +78,22 @@ class Player():
         - Met à jour la salle actuelle du joueur
         - Vérifie les objectifs de quête (visite de salle, compteur de déplacement)
         """
-        # Get the next room from the exits dictionary of the current room.
-        next_room = self.current_room.exits[direction]
+        # Un seul accès à la table des passages de la salle.
+        edge = self.current_room.edges.get(direction)
 
-        # If the next room is "blocked", c'est un passage à sens unique.
-        if next_room == "Pasage interdit":
-            print("\nPassage interdit !\n")
-            print(self.current_room.get_long_description())
+        # If there is no passage, print an error message and return False.
+        if edge is None:
+            self.output.print("\nAucune porte dans cette direction !\n")
             return False
 
-        # If the next room is None, print an error message and return False.
-        if next_room is None:
-            print("\nAucune porte dans cette direction !\n")
+        # Passage interdit (sens unique), verrouillé ou objet requis manquant.
+        refusal = edge.check(self.inventory)
+        if refusal is not None:
+            self.output.print(refusal)
+            if edge.blocked:
+                self.output.print(self.current_room.get_long_description())
             return False
+        next_room = edge.target
 
         # Move the player to the next room
 
@@ -84,18 +102,42 @@ class Player():
         # Set the current room to the next room.
         self.current_room = next_room
 
-        print(self.current_room.get_long_description())
+        if describe:
+            self.output.print(self.current_room.get_long_description())
 
         # Check room visit objectives
         self.quest_manager.check_room_objectives(self.current_room.name)
 
         # Increment move counter and check movement objectives
-        self.move_count += 1
-        self.quest_manager.check_counter_objectives("Se déplacer", self.move_count)
+        self.move_count = self.increment(MOVE_COUNTER)
 
         return True
 
 
+    def increment(self, counter_name):
+        """
+        Incrémente un compteur et vérifie les objectifs de quête associés.
+
+        Args:
+            counter_name (str): Le nom du compteur (ex: "Se déplacer").
+
+        Returns:
+            int: La nouvelle valeur du compteur.
+
+        Examples:
+
+        >>> player = Player("Dora")
+        >>> player.increment(TAKE_COUNTER)
+        1
+        >>> player.counters[TAKE_COUNTER]
+        1
+        """
+        count = self.counters.get(counter_name, 0) + 1
+        self.counters[counter_name] = count
+        self.quest_manager.check_counter_objectives(counter_name, count)
+        return count
+
+
     def add_reward(self, reward):
         """
         Add a reward to the player's rewards list.
@@ -118,7 +160,7 @@ class Player():
         """
         if reward and reward not in self.rewards:
             self.rewards.append(reward)
-            print(f"\n🎁 Vous avez obtenu: {reward}\n")
+            self.output.print(f"\n🎁 Vous avez obtenu: {reward}\n")
 
 
     def show_rewards(self):
@@ -143,12 +185,12 @@ class Player():
         <BLANKLINE>
         """
         if not self.rewards:
-            print("\n🎁 Aucune récompense obtenue pour le moment.\n")
+            self.output.print("\n🎁 Aucune récompense obtenue pour le moment.\n")
         else:
-            print("\n🎁 Vos récompenses:")
+            self.output.print("\n🎁 Vos récompenses:")
             for reward in self.rewards:
-                print(f"  • {reward}")
-            print()
+                self.output.print(f"  • {reward}")
+            self.output.print()
 
     # Define the get_history method.
     def get_history(self):
@@ -1,5 +1,136 @@
 """ Define the Quest class"""
 
+import heapq
+from itertools import count
+
+from output import CONSOLE
+
+ROOM_VERBS = ("Visiter ", "Explorer ", "Aller à ", "Entrer dans ")
+ACTION_VERBS = ("prendre ", "parler ")
+TARGET_LINKS = ("avec ", "le ", "la ")
+
+
+class Objective:
+    """
+    A quest objective, compiled once into a structured record.
+
+    Objectives are written as short French phrases ("prendre epee",
+    "Visiter Verdenfall", "Se déplacer 10 fois"). They are parsed a single
+    time, when the quest is created or the world is compiled, so that event
+    checks and the progress display only compare fields and never split
+    strings.
+
+    Attributes:
+        text (str): The objective as displayed to the player.
+        kind (str): "room", "action" or "counter".
+        verb (str): The action or counter name ("prendre", "Se déplacer").
+            For room objectives, the visit verb ("Visiter").
+        target (str): The room, item or character concerned, if any.
+        count (int): The required count for counter objectives, else None.
+        key (tuple): The event key the objective waits for:
+            ("room", room), ("action", verb, target) or ("counter", verb).
+
+    Examples:
+
+    >>> Objective.parse("Visiter Verdenfall").key
+    ('room', 'Verdenfall')
+    >>> Objective.parse("parler avec Messager").key
+    ('action', 'parler', 'Messager')
+    >>> objective = Objective.parse("Se déplacer 10 fois")
+    >>> objective.key, objective.count
+    (('counter', 'Se déplacer'), 10)
+    >>> objective.progress(4)
+    'Se déplacer 10 fois (Progression: 4/10)'
+    >>> objective == "Se déplacer 10 fois"
+    True
+    """
+
+    __slots__ = ("text", "kind", "verb", "target", "count", "key", "_progress")
+
+    def __init__(self, text, kind, verb, target=None, count=None):
+        self.text = text
+        self.kind = kind
+        self.verb = verb
+        self.target = target
+        self.count = count
+        if kind == "room":
+            self.key = ("room", target)
+        elif kind == "counter":
+            self.key = ("counter", verb)
+        else:
+            self.key = ("action", verb, target)
+        self._progress = f"{text} (Progression: {{}}/{count})" if count is not None else None
+
+    @classmethod
+    def parse(cls, text):
+        """
+        Build an objective from its French phrase.
+
+        Args:
+            text (str): The objective text.
+
+        Returns:
+            Objective: The structured objective.
+
+        Room and action phrases are recognised first, so a number inside a
+        room or item name is kept in the target. Only the remaining phrases
+        ending with a count ("<verb> N" or "<verb> N fois") are counters.
+
+        Examples:
+
+        >>> Objective.parse("Visiter Salle 12").key
+        ('room', 'Salle 12')
+        >>> Objective.parse("prendre objet_7").key
+        ('action', 'prendre', 'objet_7')
+        >>> objective = Objective.parse("Se déplacer 10")
+        >>> objective.key, objective.count
+        (('counter', 'Se déplacer'), 10)
+        """
+        for verb in ROOM_VERBS:
+            if text.startswith(verb):
+                return cls(text, "room", verb.strip(), text[len(verb):])
+
+        if not text.startswith(ACTION_VERBS):
+            words = text.split()
+            if words and words[-1] == "fois":
+                words.pop()
+            if len(words) > 1 and words[-1].isdigit():
+                return cls(text, "counter", " ".join(words[:-1]), count=int(words[-1]))
+
+        action, _, target = text.partition(" ")
+        for link in TARGET_LINKS:
+            if target.startswith(link):
+                target = target[len(link):]
+                break
+        return cls(text, "action", action, target or None)
+
+    def as_tuple(self):
+        """Return the plain fields, e.g. to store the objective in a compiled world."""
+        return (self.text, self.kind, self.verb, self.target, self.count)
+
+    def progress(self, current_count):
+        """Return the display text with the progress of a counter objective."""
+        if self._progress is None:
+            return self.text
+        return self._progress.format(current_count)
+
+    def __eq__(self, other):
+        if isinstance(other, Objective):
+            return self.text == other.text
+        if isinstance(other, str):
+            return self.text == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.text)
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"Objective({self.text!r})"
+
+
 class Quest:
     """
     This class represents a quest in the game. A quest has a title, description,
@@ -8,10 +139,12 @@ class Quest:
     Attributes:
         title (str): The title of the quest.
         description (str): The description of the quest.
-        objectives (list): List of objectives to complete.
+        objectives (list): List of objectives (`Objective`) to complete.
+        completed_objectives (list): Objectives already completed, in order.
         is_completed (bool): Whether the quest is completed.
         is_active (bool): Whether the quest is currently active.
         reward (str): Optional reward for completing the quest.
+        output: Sink receiving the quest messages (set by the QuestManager).
     """
 
 
@@ -22,7 +155,8 @@ class Quest:
         Args:
             title (str): The title of the quest.
             description (str): The description of the quest.
-            objectives (list): List of objectives (default: empty list).
+            objectives (list): List of objectives, as `Objective` records or as
+                phrases parsed once here (default: empty list).
             reward (str): Optional reward description.
             
         Examples:
@@ -39,11 +173,17 @@ class Quest:
         """
         self.title = title
         self.description = description
-        self.objectives = objectives if objectives is not None else []
+        self.objectives = [
+            objective if isinstance(objective, Objective) else Objective.parse(objective)
+            for objective in (objectives or [])
+        ]
+        self._objectives_by_text = {objective.text: objective for objective in self.objectives}
         self.completed_objectives = []
+        self._completed = set()
         self.is_completed = False
         self.is_active = False
         self.reward = reward
+        self.output = CONSOLE
 
 
     def activate(self):
@@ -64,8 +204,8 @@ class Quest:
         True
         """
         self.is_active = True
-        print(f"\n🗡️  Nouvelle quête activée: {self.title}")
-        print(f"📝 {self.description}\n")
+        self.output.print(f"\n🗡️  Nouvelle quête activée: {self.title}")
+        self.output.print(f"📝 {self.description}\n")
 
 
     def complete_objective(self, objective, player=None):
@@ -73,7 +213,7 @@ class Quest:
         Mark an objective as completed.
         
         Args:
-            objective (str): The objective to mark as completed.
+            objective (str | Objective): The objective to mark as completed.
             player: The player object (optional).
             
         Returns:
@@ -92,9 +232,11 @@ class Quest:
         >>> quest.complete_objective("Invalid objective")
         False
         """
-        if objective in self.objectives and objective not in self.completed_objectives:
+        objective = self._objectives_by_text.get(str(objective))
+        if objective is not None and objective not in self._completed:
+            self._completed.add(objective)
             self.completed_objectives.append(objective)
-            print(f"✅ Objectif accompli: {objective}")
+            self.output.print(f"✅ Objectif accompli: {objective.text}")
 
             # Check if all objectives are completed
             if len(self.completed_objectives) == len(self.objectives):
@@ -126,12 +268,12 @@ class Quest:
         """
         if not self.is_completed:
             self.is_completed = True
-            print(f"\n🏆 Quête terminée: {self.title}")
+            self.output.print(f"\n🏆 Quête terminée: {self.title}")
             if self.reward:
-                print(f"🎁 Récompense: {self.reward}")
+                self.output.print(f"🎁 Récompense: {self.reward}")
                 if player:
                     player.add_reward(self.reward)
-            print()
+            self.output.print()
 
 
     def get_status(self):
@@ -194,7 +336,7 @@ class Quest:
         if self.objectives:
             details += "\nObjectifs:\n"
             for objective in self.objectives:
-                status = "✅" if objective in self.completed_objectives else "⬜"
+                status = "✅" if objective in self._completed else "⬜"
                 objective_text = self._format_objective_with_progress(objective, current_counts)
                 details += f"  {status} {objective_text}\n"
 
@@ -208,40 +350,19 @@ class Quest:
         Format an objective with progress information if available.
         
         Args:
-            objective (str): The objective text.
+            objective (Objective): The objective.
             current_counts (dict): Dictionary with current counter values.
             
         Returns:
             str: Formatted objective text with progress if applicable.
         """
-        if not current_counts:
-            return objective
+        if objective.count is None or not current_counts:
+            return objective.text
 
-        for counter_name, current_count in current_counts.items():
-            if counter_name not in objective:
-                continue
-
-            # Extract required count from objective
-            required = self._extract_number_from_text(objective)
-            if required is not None:
-                return f"{objective} (Progression: {current_count}/{required})"
-
-        return objective
-
-    def _extract_number_from_text(self, text):
-        """
-        Extract the first number from a text string.
-        
-        Args:
-            text (str): The text to search.
-            
-        Returns:
-            int: The first number found, or None if no number exists.
-        """
-        for word in text.split():
-            if word.isdigit():
-                return int(word)
-        return None
+        current_count = current_counts.get(objective.verb)
+        if current_count is None:
+            return objective.text
+        return objective.progress(current_count)
 
 
     def check_room_objective(self, room_name, player=None):
@@ -267,16 +388,27 @@ class Quest:
         >>> quest.check_room_objective("Tower")
         False
         """
-        room_objectives = [
-            f"Visiter {room_name}",
-            f"Explorer {room_name}",
-            f"Aller à {room_name}",
-            f"Entrer dans {room_name}"
-        ]
+        return self._complete_first(("room", room_name), player)
 
-        for objective in room_objectives:
-            if self.complete_objective(objective, player):
-                return True
+
+    def _complete_first(self, key, player=None, current_count=None):
+        """
+        Complete the first pending objective waiting for an event key.
+
+        Args:
+            key (tuple): The event key (see `Objective.key`).
+            player: The player object (optional).
+            current_count (int): For counter events, the current count.
+
+        Returns:
+            bool: True if an objective was completed, False otherwise.
+        """
+        for objective in self.objectives:
+            if objective.key != key or objective in self._completed:
+                continue
+            if current_count is not None and current_count < objective.count:
+                continue
+            return self.complete_objective(objective, player)
         return False
 
 
@@ -304,20 +436,7 @@ class Quest:
         >>> quest.check_action_objective("courir", "vite")
         False
         """
-        if target:
-            objective_variations = [
-                f"{action} {target}",
-                f"{action} avec {target}",
-                f"{action} le {target}",
-                f"{action} la {target}"
-            ]
-        else:
-            objective_variations = [action]
-
-        for objective in objective_variations:
-            if self.complete_objective(objective, player):
-                return True
-        return False
+        return self._complete_first(("action", action, target or None), player)
 
 
     def check_counter_objective(self, counter_name, current_count, player=None):
@@ -344,17 +463,7 @@ class Quest:
         <BLANKLINE>
         True
         """
-        for objective in self.objectives:
-            if counter_name in objective and objective not in self.completed_objectives:
-                # Extract number from objective (e.g., "Visiter 3 lieux" -> 3)
-                words = objective.split()
-                for word in words:
-                    if word.isdigit():
-                        required_count = int(word)
-                        if current_count >= required_count:
-                            self.complete_objective(objective, player)
-                            return True
-        return False
+        return self._complete_first(("counter", counter_name), player, current_count)
 
 
     def __str__(self):
@@ -385,6 +494,8 @@ class QuestManager:
         quests (list): List of all quests in the game.
         active_quests (list): List of currently active quests.
         player: Reference to the player object.
+        output: Sink receiving the messages (the player's one, if any).
+        on_quest_completed: Optional callback receiving each completed quest.
     """
 
 
@@ -406,6 +517,14 @@ class QuestManager:
         self.quests = []
         self.active_quests = []
         self.player = player
+        # Inverted index: event key -> pending (quest, objective) pairs
+        self._index = {}
+        # Counter name -> min-heap of (required count, order, quest, objective)
+        self._thresholds = {}
+        self._order = count()
+        self.output = player.output if player is not None else CONSOLE
+        # Called with each quest as it completes (used by the rules engine)
+        self.on_quest_completed = None
 
 
     def add_quest(self, quest):
@@ -425,6 +544,7 @@ class QuestManager:
         >>> manager.quests[0].title
         'Quest 1'
         """
+        quest.output = self.output
         self.quests.append(quest)
 
 
@@ -458,10 +578,70 @@ class QuestManager:
             if quest.title == quest_title and not quest.is_active:
                 quest.activate()
                 self.active_quests.append(quest)
+                self._register(quest)
                 return True
         return False
 
 
+    def _register(self, quest):
+        """
+        Register the pending objectives of an active quest in the event index.
+
+        Counter objectives go to the threshold schedule of their counter
+        instead, ordered by required count.
+
+        Args:
+            quest (Quest): The quest that was just activated.
+        """
+        for objective in quest.objectives:
+            if objective in quest._completed:
+                continue
+            if objective.kind == "counter":
+                heap = self._thresholds.setdefault(objective.verb, [])
+                heapq.heappush(heap, (objective.count, next(self._order), quest, objective))
+            else:
+                self._index.setdefault(objective.key, []).append((quest, objective))
+
+
+    def _complete(self, quest, objective):
+        """
+        Complete one registered objective and retire its quest if it is done.
+
+        Args:
+            quest (Quest): The quest owning the objective.
+            objective (Objective): The objective reached.
+        """
+        quest.complete_objective(objective, self.player)
+        if quest.is_completed and quest in self.active_quests:
+            self._retire(quest)
+
+
+    def _retire(self, quest):
+        """
+        Remove a completed quest from the active list and notify the listener.
+
+        Args:
+            quest (Quest): The quest just completed.
+        """
+        self.active_quests.remove(quest)
+        if self.on_quest_completed is not None:
+            self.on_quest_completed(quest)
+
+
+    def _dispatch(self, key, entries):
+        """
+        Complete the indexed objectives matching an event.
+
+        Args:
+            key (tuple): The event key.
+            entries (list): The (quest, objective) pairs registered for the key.
+        """
+        del self._index[key]
+        for quest, objective in entries:
+            if objective not in quest._completed:
+                self._complete(quest, objective)
+
+
     def complete_objective(self, objective_text):
         """
         Complete an objective in any active quest.
@@ -496,7 +676,7 @@ class QuestManager:
             if quest.complete_objective(objective_text):
                 # Remove completed quests from active list
                 if quest.is_completed:
-                    self.active_quests.remove(quest)
+                    self._retire(quest)
                 return True
         return False
 
@@ -527,10 +707,10 @@ class QuestManager:
         >>> len(manager.active_quests)
         0
         """
-        for quest in self.active_quests[:]:  # Use slice to avoid modification during iteration
-            quest.check_room_objective(room_name, self.player)
-            if quest.is_completed:
-                self.active_quests.remove(quest)
+        key = ("room", room_name)
+        entries = self._index.get(key)
+        if entries:
+            self._dispatch(key, entries)
 
 
     def check_action_objectives(self, action, target=None):
@@ -560,15 +740,18 @@ class QuestManager:
         >>> len(manager.active_quests)
         0
         """
-        for quest in self.active_quests[:]:
-            quest.check_action_objective(action, target, self.player)
-            if quest.is_completed:
-                self.active_quests.remove(quest)
+        key = ("action", action, target)
+        entries = self._index.get(key)
+        if entries:
+            self._dispatch(key, entries)
 
 
     def check_counter_objectives(self, counter_name, current_count):
         """
         Check all active quests for counter-related objectives.
+
+        Pending thresholds are kept in a min-heap per counter, so an increment
+        that reaches no threshold costs a single comparison.
         
         Args:
             counter_name (str): The name of what is being counted.
@@ -596,10 +779,17 @@ class QuestManager:
         >>> len(manager.active_quests)
         0
         """
-        for quest in self.active_quests[:]:
-            quest.check_counter_objective(counter_name, current_count, self.player)
-            if quest.is_completed:
-                self.active_quests.remove(quest)
+        heap = self._thresholds.get(counter_name)
+        # Fast path: no pending threshold reached by this count
+        if not heap or heap[0][0] > current_count:
+            return
+
+        while heap and heap[0][0] <= current_count:
+            _, _, quest, objective = heapq.heappop(heap)
+            if objective not in quest._completed:
+                self._complete(quest, objective)
+        if not heap:
+            del self._thresholds[counter_name]
 
 
     def get_active_quests(self):
@@ -697,13 +887,13 @@ class QuestManager:
         <BLANKLINE>
         """
         if not self.quests:
-            print("\nAucune quête disponible.\n")
+            self.output.print("\nAucune quête disponible.\n")
             return
 
-        print("\n📋 Liste des quêtes:")
+        self.output.print("\n📋 Liste des quêtes:")
         for quest in self.quests:
-            print(f"  {quest.get_status()}")
-        print()
+            self.output.print(f"  {quest.get_status()}")
+        self.output.print()
 
 
     def show_quest_details(self, quest_title, current_counts=None):
@@ -734,6 +924,6 @@ class QuestManager:
         """
         quest = self.get_quest_by_title(quest_title)
         if quest:
-            print(quest.get_details(current_counts))
+            self.output.print(quest.get_details(current_counts))
         else:
-            print(f"\nQuête '{quest_title}' non trouvée.\n")
+            self.output.print(f"\nQuête '{quest_title}' non trouvée.\n")
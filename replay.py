@@ -0,0 +1,170 @@
+"""Module de rejeu des parties enregistrées.
+
+Une partie est entièrement déterminée par la graine de son générateur
+aléatoire (`Game.seed`, qui pilote les PNJ) et par la liste des commandes
+tapées par le joueur (`Game.command_log`). `SessionLog` enregistre ces deux
+informations dans un fichier JSON ; `replay` les rejoue via
+`Game.process_command`, sortie désactivée, aussi vite que possible.
+
+Usages :
+  - reproduire un bogue à partir d'une partie enregistrée
+    (`python game.py --cli --record partie.json`) ;
+  - vérifier qu'une optimisation du moteur ne change pas le déroulement
+    des parties enregistrées : `fingerprint` résume l'état final (salle,
+    inventaire, quêtes, positions des PNJ, issue) et doit rester identique.
+
+    python replay.py partie.json [--repeat N]
+"""
+
+import json
+import time
+
+from game import Game
+from output import NullSink
+from world import DEFAULT_WORLD
+
+
+class SessionLog:
+    """
+    Enregistrement d'une partie : graine et commandes.
+
+    Attributes:
+        seed (int): Graine du générateur aléatoire de la partie.
+        commands (list): Les commandes, dans l'ordre.
+        player_name (str): Le nom du joueur.
+        world_path (str): Le fichier de données du monde.
+
+    Exemple:
+        >>> log = SessionLog(42, ["go N", "take epee"])
+        >>> SessionLog.from_dict(log.to_dict()).commands
+        ['go N', 'take epee']
+    """
+
+    def __init__(self, seed, commands, player_name="Joueur", world_path=DEFAULT_WORLD):
+        self.seed = seed
+        self.commands = list(commands)
+        self.player_name = player_name
+        self.world_path = str(world_path)
+
+    @classmethod
+    def from_game(cls, game):
+        """
+        Enregistre une partie en cours ou terminée.
+
+        Args:
+            game (Game): La partie.
+
+        Returns:
+            SessionLog: L'enregistrement.
+        """
+        return cls(game.seed, game.command_log, game.player.name, game.world_path)
+
+    def to_dict(self):
+        """Retourne l'enregistrement sous forme de dictionnaire sérialisable."""
+        return {
+            "seed": self.seed,
+            "player": self.player_name,
+            "world": self.world_path,
+            "commands": self.commands,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Crée un enregistrement à partir de `to_dict()`."""
+        return cls(data["seed"], data["commands"], data.get("player", "Joueur"),
+                   data.get("world", DEFAULT_WORLD))
+
+    def save(self, path):
+        """Écrit l'enregistrement dans un fichier JSON."""
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        """Lit un enregistrement écrit par `save()`."""
+        with open(path, encoding="utf-8") as file:
+            return cls.from_dict(json.load(file))
+
+
+def replay(log, template=None):
+    """
+    Rejoue une partie enregistrée, sans aucune sortie.
+
+    Le rejeu s'arrête comme la boucle de jeu, dès que la partie est terminée.
+
+    Args:
+        log (SessionLog): La partie à rejouer.
+        template (Game, optional): Un modèle déjà configuré (`setup()`), cloné
+            pour éviter de recharger le monde à chaque rejeu.
+
+    Returns:
+        Game: La partie dans son état final.
+
+    Examples:
+
+    >>> log = SessionLog(7, ["activate Atteindre Verdenfall", "go N", "go E", "go N"])
+    >>> first, second = replay(log), replay(log)
+    >>> fingerprint(first) == fingerprint(second)
+    True
+    >>> first.player.current_room.name
+    'Grisepierre'
+    """
+    if template is None:
+        game = Game(log.world_path, NullSink(), log.seed)
+        game.setup(log.player_name)
+    else:
+        game = template.clone(log.player_name, NullSink(), log.seed)
+    for command in log.commands:
+        if game.finished:
+            break
+        game.process_command(command)
+    return game
+
+
+def fingerprint(game):
+    """
+    Résume l'état d'une partie, pour comparer deux exécutions.
+
+    Args:
+        game (Game): La partie.
+
+    Returns:
+        tuple: Salle du joueur, inventaire, quêtes terminées, positions des
+            PNJ et issue de la partie.
+    """
+    player = game.player
+    return (
+        player.current_room.name,
+        tuple(sorted(player.inventory)),
+        tuple(sorted(quest.title for quest in game.world.quests if quest.is_completed)),
+        tuple((character.name, character.current_room.name)
+              for character in game.world.characters if character.current_room is not None),
+        game.rules.outcome,
+    )
+
+
+def main(argv=None):
+    """Point d'entrée : `python replay.py partie.json [--repeat N]`."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    log = SessionLog.load(args.log)
+    template = Game(log.world_path, NullSink(), log.seed)
+    template.setup(log.player_name)
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        game = replay(log, template)
+    elapsed = time.perf_counter() - start
+    print(fingerprint(game))
+    per_command = elapsed / (args.repeat * max(1, len(log.commands))) * 1e6
+    print(f"{args.repeat} rejeu(x) de {len(log.commands)} commandes : "
+          f"{elapsed * 1000:.1f} ms ({per_command:.1f} µs / commande)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -12,8 +12,21 @@ Les sorties utilisent les directions cardinales :
 
 Une valeur `None` pour une sortie signifie qu'il n'y a pas de salle dans
 cette direction.
+
+Les sorties sont rangées dans une table de passages typés (`Room.edges`,
+direction -> `Edge`) ; `Room.exits` en est une vue simple direction -> salle.
+
+Les données dérivées des sorties (vue `exits`, passages visibles, salles
+voisines, chaîne « Sorties: ... ») sont mises en cache dans la salle et
+partagées par l'affichage, le déplacement des PNJ et le calcul d'itinéraires.
+Un compteur de version, incrémenté par `set_edges`, invalide ce cache.
 """
 
+from types import MappingProxyType
+
+from edge import Edge
+
+
 class Room:
 
     """Représente une salle du jeu.
@@ -23,10 +36,19 @@ class Room:
         description (str): Description courte de la salle affichée au joueur.
         exits (dict): Dictionnaire des sorties cardinales vers d'autres
             objets `Room`. Les clés sont des chaînes "N", "E", "S", "O".
+            L'affecter remplace les passages par des passages simples.
+        edges (dict): Table des passages typés, direction -> `Edge` (ou None).
+        version (int): Compteur incrémenté à chaque modification des sorties.
+        world (World | None): Le monde contenant la salle, dont la version
+            est incrémentée avec celle de la salle.
 
     Methods:
         get_exit(direction): Retourne la `Room` située dans la direction
             donnée (ou `None` si aucune sortie).
+        set_edges(edges): Remplace la table des passages typés.
+        set_exit(direction, edge): Remplace un seul passage.
+        exit_tuples(): Retourne les passages visibles (direction, `Edge`).
+        open_exits(): Retourne les salles voisines accessibles sans condition.
         get_exit_string(): Retourne une chaîne listant les directions
             disponibles (ex: "Sorties: N, E").
         get_long_description(): Retourne la description complète affichée
@@ -37,17 +59,97 @@ class Room:
         >>> r.exits = {"N": None, "E": None, "S": None, "O": None}
         >>> r.get_exit("N") is None
         True
+        >>> r2 = Room("Autre", "dans une autre salle.")
+        >>> r.set_edges({"N": Edge(r2, one_way=True)})
+        >>> r2.set_edges({"S": Edge(r, blocked=True)})
+        >>> r.exits["N"] is r2, r2.get_exit("S")
+        (True, 'passage interdit')
+        >>> r.get_exit_string(), r.version
+        ('Sorties: N', 2)
+        >>> r.set_exit("E", Edge(r2))
+        >>> r.get_exit_string(), r.version
+        ('Sorties: N, E', 3)
     """
 
     def __init__(self, name, description, image=None):
         self.name = name
         self.description = description
-        self.exits = {}
+        self.edges = {}
+        self.version = 0
+        self.world = None
+        self._cache = None
+        self._cache_version = -1
         self.inventory = {}
         self.current_weight = 0
         self.characters = []
         self.image = image
 
+    @property
+    def exits(self):
+        """Sorties direction -> `Room` (None si absente ou interdite), en lecture seule."""
+        return self._topology()[0]
+
+    @exits.setter
+    def exits(self, exits):
+        self.set_edges({
+            direction: None if target is None else Edge(target)
+            for direction, target in exits.items()
+        })
+
+    def set_edges(self, edges):
+        """
+        Remplace la table des passages.
+
+        Incrémente la version de la salle (et celle du monde qui la contient),
+        ce qui invalide les données dérivées des sorties : cache de la salle,
+        itinéraires calculés. La table ne doit pas être modifiée sur place.
+
+        Args:
+            edges (dict): Dictionnaire direction -> `Edge` (ou None).
+        """
+        self.edges = edges
+        self.version += 1
+        if self.world is not None:
+            self.world.version += 1
+
+    def set_exit(self, direction, edge):
+        """Remplace (ou supprime avec None) un seul passage ; voir `set_edges`."""
+        edges = dict(self.edges)
+        edges[direction] = edge
+        self.set_edges(edges)
+
+    def _topology(self):
+        """
+        Retourne les données dérivées des sorties, recalculées si la version a changé.
+
+        Returns:
+            tuple: (sorties en lecture seule, couples (direction, `Edge`) des
+                passages visibles, salles voisines libres, chaîne des sorties).
+        """
+        if self._cache_version != self.version:
+            visible = tuple(
+                (direction, edge) for direction, edge in self.edges.items()
+                if edge is not None and not edge.blocked
+            )
+            targets = dict(visible)
+            exits = MappingProxyType({
+                direction: targets[direction].target if direction in targets else None
+                for direction in self.edges
+            })
+            neighbours = tuple(edge.target for _, edge in visible if edge.free)
+            exit_string = ("Sorties: " + ", ".join(direction for direction, _ in visible)).strip(", ")
+            self._cache = (exits, visible, neighbours, exit_string)
+            self._cache_version = self.version
+        return self._cache
+
+    def exit_tuples(self):
+        """Retourne les couples (direction, `Edge`) des passages visibles (non interdits)."""
+        return self._topology()[1]
+
+    def open_exits(self):
+        """Retourne les salles voisines accessibles sans condition (utilisé par les PNJ)."""
+        return self._topology()[2]
+
     def get_exit(self, direction):
 
         """Retourne la salle reliée par la sortie `direction`.
@@ -57,23 +159,25 @@ class Room:
 
         Returns:
             Room | None: L'objet `Room` si la sortie existe, sinon `None`.
-                        Retourne "Passage interdit" si le passage est à sens unique (interdit).
+                        Retourne "passage interdit" si la direction est
+                        inconnue ou si le passage est à sens unique (interdit).
         """
-        if direction in self.exits.keys():
-            return self.exits[direction]
-        return "passage interdit"
+        if direction not in self.edges:
+            return "passage interdit"
+        edge = self.edges[direction]
+        if edge is None:
+            return None
+        if edge.blocked:
+            return "passage interdit"
+        return edge.target
 
     def get_exit_string(self):
         """Retourne une chaîne décrivant les sorties disponibles.
 
         Ne liste que les directions qui pointent vers une salle (non-None).
+        La chaîne est mise en cache jusqu'à la prochaine modification des sorties.
         """
-        exit_string = "Sorties: "
-        for exit in self.exits.keys():
-            if self.exits.get(exit) is not None:
-                exit_string += exit + ", "
-        exit_string = exit_string.strip(", ")
-        return exit_string
+        return self._topology()[3]
 
     def get_long_description(self):
         """Retourne la description complète de la salle, incluant les sorties."""
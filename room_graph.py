@@ -0,0 +1,448 @@
+"""Module contenant une représentation compacte du graphe des salles.
+
+Pour les mondes générés de très grande taille (un million de salles), un
+objet `Room` par salle coûte cher : chaque instance porte son dictionnaire
+d'attributs, un dictionnaire de sorties, un inventaire et une liste de
+personnages. `RoomGraph` stocke le monde sous forme de tableaux :
+
+  - les salles sont des entiers de 0 à R-1 ;
+  - les noms sont concaténés dans un unique tampon UTF-8, avec un tableau
+    des positions de fin ;
+  - les sorties sont un tableau `array('i')` de 4 entiers 32 bits par salle
+    (N, E, S, O), -1 signifiant « pas de sortie » ; les attributs des
+    passages typés (coût, sens unique, interdit, verrouillé, objet requis)
+    sont rangés à part, pour les seules sorties qui en ont ;
+  - les descriptions sont dédupliquées (tableau d'indices vers une palette) ;
+  - inventaires et personnages ne sont alloués que pour les salles qui en
+    ont réellement.
+
+`CompactRoom` est une vue légère (deux emplacements) sur une salle du
+graphe, créée à la demande, qui offre la même interface que `Room`
+(`name`, `exits`, `edges`, `get_exit`, `get_exit_string`, `get_long_description`,
+`get_inventory`, `get_characters`) : `Player.move` et les actions
+fonctionnent sans modification, passages verrouillés et objets requis
+compris.
+"""
+
+from array import array
+
+from edge import Edge
+from item import Item
+
+DIRECTIONS = ("N", "E", "S", "O")
+NO_EXIT = -1
+# Attributs d'un passage simple : (coût, sens unique, interdit, verrouillé, objet requis).
+PLAIN = (1, False, False, False, None)
+
+
+class RoomGraph:
+    """
+    Graphe compact des salles d'un monde.
+
+    Attributes:
+        exits (array): Sorties, 4 entiers par salle (N, E, S, O), -1 si aucune.
+
+    Exemple:
+        >>> graph = RoomGraph()
+        >>> a = graph.add_room("A", "dans la salle A.")
+        >>> b = graph.add_room("B", "dans la salle B.")
+        >>> graph.connect(a, "N", b)
+        >>> room = graph.room(a)
+        >>> room.get_exit("N").name
+        'B'
+        >>> room.get_exit_string()
+        'Sorties: N'
+        >>> room.exits
+        {'N': CompactRoom('B'), 'E': None, 'S': None, 'O': None}
+    """
+
+    def __init__(self):
+        self._names = bytearray()
+        self._name_ends = array("I")
+        self.exits = array("i")
+        self._descriptions = array("i")
+        self._palette = []
+        self._palette_index = {}
+        self._images = {}
+        self._passages = {}
+        self._inventories = {}
+        self._weights = {}
+        self._characters = {}
+        self._by_name = None
+
+    def __len__(self):
+        return len(self._name_ends)
+
+    def add_room(self, name, description, image=None):
+        """
+        Ajoute une salle sans sortie.
+
+        Args:
+            name (str): Nom de la salle.
+            description (str): Description (les descriptions identiques sont
+                partagées).
+            image (str, optional): Nom du fichier image.
+
+        Returns:
+            int: L'identifiant de la salle.
+        """
+        room_id = len(self._name_ends)
+        self._names += name.encode()
+        self._name_ends.append(len(self._names))
+        if self._palette_index is None:
+            self._palette_index = {d: i for i, d in enumerate(self._palette)}
+        palette_id = self._palette_index.get(description)
+        if palette_id is None:
+            palette_id = len(self._palette)
+            self._palette.append(description)
+            self._palette_index[description] = palette_id
+        self._descriptions.append(palette_id)
+        self.exits.extend((NO_EXIT, NO_EXIT, NO_EXIT, NO_EXIT))
+        if image is not None:
+            self._images[room_id] = image
+        self._by_name = None
+        return room_id
+
+    def connect(self, room_id, direction, target_id, cost=1, one_way=False,
+                blocked=False, locked=False, requires=None):
+        """
+        Définit la sortie `direction` d'une salle (None pour la supprimer).
+
+        Args:
+            room_id (int): La salle de départ.
+            direction (str): "N", "E", "S" ou "O".
+            target_id (int | None): La salle d'arrivée.
+            cost, one_way, blocked, locked, requires: Les attributs du
+                passage, comme pour `Edge`.
+        """
+        slot = room_id * 4 + DIRECTIONS.index(direction)
+        self.exits[slot] = NO_EXIT if target_id is None else target_id
+        passage = (cost, one_way, blocked, locked, requires)
+        if target_id is None or passage == PLAIN:
+            self._passages.pop(slot, None)
+        else:
+            self._passages[slot] = passage
+
+    def passage(self, room_id, direction):
+        """Retourne les attributs (coût, sens unique, interdit, verrouillé, objet requis) d'une sortie."""
+        return self._passages.get(room_id * 4 + DIRECTIONS.index(direction), PLAIN)
+
+    def exit_id(self, room_id, direction):
+        """Retourne l'identifiant de la salle dans `direction`, ou -1."""
+        return self.exits[room_id * 4 + DIRECTIONS.index(direction)]
+
+    def room(self, room_id):
+        """Retourne une vue `CompactRoom` sur une salle."""
+        return CompactRoom(self, room_id)
+
+    def name(self, room_id):
+        """Retourne le nom d'une salle."""
+        start = self._name_ends[room_id - 1] if room_id else 0
+        return self._names[start:self._name_ends[room_id]].decode()
+
+    def room_by_name(self, name):
+        """Retourne la vue de la salle portant ce nom (index construit à la demande)."""
+        if self._by_name is None:
+            self._by_name = {self.name(i): i for i in range(len(self))}
+        return CompactRoom(self, self._by_name[name])
+
+    def description(self, room_id):
+        """Retourne la description d'une salle."""
+        return self._palette[self._descriptions[room_id]]
+
+    @classmethod
+    def from_compiled(cls, compiled):
+        """
+        Construit le graphe directement depuis un monde compilé (voir
+        `world.compile_world`), sans créer d'objet `Room`.
+
+        Les personnages et les quêtes du monde compilé sont ignorés ; les
+        passages typés gardent tous leurs attributs.
+
+        Args:
+            compiled (tuple): La forme produite par `compile_world`.
+
+        Returns:
+            RoomGraph: Le graphe.
+
+        Examples:
+
+        >>> from world import compile_world, synthetic_world
+        >>> graph = RoomGraph.from_compiled(compile_world(synthetic_world(9)))
+        >>> graph.room(4).get_exit("E").name
+        'Salle 5'
+
+        Un passage verrouillé ou gardé par un objet le reste :
+
+        >>> from player import Player
+        >>> spec = synthetic_world(4)
+        >>> spec["rooms"][0]["exits"]["E"] = {"to": "Salle 1", "requires": "masque"}
+        >>> spec["rooms"][0]["exits"]["S"] = {"to": "Salle 2", "locked": True}
+        >>> graph = RoomGraph.from_compiled(compile_world(spec))
+        >>> player = Player("Test")
+        >>> player.current_room = graph.room(0)
+        >>> player.move("E", describe=False)
+        <BLANKLINE>
+        Il vous faut masque pour passer.
+        <BLANKLINE>
+        False
+        >>> player.move("S", describe=False)
+        <BLANKLINE>
+        Le passage est verrouillé.
+        <BLANKLINE>
+        False
+        >>> graph.room(0).open_exits()
+        []
+        """
+        graph = cls()
+        room_specs = compiled[1]
+        for name, description, image, _, _ in room_specs:
+            graph.add_room(name, description, image)
+        graph._palette_index = None  # reconstruit à la demande par add_room
+        for room_id, (_, _, _, exits, items) in enumerate(room_specs):
+            for direction, target, cost, one_way, blocked, locked, requires in exits:
+                graph.connect(room_id, direction, target, cost, one_way, blocked, locked, requires)
+            if items:
+                graph._inventories[room_id] = {
+                    name: Item(name, description, weight) for name, description, weight in items
+                }
+        return graph
+
+    @classmethod
+    def from_rooms(cls, rooms):
+        """
+        Convertit une liste d'objets `Room` en graphe compact.
+
+        Les inventaires et personnages sont repris ; les personnages sont
+        rattachés aux vues compactes de leurs salles.
+
+        Args:
+            rooms (list): Les salles à convertir.
+
+        Returns:
+            RoomGraph: Le graphe.
+        """
+        graph = cls()
+        index = {}
+        for room in rooms:
+            index[id(room)] = graph.add_room(room.name, room.description, room.image)
+        for room in rooms:
+            room_id = index[id(room)]
+            for direction, edge in room.edges.items():
+                if edge is not None and direction in DIRECTIONS:
+                    graph.connect(room_id, direction, index[id(edge.target)], edge.cost,
+                                  edge.one_way, edge.blocked, edge.locked, edge.requires)
+            if room.inventory:
+                graph._inventories[room_id] = dict(room.inventory)
+            if room.characters:
+                view = graph.room(room_id)
+                graph._characters[room_id] = list(room.characters)
+                for character in room.characters:
+                    character.current_room = view
+        return graph
+
+    @classmethod
+    def grid(cls, rooms, description="une salle du labyrinthe."):
+        """
+        Génère un monde en grille carrée de `rooms` salles reliées N/E/S/O.
+
+        Args:
+            rooms (int): Nombre de salles.
+            description (str): Description commune des salles.
+
+        Returns:
+            RoomGraph: Le graphe.
+
+        Examples:
+
+        >>> graph = RoomGraph.grid(9)
+        >>> graph.room(4).get_exit_string()
+        'Sorties: N, E, S, O'
+        """
+        graph = cls()
+        width = 1
+        while width * width < rooms:
+            width += 1
+        ends = array("I")
+        for i in range(rooms):
+            graph._names += f"Salle {i}".encode()
+            ends.append(len(graph._names))
+        graph._name_ends = ends
+        graph._palette = [description]
+        graph._palette_index = None
+        graph._descriptions = array("i", bytes(4 * rooms))
+        exits = array("i", [NO_EXIT]) * (4 * rooms)
+        for i in range(rooms):
+            x, y = i % width, i // width
+            if y > 0:
+                exits[4 * i] = i - width
+            if x + 1 < width and i + 1 < rooms:
+                exits[4 * i + 1] = i + 1
+            if i + width < rooms:
+                exits[4 * i + 2] = i + width
+            if x > 0:
+                exits[4 * i + 3] = i - 1
+        graph.exits = exits
+        return graph
+
+
+class CompactRoom:
+    """
+    Vue sur une salle d'un `RoomGraph`, compatible avec l'interface de `Room`.
+
+    Deux vues sur la même salle du même graphe sont égales.
+
+    Attributes:
+        graph (RoomGraph): Le graphe.
+        id (int): L'identifiant de la salle.
+    """
+
+    __slots__ = ("graph", "id")
+
+    def __init__(self, graph, room_id):
+        self.graph = graph
+        self.id = room_id
+
+    def __eq__(self, other):
+        return (isinstance(other, CompactRoom)
+                and other.graph is self.graph and other.id == self.id)
+
+    def __hash__(self):
+        return hash((id(self.graph), self.id))
+
+    def __repr__(self):
+        return f"CompactRoom({self.name!r})"
+
+    @property
+    def name(self):
+        """Nom de la salle."""
+        return self.graph.name(self.id)
+
+    @property
+    def description(self):
+        """Description de la salle."""
+        return self.graph.description(self.id)
+
+    @property
+    def image(self):
+        """Fichier image de la salle, ou None."""
+        return self.graph._images.get(self.id)
+
+    @property
+    def exits(self):
+        """Dictionnaire des sorties, construit à la demande (comme `Room.exits` : None si interdite)."""
+        return {
+            direction: None if edge is None or edge.blocked else edge.target
+            for direction, edge in self.edges.items()
+        }
+
+    @property
+    def edges(self):
+        """Table des passages direction -> `Edge`, construite à la demande (comme `Room.edges`)."""
+        graph = self.graph
+        base = self.id * 4
+        edges = {}
+        for i, direction in enumerate(DIRECTIONS):
+            target = graph.exits[base + i]
+            if target == NO_EXIT:
+                edges[direction] = None
+            else:
+                edges[direction] = Edge(CompactRoom(graph, target), *graph._passages.get(base + i, PLAIN))
+        return edges
+
+    def exit_tuples(self):
+        """Retourne les couples (direction, `Edge`) des passages visibles (non interdits)."""
+        return tuple(
+            (direction, edge) for direction, edge in self.edges.items()
+            if edge is not None and not edge.blocked
+        )
+
+    def open_exits(self):
+        """Retourne les salles voisines accessibles sans condition (utilisé par les PNJ)."""
+        return [edge.target for _, edge in self.exit_tuples() if edge.free]
+
+    @property
+    def inventory(self):
+        """Inventaire de la salle (alloué à la première utilisation)."""
+        return self.graph._inventories.setdefault(self.id, {})
+
+    @property
+    def characters(self):
+        """Personnages présents (liste allouée à la première utilisation)."""
+        return self.graph._characters.setdefault(self.id, [])
+
+    @characters.setter
+    def characters(self, characters):
+        self.graph._characters[self.id] = characters
+
+    @property
+    def current_weight(self):
+        """Poids des objets posés dans la salle."""
+        return self.graph._weights.get(self.id, 0)
+
+    @current_weight.setter
+    def current_weight(self, weight):
+        self.graph._weights[self.id] = weight
+
+    def get_exit(self, direction):
+        """
+        Retourne la salle reliée par la sortie `direction`.
+
+        Returns:
+            CompactRoom | None | str: Comme `Room.get_exit`.
+        """
+        if direction not in DIRECTIONS:
+            return "passage interdit"
+        target = self.graph.exit_id(self.id, direction)
+        if target == NO_EXIT:
+            return None
+        if self.graph.passage(self.id, direction)[2]:
+            return "passage interdit"
+        return CompactRoom(self.graph, target)
+
+    def get_exit_string(self):
+        """
+        Retourne une chaîne décrivant les sorties disponibles, identique à celle de `Room`.
+
+        Examples:
+
+        >>> from room import Room
+        >>> graph = RoomGraph()
+        >>> dead_end = graph.room(graph.add_room("Impasse", "dans une impasse."))
+        >>> dead_end.get_exit_string(), Room("Impasse", "dans une impasse.").get_exit_string()
+        ('Sorties:', 'Sorties:')
+        """
+        graph = self.graph
+        base = self.id * 4
+        available = [
+            d for i, d in enumerate(DIRECTIONS)
+            if graph.exits[base + i] != NO_EXIT and not graph._passages.get(base + i, PLAIN)[2]
+        ]
+        return "Sorties: " + ", ".join(available) if available else "Sorties:"
+
+    def get_long_description(self):
+        """Retourne la description complète de la salle, incluant les sorties."""
+        return f"\nVous êtes {self.description}\n\n{self.get_exit_string()}\n"
+
+    def get_inventory(self):
+        """Retourne une chaîne décrivant les objets présents dans la salle."""
+        inventory = self.graph._inventories.get(self.id)
+        if not inventory:
+            return "\n Pas d'objet à proximité"
+
+        text = " Objet(s) à proximité : \n"
+        for item in inventory.values():
+            text += f"\t - {item.name} : {item.description} ({item.weight} kg)\n"
+        text += f"\nVotre sac pèse {self.current_weight} kg\n"
+        return text
+
+    def get_characters(self):
+        """Retourne une chaîne listant les personnages présents dans la salle."""
+        characters = self.graph._characters.get(self.id)
+        if not characters:
+            return ""
+
+        text = "\nPersonnage(s) présent(s) : \n"
+        for character in characters:
+            text += f"\t - {character}\n"
+        return text
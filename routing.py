@@ -0,0 +1,181 @@
+"""Module contenant le calcul d'itinéraires entre les salles.
+
+`Router` répond à la question « quelle sortie prendre depuis la salle A pour
+aller au plus court vers la salle B ? ». Les réponses sont rangées dans des
+tables de prochain saut : pour chaque destination, un tableau d'octets donne,
+pour chaque salle de départ, la direction à prendre (0 si la destination est
+inaccessible ou si l'on y est déjà).
+
+Les tables sont construites à partir des passages typés des salles
+(`Room.exit_tuples()`, mis en cache par chaque salle) : les passages interdits ou verrouillés sont ignorés, ceux qui
+exigent un objet ne sont empruntés que si cet objet fait partie des `keys`
+du routeur, et le coût de traversée de chaque passage est pris en compte.
+
+La table d'une destination est calculée par un parcours (algorithme de
+Dijkstra) du graphe inversé des passages, au premier itinéraire qui la
+demande, puis conservée : l'ensemble des tables n'est donc calculé qu'une
+fois par version du monde (`World.version`). En cas d'égalité, la première
+direction dans l'ordre N, E, S, O est préférée, ce qui rend les itinéraires
+déterministes.
+"""
+
+import heapq
+
+DIRECTIONS = ("N", "E", "S", "O")
+
+
+class Router:
+    """
+    Tables de prochain saut (plus courts chemins) d'un ensemble de salles.
+
+    Attributes:
+        rooms (list): Les salles, indexées de 0 à R-1.
+        version (int): Version du monde pour laquelle les tables sont valides.
+        keys (frozenset): Objets possédés, qui ouvrent les passages les exigeant.
+
+    Exemple:
+        >>> from world import load_world
+        >>> world = load_world()
+        >>> router = Router(world.rooms)
+        >>> eldregrove = world.rooms_by_name["Eldregrove"]
+        >>> verdenfall = world.rooms_by_name["Verdenfall"]
+        >>> [room.name for room in router.path(eldregrove, verdenfall)]
+        ['Brunnhold', 'Dornhollow', 'Stonebridge', 'Mireval', 'Sangrun', 'Verdenfall']
+        >>> router.route(eldregrove, verdenfall)
+        ['N', 'N', 'N', 'N', 'E', 'N']
+    """
+
+    def __init__(self, rooms, version=0, keys=frozenset()):
+        """
+        Prépare le graphe des sorties (les tables sont calculées à la demande).
+
+        Args:
+            rooms (list): Les salles du monde.
+            version (int): Version du monde correspondante.
+            keys (frozenset): Objets possédés par le voyageur.
+        """
+        self.rooms = list(rooms)
+        self.version = version
+        self.keys = keys
+        self._index = {id(room): i for i, room in enumerate(self.rooms)}
+        self._by_name = {room.name.lower(): room for room in self.rooms}
+
+        # Passages praticables de chaque salle : (indice de direction, salle
+        # voisine, coût), et graphe inversé pour les parcours depuis une
+        # destination.
+        self._exits = []
+        self._predecessors = [[] for _ in self.rooms]
+        for i, room in enumerate(self.rooms):
+            exits = []
+            for direction, edge in room.exit_tuples():
+                target = self._index.get(id(edge.target))
+                if direction in DIRECTIONS and target is not None and edge.passable(keys):
+                    exits.append((DIRECTIONS.index(direction), target, edge.cost))
+                    self._predecessors[target].append((i, edge.cost))
+            self._exits.append(tuple(sorted(exits)))
+
+        self._tables = {}
+
+    def room_named(self, name):
+        """Retourne la salle portant ce nom (sans tenir compte de la casse), ou None."""
+        return self._by_name.get(name.lower())
+
+    def table(self, destination):
+        """
+        Retourne la table de prochain saut vers une destination.
+
+        Args:
+            destination (int): Indice de la salle de destination.
+
+        Returns:
+            bytes: Pour chaque salle de départ, 1 + l'indice de la direction à
+                prendre dans `DIRECTIONS`, ou 0.
+        """
+        table = self._tables.get(destination)
+        if table is not None:
+            return table
+
+        unreachable = float("inf")
+        distance = [unreachable] * len(self.rooms)
+        distance[destination] = 0
+        heap = [(0, destination)]
+        while heap:
+            dist, current = heapq.heappop(heap)
+            if dist > distance[current]:
+                continue
+            for previous, cost in self._predecessors[current]:
+                if dist + cost < distance[previous]:
+                    distance[previous] = dist + cost
+                    heapq.heappush(heap, (dist + cost, previous))
+
+        hops = bytearray(len(self.rooms))
+        for i, exits in enumerate(self._exits):
+            if 0 < distance[i] < unreachable:
+                for d, target, cost in exits:
+                    if distance[target] + cost == distance[i]:
+                        hops[i] = d + 1
+                        break
+
+        table = self._tables[destination] = bytes(hops)
+        return table
+
+    def precompute(self):
+        """Calcule les tables de toutes les destinations."""
+        for destination in range(len(self.rooms)):
+            self.table(destination)
+
+    def next_hop(self, source, destination):
+        """
+        Retourne la direction à prendre depuis `source` vers `destination`.
+
+        Args:
+            source (Room): La salle de départ.
+            destination (Room): La salle d'arrivée.
+
+        Returns:
+            str | None: La direction, ou None si la destination est
+                inaccessible ou si l'on y est déjà.
+        """
+        hop = self.table(self._index[id(destination)])[self._index[id(source)]]
+        return DIRECTIONS[hop - 1] if hop else None
+
+    def route(self, source, destination):
+        """
+        Retourne la suite de directions du plus court chemin.
+
+        Args:
+            source (Room): La salle de départ.
+            destination (Room): La salle d'arrivée.
+
+        Returns:
+            list | None: Les directions à prendre (vide si l'on est déjà
+                arrivé), ou None si la destination est inaccessible.
+        """
+        target = self._index[id(destination)]
+        table = self.table(target)
+        current = self._index[id(source)]
+        directions = []
+        while current != target:
+            hop = table[current]
+            if not hop:
+                return None
+            directions.append(DIRECTIONS[hop - 1])
+            current = self._index[id(self.rooms[current].edges[DIRECTIONS[hop - 1]].target)]
+        return directions
+
+    def path(self, source, destination):
+        """
+        Retourne les salles traversées par le plus court chemin (départ exclu).
+
+        Returns:
+            list | None: Les salles, ou None si la destination est inaccessible.
+        """
+        directions = self.route(source, destination)
+        if directions is None:
+            return None
+        rooms = []
+        room = source
+        for direction in directions:
+            room = room.edges[direction].target
+            rooms.append(room)
+        return rooms
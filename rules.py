@@ -0,0 +1,263 @@
+"""Module contenant le moteur de règles de fin de partie.
+
+Les conditions de victoire et de défaite sont déclarées dans le fichier du
+monde (section "rules"), par exemple « toutes les quêtes terminées ET poison
+utilisé à Verdenfall ». Plutôt que de réévaluer ces conditions après chaque
+commande (en parcourant toutes les quêtes), le moteur les met à jour au fil
+des événements de la partie :
+
+  - "quest_completed" : une quête vient d'être terminée ;
+  - "item_used" : un objet vient d'être utilisé dans une salle.
+
+Chaque condition élémentaire s'abonne aux événements qui la concernent et
+tient un compteur ; les conjonctions comptent leurs sous-conditions encore
+fausses. Le coût d'un événement ne dépend donc pas du nombre de quêtes. Les
+conditions sont monotones : une fois vraie, une condition le reste.
+"""
+
+WIN = "win"
+LOSE = "lose"
+
+
+class Condition:
+    """
+    Condition de fin de partie, mise à jour par les événements.
+
+    Attributes:
+        satisfied (bool): True dès que la condition est remplie.
+        parent (Condition | None): La conjonction ou disjonction englobante.
+        events (tuple): Événements écoutés par une condition élémentaire.
+    """
+
+    events = ()
+
+    def __init__(self):
+        self.satisfied = False
+        self.parent = None
+
+    def leaves(self):
+        """Retourne les conditions élémentaires qui composent cette condition."""
+        return [self]
+
+    def handle(self, **data):
+        """Traite un événement écouté (conditions élémentaires uniquement)."""
+
+    def _satisfy(self):
+        """Marque la condition remplie et prévient la condition englobante."""
+        if not self.satisfied:
+            self.satisfied = True
+            if self.parent is not None:
+                self.parent.child_satisfied()
+
+
+class QuestsCompleted(Condition):
+    """
+    Toutes les quêtes sont terminées.
+
+    Attributes:
+        remaining (int): Nombre de quêtes encore à terminer.
+    """
+
+    events = ("quest_completed",)
+
+    def __init__(self, remaining):
+        super().__init__()
+        self.remaining = remaining
+        if remaining <= 0:
+            self.satisfied = True
+
+    def handle(self, **data):
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self._satisfy()
+
+
+class ItemUsed(Condition):
+    """
+    Un objet a été utilisé, éventuellement dans une salle précise.
+
+    Attributes:
+        item (str): Le nom de l'objet.
+        room (str | None): Le nom de la salle, ou None pour n'importe laquelle.
+    """
+
+    events = ("item_used",)
+
+    def __init__(self, item, room=None):
+        super().__init__()
+        self.item = item
+        self.room = room
+
+    def handle(self, item=None, room=None, **data):
+        if item == self.item and (self.room is None or room == self.room):
+            self._satisfy()
+
+
+class AllOf(Condition):
+    """Conjonction : vraie quand toutes les sous-conditions le sont."""
+
+    def __init__(self, children):
+        super().__init__()
+        self.children = list(children)
+        self.remaining = 0
+        for child in self.children:
+            child.parent = self
+            if not child.satisfied:
+                self.remaining += 1
+        self.satisfied = self.remaining == 0
+
+    def leaves(self):
+        return [leaf for child in self.children for leaf in child.leaves()]
+
+    def child_satisfied(self):
+        """Une sous-condition vient d'être remplie."""
+        self.remaining -= 1
+        if self.remaining == 0:
+            self._satisfy()
+
+
+class AnyOf(Condition):
+    """Disjonction : vraie dès qu'une sous-condition l'est."""
+
+    def __init__(self, children):
+        super().__init__()
+        self.children = list(children)
+        for child in self.children:
+            child.parent = self
+        self.satisfied = any(child.satisfied for child in self.children)
+
+    def leaves(self):
+        return [leaf for child in self.children for leaf in child.leaves()]
+
+    def child_satisfied(self):
+        """Une sous-condition vient d'être remplie."""
+        self._satisfy()
+
+
+class Rule:
+    """
+    Règle de fin de partie.
+
+    Attributes:
+        outcome (str): `WIN` ou `LOSE`.
+        condition (Condition): La condition qui déclenche la règle.
+        message (str): Le message affiché quand la règle s'applique.
+    """
+
+    def __init__(self, outcome, condition, message):
+        self.outcome = outcome
+        self.condition = condition
+        self.message = message
+
+
+def build_condition(spec, quests_remaining):
+    """
+    Construit une condition à partir de sa forme compilée.
+
+    Args:
+        spec (tuple): ("all", enfants), ("any", enfants),
+            ("quests_completed",) ou ("used", objet, salle).
+        quests_remaining (int): Nombre de quêtes encore à terminer.
+
+    Returns:
+        Condition: La condition.
+    """
+    kind = spec[0]
+    if kind == "all":
+        return AllOf(build_condition(child, quests_remaining) for child in spec[1])
+    if kind == "any":
+        return AnyOf(build_condition(child, quests_remaining) for child in spec[1])
+    if kind == "quests_completed":
+        return QuestsCompleted(quests_remaining)
+    if kind == "used":
+        return ItemUsed(spec[1], spec[2])
+    raise ValueError(f"Condition inconnue {spec!r}")
+
+
+class RuleEngine:
+    """
+    Évalue incrémentalement les règles de fin de partie.
+
+    Les règles sont consultées dans l'ordre : si plusieurs deviennent vraies
+    lors du même événement, la première l'emporte (la victoire est donc
+    déclarée avant la défaite).
+
+    Attributes:
+        rules (list): Les règles, par ordre de priorité.
+        outcome (str | None): Le résultat de la partie, une fois décidé.
+        message (str | None): Le message de la règle appliquée.
+        items (frozenset): Objets dont l'utilisation intéresse une règle.
+
+    Exemple:
+        >>> engine = RuleEngine.from_compiled((
+        ...     ("win", ("all", (("quests_completed",), ("used", "poison", "Verdenfall"))), "Gagné"),
+        ...     ("lose", ("used", "poison", None), "Perdu"),
+        ... ), quests_remaining=2)
+        >>> engine.quest_completed(None)
+        >>> engine.item_used("poison", "Sangrun")
+        >>> engine.outcome, engine.message
+        ('lose', 'Perdu')
+    """
+
+    def __init__(self, rules=()):
+        self.rules = list(rules)
+        self.outcome = None
+        self.message = None
+        self._listeners = {}
+        items = set()
+        for rule in self.rules:
+            for leaf in rule.condition.leaves():
+                for event in leaf.events:
+                    self._listeners.setdefault(event, []).append(leaf)
+                if isinstance(leaf, ItemUsed):
+                    items.add(leaf.item)
+        self.items = frozenset(items)
+        self._decide()
+
+    @classmethod
+    def from_compiled(cls, rules, quests_remaining):
+        """
+        Crée le moteur à partir des règles compilées d'un monde.
+
+        Args:
+            rules (tuple): Triplets (résultat, condition compilée, message).
+            quests_remaining (int): Nombre de quêtes encore à terminer.
+
+        Returns:
+            RuleEngine: Le moteur.
+        """
+        return cls(
+            Rule(outcome, build_condition(condition, quests_remaining), message)
+            for outcome, condition, message in rules
+        )
+
+    def emit(self, event, **data):
+        """
+        Transmet un événement aux conditions qui l'écoutent.
+
+        Args:
+            event (str): Le nom de l'événement.
+            **data: Les détails de l'événement.
+        """
+        for leaf in self._listeners.get(event, ()):
+            if not leaf.satisfied:
+                leaf.handle(**data)
+        self._decide()
+
+    def quest_completed(self, quest):
+        """Événement : une quête vient d'être terminée."""
+        self.emit("quest_completed", quest=quest)
+
+    def item_used(self, item, room):
+        """Événement : l'objet `item` vient d'être utilisé dans la salle `room`."""
+        self.emit("item_used", item=item, room=room)
+
+    def _decide(self):
+        """Fixe le résultat de la partie dès qu'une règle est remplie."""
+        if self.outcome is not None:
+            return
+        for rule in self.rules:
+            if rule.condition.satisfied:
+                self.outcome = rule.outcome
+                self.message = rule.message
+                return
@@ -0,0 +1,355 @@
+"""Module contenant un simulateur de parties (méthode de Monte-Carlo).
+
+Le simulateur joue, sans clavier ni interface graphique, un grand nombre de
+parties de `Game` réparties sur tous les cœurs avec un `ProcessPoolExecutor`.
+Chaque partie a sa propre graine (`Game(seed=...)`) et est conduite par une
+politique :
+
+  - `RandomPolicy` : commandes tirées au hasard parmi celles qui ont un sens
+    dans la salle courante (sorties, objets, PNJ, objets de l'inventaire) ;
+  - `ScriptPolicy` : une liste de commandes fixe (le plan du module
+    `solver` se joue, lui, avec `solver.PlanPolicy`, qui va chercher les
+    PNJ qui se sont déplacés).
+
+Les parties sont regroupées en lots ; chaque processus prépare une seule
+fois un modèle de partie (`Game.setup`) puis joue chaque partie sur un
+clone. Les statistiques d'un lot (`Stats`) remontent dès qu'il est terminé
+et sont fusionnées au fil de l'eau : `simulate` est un générateur, ce qui
+permet de suivre une longue campagne et de l'interrompre à tout moment.
+
+    python simulator.py --runs 100000 --workers 8
+"""
+
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from output import NullSink
+from rules import LOSE, WIN
+from world import DEFAULT_WORLD
+
+
+class RandomPolicy:
+    """
+    Politique aléatoire : active toutes les quêtes, puis joue au hasard.
+
+    Les commandes candidates sont celles qui ont un effet possible dans la
+    salle courante : `go` vers une sortie visible, `take` d'un objet présent,
+    `talk` à un PNJ présent, `use` d'un objet de l'inventaire.
+
+    Exemple:
+        >>> from game import Game
+        >>> game = Game(output=NullSink(), seed=1)
+        >>> game.setup("Sim")
+        >>> policy = RandomPolicy()
+        >>> policy(game, random.Random(1))
+        'activate Grand Voyageur'
+    """
+
+    def __call__(self, game, rng):
+        """
+        Choisit la prochaine commande.
+
+        Args:
+            game (Game): La partie en cours.
+            rng (random.Random): Le générateur de la politique.
+
+        Returns:
+            str | None: La commande, ou None pour abandonner la partie.
+        """
+        for quest in game.player.quest_manager.quests:
+            if not quest.is_active and not quest.is_completed:
+                return f"activate {quest.title}"
+        player = game.player
+        room = player.current_room
+        candidates = [f"go {direction}" for direction, _ in room.exit_tuples()]
+        candidates.extend(f"take {name}" for name in room.inventory)
+        candidates.extend(f"talk {character.name}" for character in room.characters)
+        candidates.extend(f"use {name}" for name in player.inventory)
+        if not candidates:
+            return None
+        return rng.choice(candidates)
+
+
+class ScriptPolicy:
+    """
+    Politique scriptée : joue une liste de commandes fixe, puis abandonne.
+
+    Attributes:
+        commands (list): Les commandes à jouer.
+    """
+
+    def __init__(self, commands):
+        self.commands = list(commands)
+
+    def __call__(self, game, rng):
+        """Retourne la commande suivante du script (None une fois le script épuisé)."""
+        index = len(game.command_log)
+        return self.commands[index] if index < len(self.commands) else None
+
+
+class Stats:
+    """
+    Statistiques agrégées d'un ensemble de parties.
+
+    Deux `Stats` se fusionnent avec `merge`, ce qui permet d'agréger les
+    résultats des lots au fur et à mesure de leur arrivée.
+
+    Attributes:
+        runs (int): Nombre de parties jouées.
+        wins (int): Nombre de victoires.
+        losses (int): Nombre de défaites.
+        win_commands (Counter): Nombre de commandes des parties gagnées ->
+            nombre de parties.
+        quest_orders (Counter): Ordre de complétion des quêtes (tuple de
+            titres) -> nombre de parties.
+        rooms_reached (Counter): Salle -> nombre de parties qui l'ont atteinte.
+        all_rooms (tuple): Toutes les salles du monde.
+        elapsed (float): Temps de calcul cumulé des parties (secondes).
+
+    Exemple:
+        >>> a, b = Stats(("A", "B")), Stats(("A", "B"))
+        >>> a.add(WIN, 12, ("Q1",), {"A"})
+        >>> b.add(None, 200, (), {"A"})
+        >>> a.merge(b).win_rate, a.never_reached()
+        (0.5, ['B'])
+    """
+
+    def __init__(self, all_rooms=()):
+        self.runs = 0
+        self.wins = 0
+        self.losses = 0
+        self.win_commands = Counter()
+        self.quest_orders = Counter()
+        self.rooms_reached = Counter()
+        self.all_rooms = tuple(all_rooms)
+        self.elapsed = 0.0
+
+    def add(self, outcome, commands, quest_order, rooms):
+        """
+        Enregistre le résultat d'une partie.
+
+        Args:
+            outcome (str | None): `WIN`, `LOSE` ou None (partie abandonnée).
+            commands (int): Nombre de commandes jouées.
+            quest_order (tuple): Titres des quêtes, dans l'ordre de complétion.
+            rooms (set): Noms des salles atteintes.
+        """
+        self.runs += 1
+        if outcome == WIN:
+            self.wins += 1
+            self.win_commands[commands] += 1
+        elif outcome == LOSE:
+            self.losses += 1
+        self.quest_orders[quest_order] += 1
+        self.rooms_reached.update(rooms)
+
+    def merge(self, other):
+        """Ajoute les statistiques `other` à celles-ci et retourne self."""
+        self.runs += other.runs
+        self.wins += other.wins
+        self.losses += other.losses
+        self.win_commands.update(other.win_commands)
+        self.quest_orders.update(other.quest_orders)
+        self.rooms_reached.update(other.rooms_reached)
+        self.all_rooms = self.all_rooms or other.all_rooms
+        self.elapsed += other.elapsed
+        return self
+
+    @property
+    def win_rate(self):
+        """Proportion de parties gagnées."""
+        return self.wins / self.runs if self.runs else 0.0
+
+    def mean_commands_to_win(self):
+        """Nombre moyen de commandes des parties gagnées (None sans victoire)."""
+        if not self.wins:
+            return None
+        return sum(n * k for n, k in self.win_commands.items()) / self.wins
+
+    def never_reached(self):
+        """Salles qu'aucune partie n'a atteintes."""
+        return [name for name in self.all_rooms if name not in self.rooms_reached]
+
+    def summary(self):
+        """Retourne un résumé lisible des statistiques."""
+        mean = self.mean_commands_to_win()
+        lines = [
+            f"{self.runs} parties : {self.wins} victoires ({self.win_rate:.2%}), {self.losses} défaites",
+            f"commandes pour gagner : moyenne {mean:.1f}, min {min(self.win_commands)}"
+            if mean is not None else "commandes pour gagner : aucune victoire",
+        ]
+        for order, runs in self.quest_orders.most_common(3):
+            lines.append(f"  {runs:>8} × {' → '.join(order) or '(aucune quête terminée)'}")
+        lines.append(f"salles jamais atteintes : {', '.join(self.never_reached()) or 'aucune'}")
+        return "\n".join(lines)
+
+
+# Modèle de partie propre à chaque processus, préparé une seule fois.
+_TEMPLATES = {}
+
+
+def _template(world_path):
+    """Retourne le modèle de partie du processus courant pour ce monde."""
+    template = _TEMPLATES.get(world_path)
+    if template is None:
+        from game import Game
+
+        template = Game(world_path, NullSink(), seed=0)
+        template.setup(player_name="Simulation")
+        _TEMPLATES[world_path] = template
+    return template
+
+
+def play_once(template, policy, seed, max_commands):
+    """
+    Joue une partie complète sur un clone du modèle.
+
+    Args:
+        template (Game): Le modèle configuré.
+        policy: La politique (appelable `policy(game, rng)`).
+        seed (int): La graine de la partie (PNJ et politique).
+        max_commands (int): Nombre maximal de commandes avant abandon.
+
+    Returns:
+        tuple: (issue, nombre de commandes, ordre des quêtes, salles atteintes).
+    """
+    game = template.clone("Simulation", NullSink(), seed)
+    rng = random.Random(f"policy-{seed}")
+    manager = game.player.quest_manager
+    order = []
+    notify = manager.on_quest_completed
+
+    def record(quest):
+        order.append(quest.title)
+        notify(quest)
+
+    manager.on_quest_completed = record
+    rooms = {game.player.current_room.name}
+    while not game.finished and len(game.command_log) < max_commands:
+        command = policy(game, rng)
+        if command is None:
+            break
+        game.process_command(command)
+        rooms.add(game.player.current_room.name)
+    return game.rules.outcome, len(game.command_log), tuple(order), rooms
+
+
+def run_batch(world_path, policy, seeds, max_commands):
+    """
+    Joue un lot de parties dans le processus courant.
+
+    Args:
+        world_path (str): Le fichier du monde.
+        policy: La politique (doit pouvoir être envoyée à un autre processus).
+        seeds (range): Les graines des parties du lot.
+        max_commands (int): Nombre maximal de commandes par partie.
+
+    Returns:
+        Stats: Les statistiques du lot.
+    """
+    template = _template(world_path)
+    stats = Stats(room.name for room in template.rooms)
+    start = time.perf_counter()
+    for seed in seeds:
+        stats.add(*play_once(template, policy, seed, max_commands))
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def simulate(runs, policy=None, world_path=DEFAULT_WORLD, workers=None,
+             batch_size=500, max_commands=300, seed=0):
+    """
+    Joue `runs` parties sur un pool de processus et diffuse les statistiques.
+
+    Le générateur produit, à chaque lot terminé, les statistiques cumulées
+    depuis le début. Quitter la boucle de l'appelant (ou l'interrompre)
+    annule les lots qui n'ont pas commencé.
+
+    Args:
+        runs (int): Nombre de parties.
+        policy (optional): La politique ; `RandomPolicy()` par défaut.
+        world_path (str): Le fichier du monde.
+        workers (int, optional): Nombre de processus (tous les cœurs par défaut).
+        batch_size (int): Nombre de parties par lot.
+        max_commands (int): Nombre maximal de commandes par partie.
+        seed (int): Graine de la première partie ; la partie i utilise seed + i.
+
+    Yields:
+        Stats: Les statistiques cumulées.
+
+    Examples:
+
+    >>> stats = None
+    >>> for stats in simulate(4, workers=1, batch_size=2, max_commands=30):
+    ...     pass
+    >>> stats.runs, len(stats.all_rooms)
+    (4, 11)
+    """
+    policy = policy if policy is not None else RandomPolicy()
+    world_path = str(world_path)
+    total = Stats()
+    # Quelques lots d'avance par processus : assez pour occuper les cœurs,
+    # sans soumettre d'un coup des millions de tâches.
+    workers = workers or os.cpu_count() or 1
+    batches = (range(seed + i, seed + min(i + batch_size, runs)) for i in range(0, runs, batch_size))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        try:
+            for seeds in batches:
+                pending.add(executor.submit(run_batch, world_path, policy, seeds, max_commands))
+                if len(pending) < 2 * workers:
+                    continue
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield total.merge(future.result())
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield total.merge(future.result())
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def main(argv=None):
+    """Point d'entrée : `python simulator.py [--runs N] [--workers N] [--solver]`."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-commands", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--world", default=str(DEFAULT_WORLD))
+    parser.add_argument("--solver", action="store_true",
+                        help="jouer le plan du solveur au lieu de commandes aléatoires")
+    args = parser.parse_args(argv)
+
+    policy = RandomPolicy()
+    if args.solver:
+        from solver import PlanPolicy, solve
+        from world import load_world
+
+        policy = PlanPolicy(solve(load_world(args.world)).commands or ())
+
+    start = time.perf_counter()
+    stats = Stats()
+    try:
+        for stats in simulate(args.runs, policy, args.world, args.workers,
+                              args.batch_size, args.max_commands, args.seed):
+            rate = stats.runs / (time.perf_counter() - start)
+            print(f"\r{stats.runs}/{args.runs} parties, {stats.win_rate:.2%} de victoires, "
+                  f"{rate:.0f} parties/s", end="", flush=True)
+    except KeyboardInterrupt:
+        print("\nInterrompu.")
+    print()
+    print(stats.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,788 @@
+"""Module contenant un solveur qui vérifie qu'un monde peut être gagné.
+
+Le solveur rejoue la sémantique des actions (`go`, `take`, `talk`, `use`,
+`activate`) sur un modèle abstrait du monde, où l'état d'une partie est un
+simple entier :
+
+    salle | objets utiles << a | objectifs atteints << b | compteurs << c | objets utilisés << d
+
+  - la salle est un indice ;
+  - les objets utiles (objets à prendre pour un objectif, objets exigés par
+    un passage, objets cités par une règle) forment un ensemble de bits ;
+  - chaque objectif de visite ou d'action est un bit ;
+  - les compteurs (« Se déplacer 10 fois »...) sont plafonnés au plus grand
+    seuil utile, ce qui les réduit à quelques bits ;
+  - chaque condition « objet utilisé » des règles est un bit.
+
+La recherche se fait en trois temps :
+
+1. Une relaxation monotone (on ignore la position du joueur et les passages
+   à sens unique) : si même ainsi un objectif ou la règle de victoire est
+   hors d'atteinte, le monde est prouvé impossible à gagner.
+2. Une recherche exacte du plus court plan (en nombre de commandes), avec
+   mémoïsation des états déjà vus, dans la limite de `max_states` états. Si
+   l'espace d'états est épuisé sans victoire, le monde est prouvé
+   impossible à gagner (culs-de-sac compris).
+3. Sur les très grands mondes, si la limite est atteinte : construction
+   gloutonne d'un plan gagnant (aller au plus proche lieu utile), valide
+   mais pas nécessairement le plus court.
+
+Hypothèses du modèle : toutes les quêtes sont activées en début de partie ;
+les PNJ restent dans leur salle de départ ; `back`, `drop` et les commandes
+sans effet sur l'état ne sont pas utilisés. Sans règle de victoire dans le
+monde, le but est de terminer toutes les quêtes.
+
+Dans le jeu, les PNJ se déplacent au hasard : rejoué tel quel, un plan ne
+gagne que si chaque PNJ se trouve encore dans sa salle de départ au moment
+où le plan lui parle. « Optimal » s'entend donc dans le modèle. Pour jouer
+un plan dans une vraie partie, `PlanPolicy` va chercher les PNJ absents
+(détour puis retour) ; le plan gagne alors quelle que soit la graine, au
+prix de quelques commandes de plus.
+"""
+
+import heapq
+import random
+from collections import deque
+from itertools import count
+
+from player import MOVE_COUNTER, TAKE_COUNTER, TALK_COUNTER
+from rules import LOSE, WIN
+
+WINNABLE = "winnable"
+UNWINNABLE = "unwinnable"
+UNKNOWN = "unknown"
+
+
+class Solution:
+    """
+    Résultat du solveur.
+
+    Attributes:
+        status (str): `WINNABLE`, `UNWINNABLE` ou `UNKNOWN`.
+        commands (list | None): Les commandes d'un plan gagnant.
+        optimal (bool): True si le plan est le plus court possible dans le
+            modèle (PNJ immobiles).
+        reason (str | None): Pourquoi le monde est impossible à gagner (ou
+            pourquoi le solveur n'a pas conclu).
+        explored (int): Nombre d'états explorés par la recherche exacte.
+    """
+
+    def __init__(self, status, commands=None, optimal=False, reason=None, explored=0):
+        self.status = status
+        self.commands = commands
+        self.optimal = optimal
+        self.reason = reason
+        self.explored = explored
+
+    def __repr__(self):
+        if self.status == WINNABLE:
+            kind = "optimal si les PNJ restent en place" if self.optimal else "glouton"
+            return f"Solution(winnable, {len(self.commands)} commandes, {kind})"
+        return f"Solution({self.status}, {self.reason!r})"
+
+
+class WorldModel:
+    """
+    Modèle abstrait d'un monde, où chaque état de partie est un entier.
+
+    Attributes:
+        names (list): Nom de chaque salle.
+        start (int): Indice de la salle de départ.
+        activations (list): Commandes d'activation des quêtes.
+        items (list): Noms des objets utiles (un bit chacun).
+    """
+
+    def __init__(self, world):
+        """
+        Construit les tables du modèle.
+
+        Args:
+            world (World): Le monde à analyser.
+        """
+        rooms = world.rooms
+        index = {id(room): i for i, room in enumerate(rooms)}
+        self.names = [room.name for room in rooms]
+        self.room_index = {name: i for i, name in enumerate(self.names)}
+        self.start = index[id(world.start)]
+        self.activations = [f"activate {quest.title}" for quest in world.quests]
+
+        # Objectifs : un bit par clé distincte ; compteurs du joueur : seuil
+        # maximal (aucune action n'incrémente un autre compteur).
+        keys = {}
+        self.counter_caps = {}
+        self.unsupported = []
+        for quest in world.quests:
+            for objective in quest.objectives:
+                if objective.kind == "counter" and objective.verb in (MOVE_COUNTER, TAKE_COUNTER, TALK_COUNTER):
+                    cap = max(self.counter_caps.get(objective.verb, 0), objective.count)
+                    self.counter_caps[objective.verb] = cap
+                elif objective.kind == "room" or objective.verb in ("prendre", "parler"):
+                    keys.setdefault(objective.key, len(keys))
+                else:
+                    self.unsupported.append(objective.text)
+        self.all_objectives = (1 << len(keys)) - 1
+
+        # Conditions « objet utilisé » des règles : un bit chacune.
+        self.used_leaves = []
+        for _, condition, _ in world.rules:
+            self._collect_leaves(condition)
+
+        # Objets utiles.
+        item_names = set()
+        for room in rooms:
+            for edge in room.edges.values():
+                if edge is not None and edge.requires is not None:
+                    item_names.add(edge.requires)
+        item_names.update(item for item, _ in self.used_leaves)
+        item_names.update(key[2] for key in keys if key[:2] == ("action", "prendre"))
+        if TAKE_COUNTER in self.counter_caps:
+            item_names.update(name for room in rooms for name in room.inventory)
+        self.items = sorted(item_names)
+        item_bit = {name: 1 << i for i, name in enumerate(self.items)}
+
+        # Agencement des champs de l'entier d'état.
+        self.room_bits = max(1, (len(rooms) - 1).bit_length())
+        self.inv_shift = self.room_bits
+        self.obj_shift = self.inv_shift + len(self.items)
+        self.counter_fields = {}
+        shift = self.obj_shift + len(keys)
+        for name, cap in sorted(self.counter_caps.items()):
+            self.counter_fields[name] = (shift, cap)
+            shift += cap.bit_length()
+        self.counter_shift = self.obj_shift + len(keys)
+        self.used_shift = shift
+        self.room_mask = (1 << self.room_bits) - 1
+        leaves = iter(range(len(self.used_leaves)))
+        self.rules = [(outcome, self._compile(condition, leaves)) for outcome, condition, _ in world.rules]
+        self.goal_rule = any(outcome == WIN for outcome, _ in self.rules)
+
+        # Utilisations : objet -> (bit, bits posés partout, bits posés par salle).
+        uses = {}
+        for j, (item, where) in enumerate(self.used_leaves):
+            _, anywhere, by_room = uses.setdefault(item, (item_bit[item], [0], {}))
+            leaf = 1 << (self.used_shift + j)
+            if where is None:
+                anywhere[0] |= leaf
+            elif where in self.room_index:
+                by_room[self.room_index[where]] = by_room.get(self.room_index[where], 0) | leaf
+        self.uses = {bit: (name, anywhere[0], by_room) for name, (bit, anywhere, by_room) in sorted(uses.items())}
+        self.usable = sum(self.uses)
+
+        # Tables par salle.
+        self.edges = []
+        self.room_items = []
+        self.enter_bits = []
+        for room in rooms:
+            self.edges.append(tuple(
+                (direction, index[id(edge.target)],
+                 item_bit.get(edge.requires, 0) if edge.requires is not None else 0)
+                for direction, edge in room.exit_tuples()
+                if not edge.locked and id(edge.target) in index
+            ))
+            self.room_items.append(tuple(
+                (name, item_bit[name], 1 << keys[("action", "prendre", name)]
+                 if ("action", "prendre", name) in keys else 0)
+                for name in room.inventory if name in item_bit
+            ))
+            self.enter_bits.append(1 << keys[("room", room.name)] if ("room", room.name) in keys else 0)
+
+        self.room_talks = [[] for _ in rooms]
+        for character in world.characters:
+            key = ("action", "parler", character.name)
+            if character.current_room is not None and (key in keys or TALK_COUNTER in self.counter_caps):
+                bit = 1 << keys[key] if key in keys else 0
+                self.room_talks[index[id(character.current_room)]].append((character.name, bit))
+
+        # Objectifs qu'aucune action du modèle ne peut atteindre.
+        reachable_keys = {("room", name) for name in self.names}
+        reachable_keys.update(("action", "prendre", name) for room in rooms for name in room.inventory)
+        reachable_keys.update(("action", "parler", c.name) for c in world.characters)
+        self.unsupported.extend(
+            " ".join(str(part) for part in key[1:]) for key in keys if key not in reachable_keys
+        )
+
+    def _collect_leaves(self, condition):
+        """Enregistre les conditions « objet utilisé » d'une règle, dans l'ordre."""
+        if condition[0] in ("all", "any"):
+            for child in condition[1]:
+                self._collect_leaves(child)
+        elif condition[0] == "used":
+            self.used_leaves.append((condition[1], condition[2]))
+
+    def _compile(self, condition, leaves):
+        """Convertit une condition de règle compilée en fonction de l'état."""
+        compiled = self._compile_node(condition, leaves)
+        return _any_bit(compiled) if isinstance(compiled, int) else compiled
+
+    def _compile_node(self, condition, leaves):
+        """
+        Compile un nœud de condition en un masque (conditions « objet
+        utilisé ») ou en une fonction de l'état. Les conjonctions et
+        disjonctions de conditions élémentaires se réduisent à un test de
+        masque : l'arbre n'est pas parcouru à chaque état.
+        """
+        kind = condition[0]
+        if kind == "quests_completed":
+            return self.quests_completed
+        if kind not in ("all", "any"):
+            return 1 << (self.used_shift + next(leaves))
+        mask = 0
+        others = []
+        for child in condition[1]:
+            compiled = self._compile_node(child, leaves)
+            if isinstance(compiled, int) and kind == "all" and compiled & (compiled - 1):
+                # Disjonction imbriquée : un seul de ses bits suffit.
+                compiled = _any_bit(compiled)
+            if isinstance(compiled, int):
+                mask |= compiled
+            else:
+                others.append(compiled)
+        if kind == "all":
+            if not others:
+                return lambda state: state & mask == mask
+            return lambda state: state & mask == mask and all(child(state) for child in others)
+        if not others:
+            return mask
+        return lambda state: state & mask != 0 or any(child(state) for child in others)
+
+    # -------- Lecture et écriture de l'état --------
+
+    def room(self, state):
+        """Retourne l'indice de la salle de l'état."""
+        return state & self.room_mask
+
+    def inventory(self, state):
+        """Retourne l'ensemble de bits des objets possédés."""
+        return state >> self.inv_shift & ((1 << len(self.items)) - 1)
+
+    def counter(self, state, name):
+        """Retourne la valeur (plafonnée) d'un compteur."""
+        shift, cap = self.counter_fields[name]
+        return state >> shift & ((1 << cap.bit_length()) - 1)
+
+    def _increment(self, state, name):
+        field = self.counter_fields.get(name)
+        if field is None:
+            return state
+        shift, cap = field
+        if (state >> shift & ((1 << cap.bit_length()) - 1)) < cap:
+            state += 1 << shift
+        return state
+
+    def quests_completed(self, state):
+        """True si tous les objectifs de toutes les quêtes sont atteints."""
+        if (state >> self.obj_shift) & self.all_objectives != self.all_objectives:
+            return False
+        return all(self.counter(state, name) >= cap for name, cap in self.counter_caps.items())
+
+    def outcome(self, state):
+        """Retourne `WIN`, `LOSE` ou None selon les règles (ou les quêtes si aucune règle)."""
+        if not self.goal_rule:
+            return WIN if self.quests_completed(state) else None
+        for outcome, condition in self.rules:
+            if condition(state):
+                return outcome
+        return None
+
+    # -------- Transitions --------
+
+    def _arrive(self, state, room, commands):
+        """Actions sans regret à l'arrivée : prendre les objets d'objectif, parler aux PNJ attendus."""
+        state = (state & ~self.room_mask) | room
+        state |= self.enter_bits[room] << self.obj_shift
+        for name, bit, objective in self.room_items[room]:
+            if objective and not state >> self.inv_shift & bit:
+                state |= bit << self.inv_shift | objective << self.obj_shift
+                state = self._increment(state, TAKE_COUNTER)
+                commands.append(f"take {name}")
+        for name, objective in self.room_talks[room]:
+            if objective and not state >> self.obj_shift & objective:
+                state |= objective << self.obj_shift
+                state = self._increment(state, TALK_COUNTER)
+                commands.append(f"talk {name}")
+        return state
+
+    def initial(self):
+        """Retourne l'état initial et les commandes qui y mènent."""
+        commands = list(self.activations)
+        state = self._arrive(0, self.start, commands)
+        # La salle de départ n'est pas « visitée » au sens des objectifs.
+        if self.enter_bits[self.start]:
+            state &= ~(self.enter_bits[self.start] << self.obj_shift)
+        return state, commands
+
+    def go(self, state, direction, target):
+        """
+        Déplace le joueur vers la salle `target`.
+
+        Returns:
+            tuple: (nouvel état, commandes jouées).
+        """
+        commands = [f"go {direction}"]
+        return self._increment(self._arrive(state, target, commands), MOVE_COUNTER), commands
+
+    def moves(self, state):
+        """
+        Énumère les transitions possibles depuis un état.
+
+        Yields:
+            tuple: (nouvel état, commandes jouées).
+        """
+        room = state & self.room_mask
+        inventory = self.inventory(state)
+        for direction, target, requires in self.edges[room]:
+            if requires and not inventory & requires:
+                continue
+            yield self.go(state, direction, target)
+        for name, bit, objective in self.room_items[room]:
+            if not objective and not inventory & bit:
+                yield self._increment(state | bit << self.inv_shift, TAKE_COUNTER), [f"take {name}"]
+        if TALK_COUNTER in self.counter_caps:
+            for name, _ in self.room_talks[room]:
+                yield self._increment(state, TALK_COUNTER), [f"talk {name}"]
+        held = inventory & self.usable
+        while held:
+            bit = held & -held
+            held ^= bit
+            name, anywhere, by_room = self.uses[bit]
+            new = state | anywhere | by_room.get(room, 0)
+            if new != state:
+                yield new, [f"use {name}"]
+
+
+def _any_bit(mask):
+    """Retourne un test « au moins un bit du masque est présent »."""
+    return lambda state: state & mask != 0
+
+
+def relaxed_check(model):
+    """
+    Vérifie le monde en ignorant la position du joueur (relaxation monotone).
+
+    On calcule les salles accessibles depuis le départ en prenant au fur et
+    à mesure tous les objets des salles atteintes. Si un objectif ou la règle
+    de victoire reste hors d'atteinte, aucune partie ne peut être gagnée.
+
+    Args:
+        model (WorldModel): Le modèle du monde.
+
+    Returns:
+        str | None: La raison de l'impossibilité, ou None si le monde est
+            peut-être gagnable.
+    """
+    if model.unsupported:
+        return f"objectif inatteignable : {model.unsupported[0]}"
+
+    reached = {model.start}
+    entered = set()
+    inventory = 0
+    queue = deque([model.start])
+    blocked = []
+    while queue:
+        room = queue.popleft()
+        for _, bit, _ in model.room_items[room]:
+            if not inventory & bit:
+                inventory |= bit
+                queue.extend(r for r, _ in blocked)
+                blocked = []
+        for _, target, requires in model.edges[room]:
+            if requires and not inventory & requires:
+                blocked.append((room, target))
+                continue
+            entered.add(target)
+            if target not in reached:
+                reached.add(target)
+                queue.append(target)
+
+    # État le plus favorable : tout objectif atteignable est atteint.
+    state = model.start | inventory << model.inv_shift
+    for room in entered:
+        state |= model.enter_bits[room] << model.obj_shift
+    for room in reached:
+        for _, _, objective in model.room_items[room]:
+            state |= objective << model.obj_shift
+        for _, objective in model.room_talks[room]:
+            state |= objective << model.obj_shift
+    missing = model.all_objectives & ~(state >> model.obj_shift)
+    if missing:
+        return "un objectif de quête se trouve hors d'atteinte"
+    if MOVE_COUNTER in model.counter_caps and not any(model.edges[room] for room in reached):
+        return "aucun déplacement possible"
+    for name, cap in model.counter_caps.items():
+        shift, _ = model.counter_fields[name]
+        state |= cap << shift
+
+    for bit, (_, anywhere, by_room) in model.uses.items():
+        if inventory & bit:
+            state |= anywhere
+            for room in reached.intersection(by_room):
+                state |= by_room[room]
+    if model.goal_rule and not any(outcome == WIN and condition(state) for outcome, condition in model.rules):
+        return "la règle de victoire ne peut pas être remplie"
+    return None
+
+
+def exact_search(model, max_states):
+    """
+    Cherche le plus court plan gagnant (algorithme de Dijkstra sur les états).
+
+    Args:
+        model (WorldModel): Le modèle du monde.
+        max_states (int): Nombre maximal d'états mémorisés.
+
+    Returns:
+        tuple: (statut, commandes, nombre d'états explorés) ; le statut vaut
+            `UNKNOWN` si la limite d'états est atteinte.
+    """
+    start, prefix = model.initial()
+    parents = {start: None}
+    costs = {start: 0}
+    order = count()
+    heap = [(0, next(order), start)]
+    explored = 0
+    while heap:
+        cost, _, state = heapq.heappop(heap)
+        if cost > costs[state]:
+            continue
+        explored += 1
+        outcome = model.outcome(state)
+        if outcome == WIN:
+            commands = []
+            while parents[state] is not None:
+                state, step = parents[state]
+                commands[:0] = step
+            return WINNABLE, prefix + commands, explored
+        if outcome == LOSE:
+            continue
+        for new, step in model.moves(state):
+            new_cost = cost + len(step)
+            if new_cost < costs.get(new, new_cost + 1):
+                if new not in costs and len(costs) >= max_states:
+                    return UNKNOWN, None, explored
+                costs[new] = new_cost
+                parents[new] = (state, step)
+                heapq.heappush(heap, (new_cost, next(order), new))
+    return UNWINNABLE, None, explored
+
+
+def greedy_plan(model):
+    """
+    Construit un plan gagnant en allant chaque fois au plus proche lieu utile.
+
+    Sur place, le plan fait gagner s'il le peut, sinon prend les objets
+    utiles et parle aux PNJ attendus ; puis il rejoint par le plus court
+    chemin (parcours en largeur sur les salles seules, l'inventaire étant
+    fixé pendant le trajet) la salle utile la plus proche. Chaque étape fait
+    progresser l'état, le nombre d'étapes est donc borné.
+
+    Args:
+        model (WorldModel): Le modèle du monde.
+
+    Returns:
+        list | None: Les commandes du plan, ou None en cas d'échec (par
+            exemple si le joueur s'est enfermé dans un cul-de-sac).
+    """
+    state, commands = model.initial()
+    # Une étape sur deux au moins fait progresser l'état.
+    steps = len(model.items) + model.all_objectives.bit_length() + len(model.used_leaves)
+    steps = 2 * (steps + sum(model.counter_caps.values())) + 2
+    for _ in range(steps):
+        outcome = model.outcome(state)
+        if outcome == WIN:
+            return commands
+        if outcome == LOSE:
+            return None
+        winning = _winning_uses(model, state)
+        new = _act_here(model, state, winning, commands)
+        if new != state:
+            state = new
+            continue
+        path = _path_to_useful_room(model, state, winning)
+        if path is None:
+            return None
+        for direction, target in path:
+            state, step = model.go(state, direction, target)
+            commands.extend(step)
+    return None
+
+
+def _winning_uses(model, state):
+    """
+    Cherche les utilisations d'objets qui font gagner immédiatement.
+
+    Returns:
+        dict: Indice de salle (None pour n'importe laquelle) -> objet à utiliser.
+    """
+    winning = {}
+    inventory = model.inventory(state)
+    for bit, (name, anywhere, by_room) in model.uses.items():
+        if not inventory & bit:
+            continue
+        if anywhere and model.outcome(state | anywhere) == WIN:
+            winning.setdefault(None, name)
+        for room, mask in by_room.items():
+            if model.outcome(state | anywhere | mask) == WIN:
+                winning.setdefault(room, name)
+    return winning
+
+
+def _act_here(model, state, winning, commands):
+    """Joue sur place l'action qui fait gagner, ou prend et parle ; retourne le nouvel état."""
+    room = model.room(state)
+    name = winning.get(None, winning.get(room))
+    if name is not None:
+        for new, step in model.moves(state):
+            if step == [f"use {name}"]:
+                commands.extend(step)
+                return new
+    inventory = model.inventory(state)
+    for name, bit, _ in model.room_items[room]:
+        if not inventory & bit:
+            new, step = next((new, step) for new, step in model.moves(state) if step == [f"take {name}"])
+            commands.extend(step)
+            return new
+    if TALK_COUNTER in model.counter_caps and model.room_talks[room] and _talk_behind(model, state):
+        name = model.room_talks[room][0][0]
+        commands.append(f"talk {name}")
+        return model._increment(state, TALK_COUNTER)
+    return state
+
+
+def _talk_behind(model, state):
+    """True si le compteur de dialogues n'a pas atteint son seuil."""
+    return model.counter(state, TALK_COUNTER) < model.counter_caps[TALK_COUNTER]
+
+
+def _path_to_useful_room(model, state, winning):
+    """
+    Plus court chemin vers la salle utile la plus proche (parcours en largeur).
+
+    Une salle est utile si l'on peut y gagner, y atteindre un objectif de
+    visite, y prendre un objet utile ou y parler à un PNJ attendu. À défaut,
+    tant qu'un compteur de déplacements n'est pas plein, un seul pas suffit.
+
+    Returns:
+        list | None: Les couples (direction, salle) du chemin.
+    """
+    inventory = model.inventory(state)
+    objectives = state >> model.obj_shift
+    talk = TALK_COUNTER in model.counter_caps and _talk_behind(model, state)
+
+    def useful(room):
+        if room in winning or model.enter_bits[room] & ~objectives:
+            return True
+        if any(not inventory & bit for _, bit, _ in model.room_items[room]):
+            return True
+        return any(talk or bit & ~objectives for _, bit in model.room_talks[room])
+
+    start = model.room(state)
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        room = queue.popleft()
+        for direction, target, requires in model.edges[room]:
+            if target in parents or (requires and not inventory & requires):
+                continue
+            parents[target] = (room, direction)
+            if useful(target):
+                path = []
+                while target != start:
+                    room, direction = parents[target]
+                    path.append((direction, target))
+                    target = room
+                return path[::-1]
+            queue.append(target)
+    if MOVE_COUNTER in model.counter_caps and model.counter(state, MOVE_COUNTER) < model.counter_caps[MOVE_COUNTER]:
+        for direction, target, requires in model.edges[start]:
+            if not requires or inventory & requires:
+                return [(direction, target)]
+    return None
+
+
+class PlanPolicy:
+    """
+    Joue un plan du solveur dans une vraie partie, en allant chercher les PNJ.
+
+    Le modèle suppose qu'un PNJ reste dans sa salle de départ, alors que
+    dans le jeu il se déplace au hasard. Quand le plan veut parler à un PNJ
+    absent, la politique fait un détour : elle rejoint pas à pas la salle où
+    il se trouve (le chemin est recalculé à chaque commande), attend sur
+    place (`look`) si aucun passage n'y mène, lui parle, puis revient dans
+    la salle où le détour a commencé avant de reprendre le plan.
+
+    La politique a la même forme que celles du module `simulator`
+    (`policy(game, rng)`) ; elle suit une partie à la fois et repart du
+    début du plan quand on lui présente une autre partie.
+
+    Attributes:
+        commands (list): Les commandes du plan.
+        patience (int): Nombre maximal de commandes d'un détour avant
+            abandon.
+
+    Exemple:
+        >>> from game import Game
+        >>> from output import NullSink
+        >>> from world import load_world
+        >>> policy = PlanPolicy(solve(load_world()).commands)
+        >>> wins = 0
+        >>> for seed in range(200):
+        ...     game = play(Game(output=NullSink(), seed=seed), policy)
+        ...     wins += game.rules.outcome == WIN
+        >>> wins
+        200
+    """
+
+    def __init__(self, commands, patience=200):
+        self.commands = list(commands)
+        self.patience = patience
+        self._game = None
+
+    def __call__(self, game, rng=None):
+        """
+        Choisit la prochaine commande.
+
+        Returns:
+            str | None: La commande, ou None une fois le plan terminé (ou
+                abandonné).
+        """
+        if game is not self._game:
+            self._game, self._next, self._home, self._detour = game, 0, None, 0
+        if self._next >= len(self.commands):
+            return None
+        player = game.player
+        room = player.current_room
+        command = self.commands[self._next]
+        target = None
+        if command.startswith("talk "):
+            name = command[5:]
+            character = next((c for c in game.world.characters if c.name == name), None)
+            if character is not None and character.current_room is not room:
+                if self._home is None:
+                    self._home = room
+                target = character.current_room
+        elif self._home is not None and room is not self._home:
+            target = self._home
+        if target is None:
+            if room is self._home:
+                self._home = None
+            self._next += 1
+            self._detour = 0
+            return command
+        self._detour += 1
+        if self._detour > self.patience:
+            self._next = len(self.commands)
+            return None
+        direction = _first_step(room, target, player.inventory)
+        return f"go {direction}" if direction is not None else "look"
+
+
+def _first_step(start, target, inventory):
+    """Première direction du plus court chemin (en salles) de `start` à `target`, ou None."""
+    first = {start: None}
+    queue = deque([start])
+    while queue:
+        room = queue.popleft()
+        for direction, edge in room.exit_tuples():
+            if edge.target in first or not edge.passable(inventory):
+                continue
+            first[edge.target] = first[room] or direction
+            if edge.target is target:
+                return first[target]
+            queue.append(edge.target)
+    return None
+
+
+def play(game, policy, max_commands=1000):
+    """
+    Joue une partie avec une politique jusqu'à sa fin, son abandon ou la limite.
+
+    Args:
+        game (Game): La partie (à configurer si ce n'est pas déjà fait).
+        policy: La politique (`policy(game, rng)`).
+        max_commands (int): Nombre maximal de commandes.
+
+    Returns:
+        Game: La partie dans son état final.
+    """
+    if game.player is None:
+        game.setup("Solveur")
+    rng = random.Random(f"policy-{game.seed}")
+    while not game.finished and len(game.command_log) < max_commands:
+        command = policy(game, rng)
+        if command is None:
+            break
+        game.process_command(command)
+    return game
+
+
+def solve(world, max_states=100_000):
+    """
+    Prouve qu'un monde peut être gagné (avec un plan) ou qu'il ne peut pas l'être.
+
+    Args:
+        world (World): Le monde à analyser.
+        max_states (int): Limite d'états de la recherche exacte.
+
+    Returns:
+        Solution: Le résultat.
+
+    Examples:
+
+    >>> from world import load_world
+    >>> solution = solve(load_world())
+    >>> solution.status, solution.optimal
+    ('winnable', True)
+    >>> solution.commands[-1]
+    'use poison'
+
+    Les quêtes des mondes synthétiques (visiter une salle, prendre un objet)
+    sont résolues ; un compteur qu'aucune action n'incrémente est rejeté dès
+    la relaxation :
+
+    >>> from world import build_world, compile_world, synthetic_world
+    >>> data = synthetic_world(16, items=4, quests=3)
+    >>> solution = solve(build_world(compile_world(data)))
+    >>> solution.status, len(solution.commands)
+    ('winnable', 12)
+    >>> data["quests"][0]["objectives"].append({"kind": "counter", "verb": "Sauter", "count": 3})
+    >>> solve(build_world(compile_world(data))).reason
+    'objectif inatteignable : Sauter 3 fois'
+    """
+    model = WorldModel(world)
+    reason = relaxed_check(model)
+    if reason is not None:
+        return Solution(UNWINNABLE, reason=reason)
+
+    status, commands, explored = exact_search(model, max_states)
+    if status == WINNABLE:
+        return Solution(WINNABLE, commands, optimal=True, explored=explored)
+    if status == UNWINNABLE:
+        return Solution(UNWINNABLE, reason="aucune suite d'actions ne mène à la victoire", explored=explored)
+
+    commands = greedy_plan(model)
+    if commands is not None:
+        return Solution(WINNABLE, commands, optimal=False, explored=explored)
+    return Solution(UNKNOWN, reason=f"limite de {max_states} états atteinte", explored=explored)
+
+
+def main(argv=None):
+    """Point d'entrée : `python solver.py [monde.json] [--max-states N]`."""
+    import argparse
+    from world import DEFAULT_WORLD, load_world
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("world", nargs="?", default=DEFAULT_WORLD)
+    parser.add_argument("--max-states", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    solution = solve(load_world(args.world), args.max_states)
+    print(solution)
+    if solution.status == WINNABLE:
+        for command in solution.commands:
+            print(f"  {command}")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
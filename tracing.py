@@ -0,0 +1,251 @@
+"""Module contenant une couche de traçage légère des commandes.
+
+Un `Tracer` attaché à une partie produit, pour chaque commande, des
+intervalles (« spans ») imbriqués :
+
+    Game.process_command
+      Actions.take
+        QuestManager.check_action_objectives
+          Quest.complete_objective
+            Player.add_reward
+        RuleEngine.emit
+      Game.move_characters
+
+Les intervalles sont écrits dans un fichier local au format « Trace Event »
+de Chrome (un événement complet `"ph": "X"` par ligne, dans un tableau
+JSON). Le fichier s'ouvre tel quel dans `chrome://tracing` ou
+https://ui.perfetto.dev ; chaque partie y a sa propre piste.
+
+L'échantillonnage permet de laisser le traçage actif en charge :
+
+  - `sample_rate` : proportion des commandes tracées, tirées au hasard ;
+  - `slow_ms` : toute commande plus lente que ce seuil est écrite, même non
+    tirée. Les intervalles de chaque commande sont alors gardés en mémoire
+    jusqu'à sa fin, puis jetés si elle a été rapide.
+
+L'intervalle racine porte la taille de l'état de la session (commandes
+jouées, salles visitées, inventaire, quêtes actives, PNJ), ce qui aide à
+expliquer une latence extrême due à un état accumulé anormal.
+
+Comme le module `instrument`, le traçage enveloppe les méthodes de
+l'instance de la partie (et de son joueur, de ses quêtes, de son moteur de
+règles), jamais les classes : une partie non tracée n'en paie rien. Le
+tirage utilise son propre générateur et ne perturbe pas `Game.rng`.
+"""
+
+import json
+import os
+import random
+import time
+from itertools import count
+
+_QUEST_CHECKS = ("check_room_objectives", "check_action_objectives", "check_counter_objectives")
+
+
+class _Session:
+    """État de traçage d'une partie : piste, enveloppes posées, intervalles en cours."""
+
+    def __init__(self, track):
+        self.track = track
+        self.spans = None
+        self.patched = []
+        self.player = None
+        self.rules = None
+
+
+class Tracer:
+    """
+    Écrit les intervalles des commandes d'une ou plusieurs parties.
+
+    Attributes:
+        path (str): Le fichier de trace.
+        sample_rate (float): Proportion des commandes tracées (entre 0 et 1).
+        slow_ms (float | None): Seuil au-delà duquel une commande est toujours
+            tracée.
+        written (int): Nombre de commandes écrites.
+
+    Exemple:
+        >>> import json, os, tempfile
+        >>> from game import Game
+        >>> from output import NullSink
+        >>> game = Game(output=NullSink(), seed=1)
+        >>> game.setup("Trace")
+        >>> path = os.path.join(tempfile.mkdtemp(), "trace.json")
+        >>> tracer = Tracer(path)
+        >>> tracer.attach(game)
+        >>> for command in ("activate Récupérer l'Épée des Ténèbres", "go N", "take epee"):
+        ...     game.process_command(command)
+        >>> tracer.close()
+        >>> with open(path, encoding="utf-8") as file:
+        ...     events = json.loads(file.read().rstrip().rstrip(",") + "]")
+        >>> [event["name"] for event in events if event.get("args", {}).get("command") == "take epee"]
+        ['Game.process_command']
+        >>> {"Actions.take", "Quest.complete_objective", "Player.add_reward"} <= {e["name"] for e in events}
+        True
+    """
+
+    def __init__(self, path, sample_rate=1.0, slow_ms=None, seed=None):
+        """
+        Initialise le traceur (le fichier est ouvert à la première écriture).
+
+        Args:
+            path (str | Path): Le fichier de trace. S'il existe déjà, les
+                nouveaux événements sont ajoutés à la fin.
+            sample_rate (float): Proportion des commandes tracées.
+            slow_ms (float, optional): Seuil des commandes toujours tracées.
+            seed (int, optional): Graine du tirage des commandes tracées.
+        """
+        self.path = str(path)
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.written = 0
+        self._slow_ns = None if slow_ms is None else int(slow_ms * 1e6)
+        self._rng = random.Random(seed)
+        self._file = None
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._sessions = {}
+        self._tracks = count(1)
+
+    # -------- Pose et retrait des enveloppes --------
+
+    def attach(self, game):
+        """
+        Trace les commandes d'une partie.
+
+        Peut être appelée avant `game.setup()` : le joueur, ses quêtes et le
+        moteur de règles sont enveloppés à la première commande.
+
+        Args:
+            game (Game): La partie.
+        """
+        if id(game) in self._sessions:
+            return
+        session = self._sessions[id(game)] = _Session(next(self._tracks))
+        process_command = game.process_command
+
+        def traced_process_command(command_string):
+            self._follow(session, game)
+            sampled = self.sample_rate >= 1 or self._rng.random() < self.sample_rate
+            if not sampled and self._slow_ns is None:
+                return process_command(command_string)
+            session.spans = spans = []
+            start = time.perf_counter_ns()
+            try:
+                return process_command(command_string)
+            finally:
+                duration = time.perf_counter_ns() - start
+                session.spans = None
+                if sampled or duration >= self._slow_ns:
+                    args = {"command": command_string, "sampled": "rate" if sampled else "slow"}
+                    args.update(self._state(game))
+                    spans.append(("Game.process_command", start, duration, args))
+                    self._write(session.track, spans)
+
+        def traced_execute_command(command, list_of_words):
+            spans = session.spans
+            if spans is None:
+                return execute_command(command, list_of_words)
+            name = f"Actions.{command.action.__name__}" if command is not None else "Game.execute_command"
+            start = time.perf_counter_ns()
+            try:
+                return execute_command(command, list_of_words)
+            finally:
+                spans.append((name, start, time.perf_counter_ns() - start, None))
+
+        execute_command = game.execute_command
+        self._set(session, game, "process_command", traced_process_command)
+        self._set(session, game, "execute_command", traced_execute_command)
+        self._span(session, game, "move_characters", "Game.move_characters")
+
+    def detach(self, game):
+        """Arrête de tracer une partie."""
+        session = self._sessions.pop(id(game), None)
+        if session is not None:
+            for target, name in reversed(session.patched):
+                vars(target).pop(name, None)
+
+    def close(self):
+        """Détache toutes les parties et ferme le fichier de trace."""
+        for session in self._sessions.values():
+            for target, name in reversed(session.patched):
+                vars(target).pop(name, None)
+        self._sessions = {}
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _follow(self, session, game):
+        """Enveloppe le joueur, ses quêtes et le moteur de règles s'ils ont changé."""
+        player = game.player
+        if player is not None and player is not session.player:
+            session.player = player
+            manager = player.quest_manager
+            for name in _QUEST_CHECKS:
+                self._span(session, manager, name, f"QuestManager.{name}")
+            for quest in manager.quests:
+                self._span(session, quest, "complete_objective", "Quest.complete_objective",
+                           {"quest": quest.title})
+            self._span(session, player, "add_reward", "Player.add_reward")
+        if game.rules is not session.rules:
+            session.rules = game.rules
+            self._span(session, game.rules, "emit", "RuleEngine.emit")
+
+    def _set(self, session, target, name, function):
+        """Pose un attribut d'instance, retiré par `detach`."""
+        setattr(target, name, function)
+        session.patched.append((target, name))
+
+    def _span(self, session, target, name, label, args=None):
+        """Enregistre un intervalle à chaque appel de la méthode `name` de `target`."""
+        method = getattr(target, name)
+        clock = time.perf_counter_ns
+
+        def traced(*call_args, **kwargs):
+            spans = session.spans
+            if spans is None:
+                return method(*call_args, **kwargs)
+            start = clock()
+            try:
+                return method(*call_args, **kwargs)
+            finally:
+                spans.append((label, start, clock() - start, args))
+
+        self._set(session, target, name, traced)
+
+    # -------- Écriture --------
+
+    @staticmethod
+    def _state(game):
+        """Taille de l'état de la session, jointe à l'intervalle racine."""
+        player = game.player
+        if player is None:
+            return {}
+        return {
+            "commands": len(game.command_log),
+            "visited_rooms": len(player.visited_rooms),
+            "inventory": len(player.inventory),
+            "active_quests": len(player.quest_manager.active_quests),
+            "npcs": len(game.characters),
+        }
+
+    def _write(self, track, spans):
+        """Écrit les intervalles d'une commande, un événement par ligne."""
+        if self._file is None:
+            new = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, "a", encoding="utf-8")
+            if new:
+                self._file.write("[\n")
+        lines = []
+        for name, start, duration, args in spans:
+            event = {
+                "name": name, "cat": "tba", "ph": "X",
+                "ts": (start - self._origin) / 1000, "dur": duration / 1000,
+                "pid": self._pid, "tid": track,
+            }
+            if args:
+                event["args"] = args
+            lines.append(json.dumps(event, ensure_ascii=False) + ",\n")
+        self._file.writelines(lines)
+        self._file.flush()
+        self.written += 1
@@ -0,0 +1,590 @@
+"""Module de chargement du monde du jeu.
+
+Le monde (salles, sorties, objets, personnages, quêtes et règles de fin de
+partie) est décrit dans un fichier de données JSON (par défaut `world.json`).
+Au premier chargement, ce fichier est compilé dans une forme binaire compacte
+(tuples de valeurs simples sérialisés avec `marshal`) écrite dans le dossier
+`__pycache__`.
+
+Le nom du fichier compilé contient l'empreinte SHA-256 du fichier source :
+un monde modifié produit une nouvelle empreinte et n'utilise donc jamais un
+cache périmé. Les lancements suivants évitent l'analyse du JSON et la
+validation des références entre salles.
+"""
+
+import hashlib
+import json
+import marshal
+import math
+import os
+import random
+from pathlib import Path
+
+from room import Room
+from item import Item
+from edge import Edge
+from routing import Router
+from rules import LOSE, WIN
+from character import Character
+from quest import Objective, Quest
+
+DEFAULT_WORLD = Path(__file__).parent / "world.json"
+DIRECTIONS = ("N", "E", "S", "O")
+OPPOSITE = {"N": "S", "E": "O", "S": "N", "O": "E"}
+
+# Incrémenter si la forme compilée change (invalide tous les caches existants).
+FORMAT_VERSION = 6
+
+
+class World:
+    """
+    Contenu d'un monde chargé : salles, personnages, quêtes et salle de départ.
+
+    Attributes:
+        rooms (list): Liste des salles, dans l'ordre du fichier source.
+        rooms_by_name (dict): Dictionnaire nom -> `Room`.
+        characters (list): Liste des personnages non-joueurs.
+        quests (list): Liste des quêtes.
+        start (Room): Salle de départ du joueur.
+        rules (tuple): Règles de fin de partie compilées (voir `rules.py`).
+        version (int): Version de la topologie, à incrémenter à chaque
+            modification des sorties (invalide les itinéraires calculés).
+    """
+
+    def __init__(self, rooms, characters, quests, start, version=0, rules=()):
+        self.rooms = rooms
+        self.rooms_by_name = {room.name: room for room in rooms}
+        self.characters = characters
+        self.quests = quests
+        self.start = start
+        self.rules = rules
+        self.version = version
+        for room in rooms:
+            room.world = self
+        self._routers = {}
+        self._routers_version = None
+        self._required_items = frozenset()
+
+    def router(self, inventory=()):
+        """
+        Retourne les tables d'itinéraires du monde, recalculées si sa version a changé.
+
+        Les passages qui exigent un objet ne sont empruntés que si cet objet
+        figure dans `inventory` ; un jeu de tables est conservé par
+        combinaison d'objets utiles.
+
+        Args:
+            inventory (dict | set): Les objets possédés par le voyageur.
+
+        Returns:
+            Router: Les tables de prochain saut.
+        """
+        if self._routers_version != self.version:
+            self._routers = {}
+            self._routers_version = self.version
+            self._required_items = frozenset(
+                edge.requires
+                for room in self.rooms for edge in room.edges.values()
+                if edge is not None and edge.requires is not None
+            )
+        keys = self._required_items.intersection(inventory)
+        router = self._routers.get(keys)
+        if router is None:
+            router = self._routers[keys] = Router(self.rooms, self.version, keys)
+        return router
+
+    def clone(self):
+        """
+        Retourne une copie indépendante du monde, prête pour une nouvelle partie.
+
+        Copie spécialisée, bien plus rapide que `copy.deepcopy` : les objets
+        jamais modifiés en cours de partie (`Item`, descriptions, messages des
+        personnages, objectifs des quêtes) sont partagés avec l'original, et
+        seuls les états mutables (inventaires, personnages présents, sorties,
+        progression des quêtes) sont dupliqués.
+
+        Returns:
+            World: Le nouveau monde.
+
+        Examples:
+
+        >>> world = load_world()
+        >>> copy = world.clone()
+        >>> copy.start is world.start
+        False
+        >>> copy.start.exits["N"] is copy.rooms_by_name["Brunnhold"]
+        True
+        >>> copy.rooms_by_name["Brunnhold"].inventory["epee"] is world.rooms_by_name["Brunnhold"].inventory["epee"]
+        True
+        """
+        mapping = {}
+        rooms = []
+        for old in self.rooms:
+            room = Room.__new__(Room)
+            room.__dict__.update(old.__dict__)
+            room.inventory = dict(old.inventory)
+            room.characters = []
+            room.world = None
+            mapping[id(old)] = room
+            rooms.append(room)
+
+        for old, room in zip(self.rooms, rooms):
+            room.set_edges({
+                direction: None if edge is None else edge.retarget(mapping[id(edge.target)])
+                for direction, edge in old.edges.items()
+            })
+
+        characters = []
+        for old in self.characters:
+            character = Character.__new__(Character)
+            character.__dict__.update(old.__dict__)
+            character.msgs_cycle = list(old.msgs_cycle)
+            if old.current_room is not None:
+                character.current_room = mapping[id(old.current_room)]
+                character.current_room.characters.append(character)
+            characters.append(character)
+
+        quests = []
+        for old in self.quests:
+            quest = Quest.__new__(Quest)
+            quest.__dict__.update(old.__dict__)
+            quest.completed_objectives = list(old.completed_objectives)
+            quest._completed = set(old._completed)
+            quests.append(quest)
+
+        return World(rooms, characters, quests, mapping[id(self.start)], self.version, self.rules)
+
+
+def compile_objective(spec):
+    """
+    Compile un objectif de quête en tuple de champs structurés.
+
+    Un objectif peut être écrit sous forme de phrase ("prendre epee"),
+    analysée ici une fois pour toutes, ou déclaré directement sous forme
+    structurée ({"kind": "counter", "verb": "Se déplacer", "count": 10}) ;
+    le texte affiché est alors déduit des champs s'il est absent.
+
+    Args:
+        spec (str | dict): L'objectif tel qu'écrit dans le fichier de données.
+
+    Returns:
+        tuple: (texte, type, verbe, cible, nombre requis).
+
+    Examples:
+
+    >>> compile_objective("prendre epee")
+    ('prendre epee', 'action', 'prendre', 'epee', None)
+    >>> compile_objective({"kind": "counter", "verb": "Se déplacer", "count": 10})
+    ('Se déplacer 10 fois', 'counter', 'Se déplacer', None, 10)
+    >>> compile_objective({"kind": "room", "target": "Verdenfall"})
+    ('Visiter Verdenfall', 'room', 'Visiter', 'Verdenfall', None)
+    """
+    if isinstance(spec, str):
+        return Objective.parse(spec).as_tuple()
+
+    kind = spec["kind"]
+    verb = spec.get("verb", "Visiter" if kind == "room" else None)
+    target = spec.get("target")
+    count = spec.get("count")
+    if kind not in ("room", "action", "counter") or verb is None:
+        raise ValueError(f"Objectif invalide {spec!r}")
+    text = spec.get("text")
+    if text is None:
+        if kind == "counter":
+            text = f"{verb} {count} fois"
+        elif target is None:
+            text = verb
+        else:
+            text = f"{verb} {target}"
+    return (text, kind, verb, target, count)
+
+
+def compile_exit(spec, resolve, where):
+    """
+    Compile une sortie : un nom de salle, ou un passage typé.
+
+    Un passage typé s'écrit {"to": salle, "cost": 1, "one_way": false,
+    "locked": false, "requires": objet}.
+
+    Args:
+        spec (str | dict): La sortie telle qu'écrite dans le fichier de données.
+        resolve: Fonction qui convertit un nom de salle en indice.
+        where (str): Description de la sortie, pour les messages d'erreur.
+
+    Returns:
+        tuple: (salle, coût, sens unique, interdit, verrouillé, objet requis).
+
+    Raises:
+        ValueError: Si le coût n'est pas un nombre strictement positif (les
+            itinéraires de `routing.Router` le supposent).
+
+    Examples:
+
+    >>> compile_exit("B", {"B": 1}.get, "test")
+    (1, 1, False, False, False, None)
+    >>> compile_exit({"to": "B", "requires": "masque", "cost": 2}, {"B": 1}.get, "test")
+    (1, 2, False, False, False, 'masque')
+    >>> compile_exit({"to": "B", "cost": 0}, {"B": 1}.get, "sortie N de 'A'")
+    Traceback (most recent call last):
+    ValueError: Coût invalide 0 (sortie N de 'A')
+    """
+    if isinstance(spec, str):
+        return (resolve(spec, where), 1, False, False, False, None)
+    cost = spec.get("cost", 1)
+    if (isinstance(cost, bool) or not isinstance(cost, (int, float))
+            or not math.isfinite(cost) or cost <= 0):
+        raise ValueError(f"Coût invalide {cost!r} ({where})")
+    return (
+        resolve(spec["to"], where),
+        cost,
+        bool(spec.get("one_way", False)),
+        False,
+        bool(spec.get("locked", False)),
+        spec.get("requires"),
+    )
+
+
+def compile_condition(spec, rooms):
+    """
+    Compile une condition de règle de fin de partie (voir `rules.py`).
+
+    Formes acceptées : {"all": [...]}, {"any": [...]},
+    {"quests_completed": true} et {"used": objet, "room": salle}.
+
+    Args:
+        spec (dict): La condition telle qu'écrite dans le fichier de données.
+        rooms (dict): Les noms de salles connus (pour valider "room").
+
+    Returns:
+        tuple: La condition compilée, lue par `rules.build_condition`.
+
+    Raises:
+        ValueError: Si la condition est invalide.
+
+    Examples:
+
+    >>> compile_condition({"all": [{"quests_completed": True},
+    ...                            {"used": "poison", "room": "A"}]}, {"A": 0})
+    ('all', (('quests_completed',), ('used', 'poison', 'A')))
+    """
+    if "all" in spec or "any" in spec:
+        kind = "all" if "all" in spec else "any"
+        return (kind, tuple(compile_condition(child, rooms) for child in spec[kind]))
+    if spec.get("quests_completed"):
+        return ("quests_completed",)
+    if "used" in spec:
+        room = spec.get("room")
+        if room is not None and room not in rooms:
+            raise ValueError(f"Salle inconnue '{room}' (règle)")
+        return ("used", spec["used"], room)
+    raise ValueError(f"Condition invalide {spec!r}")
+
+
+def compile_world(data):
+    """
+    Compile les données brutes d'un monde dans sa forme compacte.
+
+    Les références par nom (sorties, salle d'un personnage, salle de départ)
+    sont résolues en indices de salle une fois pour toutes.
+
+    Args:
+        data (dict): Le contenu du fichier JSON.
+
+    Returns:
+        tuple: La forme compilée, sérialisable avec `marshal`.
+
+    Raises:
+        ValueError: Si une référence vers une salle inconnue est trouvée.
+
+    Examples:
+
+    >>> compiled = compile_world({
+    ...     "start": "A",
+    ...     "rooms": [{"name": "A", "description": "a", "exits": {"N": "B"}},
+    ...               {"name": "B", "description": "b"}],
+    ... })
+    >>> compiled[1][0][:2], compiled[3]
+    (('A', 'a'), 0)
+    >>> compile_world({"start": "A", "rooms": [
+    ...     {"name": "A", "description": "a", "exits": {"N": "Z"}}]})
+    Traceback (most recent call last):
+    ...
+    ValueError: Salle inconnue 'Z' (sortie N de 'A')
+    """
+    index = {}
+    for i, room in enumerate(data["rooms"]):
+        if room["name"] in index:
+            raise ValueError(f"Salle en double '{room['name']}'")
+        index[room["name"]] = i
+
+    def resolve(name, where):
+        if name not in index:
+            raise ValueError(f"Salle inconnue '{name}' ({where})")
+        return index[name]
+
+    exits_by_room = []
+    for i, room in enumerate(data["rooms"]):
+        exits = {}
+        for direction, spec in room.get("exits", {}).items():
+            if direction not in DIRECTIONS:
+                raise ValueError(f"Direction invalide '{direction}' dans '{room['name']}'")
+            exits[direction] = compile_exit(spec, resolve, f"sortie {direction} de '{room['name']}'")
+        exits_by_room.append(exits)
+
+    # Un passage à sens unique laisse, de l'autre côté, une sortie interdite.
+    for i, exits in enumerate(exits_by_room):
+        for direction, (target, cost, one_way, _, _, _) in list(exits.items()):
+            reverse = OPPOSITE[direction]
+            if one_way and reverse not in exits_by_room[target]:
+                exits_by_room[target][reverse] = (i, cost, False, True, False, None)
+
+    rooms = []
+    for room, exits in zip(data["rooms"], exits_by_room):
+        exits = tuple(
+            (direction,) + exits[direction] for direction in DIRECTIONS if direction in exits
+        )
+        items = tuple(
+            (item["name"], item["description"], item["weight"])
+            for item in room.get("items", [])
+        )
+        rooms.append((
+            room["name"],
+            room["description"],
+            room.get("image"),
+            tuple(exits),
+            items,
+        ))
+
+    characters = tuple(
+        (
+            character["name"],
+            character["description"],
+            resolve(character["room"], f"personnage '{character['name']}'"),
+            tuple(character.get("msgs", [])),
+        )
+        for character in data.get("characters", [])
+    )
+
+    quests = tuple(
+        (
+            quest["title"],
+            quest["description"],
+            tuple(compile_objective(objective) for objective in quest.get("objectives", [])),
+            quest.get("reward"),
+        )
+        for quest in data.get("quests", [])
+    )
+
+    rules = tuple(
+        (
+            rule["outcome"],
+            compile_condition(rule["when"], index),
+            rule.get("message", ""),
+        )
+        for rule in data.get("rules", [])
+    )
+    for outcome, _, _ in rules:
+        if outcome not in (WIN, LOSE):
+            raise ValueError(f"Résultat de règle invalide '{outcome}'")
+
+    start = resolve(data["start"], "salle de départ")
+    return (FORMAT_VERSION, tuple(rooms), characters, start, quests, rules)
+
+
+def build_world(compiled):
+    """
+    Construit les objets du jeu à partir d'un monde compilé.
+
+    Args:
+        compiled (tuple): La forme produite par `compile_world`.
+
+    Returns:
+        World: Le monde prêt à être joué.
+    """
+    _, room_specs, character_specs, start, quest_specs, rules = compiled
+
+    rooms = [Room(name, description, image) for name, description, image, _, _ in room_specs]
+    for room, (_, _, _, exits, items) in zip(rooms, room_specs):
+        edges = dict.fromkeys(DIRECTIONS)
+        for direction, target, cost, one_way, blocked, locked, requires in exits:
+            edges[direction] = Edge(rooms[target], cost, one_way, blocked, locked, requires)
+        room.set_edges(edges)
+        for name, description, weight in items:
+            room.inventory[name] = Item(name, description, weight)
+
+    characters = []
+    for name, description, room_index, msgs in character_specs:
+        room = rooms[room_index]
+        character = Character(name, description, room, list(msgs))
+        room.characters.append(character)
+        characters.append(character)
+
+    quests = [
+        Quest(
+            title=title,
+            description=description,
+            objectives=[Objective(*objective) for objective in objectives],
+            reward=reward
+        )
+        for title, description, objectives, reward in quest_specs
+    ]
+
+    return World(rooms, characters, quests, rooms[start], rules=rules)
+
+
+def _cache_path(source, digest):
+    """Retourne le chemin du fichier compilé pour une empreinte donnée."""
+    return source.parent / "__pycache__" / f"{source.stem}-{digest[:16]}.world"
+
+
+def _write_cache(path, compiled):
+    """Écrit le monde compilé de façon atomique (ignore les dossiers en lecture seule)."""
+    try:
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(marshal.dumps(compiled))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def load_compiled(path=DEFAULT_WORLD):
+    """
+    Retourne la forme compilée d'un fichier de monde, en utilisant le cache.
+
+    Le fichier source est toujours lu pour calculer son empreinte, mais il
+    n'est analysé et validé que si aucun cache correspondant n'existe.
+
+    Args:
+        path (str | Path): Chemin du fichier JSON décrivant le monde.
+
+    Returns:
+        tuple: La forme compilée du monde.
+    """
+    source = Path(path)
+    raw = source.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    cache = _cache_path(source, digest)
+
+    try:
+        compiled = marshal.loads(cache.read_bytes())
+        if compiled[0] == FORMAT_VERSION:
+            return compiled
+    except (OSError, EOFError, ValueError, TypeError, IndexError):
+        pass
+
+    compiled = compile_world(json.loads(raw))
+    _write_cache(cache, compiled)
+    return compiled
+
+
+def load_world(path=DEFAULT_WORLD):
+    """
+    Charge un monde jouable depuis un fichier de données.
+
+    Args:
+        path (str | Path): Chemin du fichier JSON décrivant le monde.
+
+    Returns:
+        World: Le monde construit.
+
+    Examples:
+
+    >>> world = load_world()
+    >>> len(world.rooms)
+    11
+    >>> world.start.name
+    'Eldregrove'
+    >>> world.rooms_by_name["Brunnhold"].exits["N"].name
+    'Dornhollow'
+    """
+    return build_world(load_compiled(path))
+
+
+def synthetic_world(rooms, characters=0, items=0, quests=0, seed=0):
+    """
+    Génère les données d'un monde synthétique, pour les tests de charge.
+
+    Les salles sont disposées en grille carrée et reliées à leurs voisines
+    (N, E, S, O). Personnages, objets et quêtes sont répartis au hasard
+    (de façon reproductible grâce à `seed`).
+
+    Args:
+        rooms (int): Nombre de salles.
+        characters (int): Nombre de personnages non-joueurs.
+        items (int): Nombre d'objets.
+        quests (int): Nombre de quêtes (visiter une salle, prendre un objet).
+        seed (int): Graine du générateur aléatoire.
+
+    Returns:
+        dict: Des données au format de `world.json`, à passer à
+            `compile_world` (ou à écrire dans un fichier).
+
+    Examples:
+
+    >>> world = build_world(compile_world(synthetic_world(9, characters=2)))
+    >>> len(world.rooms), len(world.characters)
+    (9, 2)
+    >>> world.rooms[4].exits["N"].name, world.rooms[4].exits["E"].name
+    ('Salle 1', 'Salle 5')
+
+    Les objectifs de visite visent bien une salle, malgré le numéro final
+    de son nom :
+
+    >>> quest = build_world(compile_world(synthetic_world(9, items=3, quests=1))).quests[0]
+    >>> [objective.key for objective in quest.objectives]
+    [('room', 'Salle 4'), ('action', 'prendre', 'objet_2')]
+    """
+    rng = random.Random(seed)
+    width = max(1, math.ceil(math.sqrt(rooms)))
+    names = [f"Salle {i}" for i in range(rooms)]
+
+    room_data = []
+    for i, name in enumerate(names):
+        x, y = i % width, i // width
+        neighbours = {
+            "N": i - width if y > 0 else None,
+            "E": i + 1 if x + 1 < width and i + 1 < rooms else None,
+            "S": i + width if i + width < rooms else None,
+            "O": i - 1 if x > 0 else None,
+        }
+        room_data.append({
+            "name": name,
+            "description": f"la salle numéro {i}.",
+            "exits": {d: names[j] for d, j in neighbours.items() if j is not None},
+            "items": [],
+        })
+
+    for i in range(items):
+        room_data[rng.randrange(rooms)]["items"].append(
+            {"name": f"objet_{i}", "description": f"Objet {i}", "weight": 1}
+        )
+
+    character_data = [
+        {
+            "name": f"PNJ_{i}",
+            "description": f"Un habitant numéro {i}",
+            "room": names[rng.randrange(rooms)],
+            "msgs": ["Bonjour."],
+        }
+        for i in range(characters)
+    ]
+
+    quest_data = []
+    for i in range(quests):
+        objectives = [f"Visiter {names[rng.randrange(rooms)]}"]
+        if items:
+            objectives.append(f"prendre objet_{rng.randrange(items)}")
+        quest_data.append({
+            "title": f"Quête {i}",
+            "description": f"Quête synthétique numéro {i}.",
+            "objectives": objectives,
+            "reward": f"Récompense {i}",
+        })
+
+    return {
+        "start": names[0],
+        "rooms": room_data,
+        "characters": character_data,
+        "quests": quest_data,
+    }